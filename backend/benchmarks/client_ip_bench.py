@@ -0,0 +1,77 @@
+"""Microbenchmark of the client IP extraction that runs on every rate limited request.
+
+Usage (from the backend directory):
+
+    python benchmarks/client_ip_bench.py
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+from starlette.requests import Request
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.app.ip_utils import get_real_client_ip  # noqa: E402
+
+USER_AGENT = (
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_5 like Mac OS X) AppleWebKit/605.1.15 "
+    "(KHTML, like Gecko) Version/17.5 Mobile/15E148 Safari/604.1"
+)
+
+# Scenario -> (direct peer, headers)
+SCENARIOS = {
+    "direct client": ("203.0.113.7", {"user-agent": USER_AGENT}),
+    "behind proxy (X-Forwarded-For)": (
+        "172.18.0.3",
+        {"x-forwarded-for": "203.0.113.7, 172.18.0.3", "user-agent": USER_AGENT},
+    ),
+    "behind proxy (X-Real-IP)": (
+        "172.18.0.3",
+        {"x-real-ip": "203.0.113.7", "user-agent": USER_AGENT},
+    ),
+    "docker NAT (Referer)": (
+        "172.18.0.3",
+        {
+            "x-forwarded-for": "172.18.0.1",
+            "referer": "http://192.168.178.38/",
+            "user-agent": USER_AGENT,
+        },
+    ),
+    "docker NAT (User-Agent)": (
+        "172.18.0.3",
+        {"x-forwarded-for": "172.18.0.1", "user-agent": USER_AGENT},
+    ),
+}
+
+
+def make_request(peer: str, headers: dict) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/waste-collection/A1/next",
+            "headers": [(k.encode(), v.encode()) for k, v in headers.items()],
+            "query_string": b"",
+            "client": (peer, 50000),
+        }
+    )
+
+
+def main(number: int = 100_000) -> None:
+    for name, (peer, headers) in SCENARIOS.items():
+        # A new Request per call, like the rate limiter sees it (headers are parsed lazily)
+        requests = [make_request(peer, headers) for _ in range(1000)]
+        result = get_real_client_ip(requests[0])
+        timer = timeit.Timer(
+            "for request in requests: get_real_client_ip(request)",
+            globals={"requests": requests, "get_real_client_ip": get_real_client_ip},
+        )
+        loops = number // len(requests)
+        best = min(timer.repeat(repeat=5, number=loops)) / (loops * len(requests))
+        print(f"{name:32s} {best * 1e9:7.0f} ns/call -> {result}")
+
+
+if __name__ == "__main__":
+    main()
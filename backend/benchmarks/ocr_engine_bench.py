@@ -0,0 +1,65 @@
+"""Benchmark of the calendar OCR engines: per cell detection vs. one batched pass.
+
+Runs both engines on the same preprocessed calendar page and reports their
+run times and how many cells got the same tokens. Needs the data extraction
+dependencies (src/data_extraction/requirements.txt) and the PDF in
+resources/pdf_waste_collection_plans/.
+
+Usage (from the backend directory):
+
+    python benchmarks/ocr_engine_bench.py --pdf 01_06_2026.pdf --box 105 305 3400 2250
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src" / "data_extraction"))
+
+from collection_planner_extraction import (  # noqa: E402
+    _load_pdf_image,
+    _preprocess_image,
+    extract_cells,
+    extract_cells_batched,
+)
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun"]
+
+
+def _timed(label, func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {elapsed:8.1f} s  ({elapsed / len(result) * 1000:7.1f} ms/cell)")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pdf", default="01_06_2026.pdf", help="PDF in resources/pdf_waste_collection_plans/")
+    parser.add_argument(
+        "--box",
+        nargs=4,
+        type=int,
+        default=(105, 305, 3400, 2250),
+        metavar=("LEFT", "TOP", "RIGHT", "BOTTOM"),
+        help="Crop box of the month columns (as in src/data_extraction/main.py)",
+    )
+    parser.add_argument("--batch-size", type=int, default=32, help="Boxes per recognition batch")
+    args = parser.parse_args()
+
+    processed = _preprocess_image(_load_pdf_image(args.pdf, tuple(args.box)))
+
+    cells = _timed("cells", extract_cells, processed, MONTHS)
+    batched = _timed("batched", extract_cells_batched, processed, MONTHS, batch_size=args.batch_size)
+
+    same = sum(a["Text"] == b["Text"] for a, b in zip(cells, batched))
+    print(f"Same tokens in {same}/{len(cells)} cells")
+    for a, b in zip(cells, batched):
+        if a["Text"] != b["Text"]:
+            print(f"  {a['Month']} {a['Day']:>2}: cells={a['Text']} batched={b['Text']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Load test of the API rate limiter against an in-process Redis stand-in (fakeredis).
+
+Shows that the limiter engages under concurrent load:
+
+1. Through the app: many concurrent requests of one client next to a few
+   well-behaved clients, with the "redis" backend.
+2. Several simulated workers (separate limiter instances sharing one Redis)
+   hammered concurrently by one client, "redis" vs. "memory" backend.
+
+Usage (from the backend directory, needs `pip install fakeredis httpx`):
+
+    python benchmarks/rate_limit_load.py
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import fakeredis
+import httpx
+from starlette.requests import Request
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.app.file_io import reload_datasets  # noqa: E402
+from src.app.main import app, api_rate_limit  # noqa: E402
+from src.app.rate_limit import RateLimit, configure_rate_limits  # noqa: E402
+
+SYNC_INTERVAL = 0.05
+
+
+async def app_scenario(server: fakeredis.FakeServer) -> None:
+    reload_datasets()
+    configure_rate_limits("redis", fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+    sync_task = asyncio.create_task(_sync_loop([api_rate_limit]))
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+
+        async def get(ip: str) -> int:
+            response = await client.get(
+                "/api/waste-collection/A1/next", headers={"X-Forwarded-For": ip}
+            )
+            return response.status_code
+
+        requests = [get("203.0.113.1") for _ in range(100)]
+        requests += [get(f"198.51.100.{i}") for i in range(1, 6) for _ in range(5)]
+        start = time.perf_counter()
+        statuses = await asyncio.gather(*requests)
+        elapsed = time.perf_counter() - start
+
+    sync_task.cancel()
+    heavy = statuses[:100]
+    light = statuses[100:]
+    print("App, redis backend (limit 10/60s per client and route)")
+    print(f"  heavy client:   {heavy.count(200):3d} allowed, {heavy.count(429):3d} rejected of 100")
+    print(f"  5 light clients: {light.count(200):3d} allowed, {light.count(429):3d} rejected of 25")
+    print(f"  {len(statuses) / elapsed:.0f} requests/s, limiter stats: {api_rate_limit.info()}")
+
+
+async def _sync_loop(limiters) -> None:
+    while True:
+        await asyncio.sleep(SYNC_INTERVAL)
+        for limiter in limiters:
+            await limiter.sync()
+
+
+def _request(ip: str) -> Request:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/api/waste-collection/A1/next",
+        "headers": [(b"x-forwarded-for", ip.encode())],
+        "query_string": b"",
+        "client": ("172.18.0.2", 40000),
+    }
+    return Request(scope)
+
+
+async def workers_scenario(backend: str, workers: int = 4, requests: int = 400) -> None:
+    server = fakeredis.FakeServer()
+    limiters = [
+        RateLimit(f"load-{backend}", times=10, seconds=60, workers=workers)
+        for _ in range(workers)
+    ]
+    for limiter in limiters:
+        if backend == "redis":
+            limiter.attach_redis(fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+    sync_task = asyncio.create_task(_sync_loop(limiters))
+
+    latencies = []
+
+    async def hit(i: int) -> bool:
+        # Spread the requests over ~0.5 s so several syncs happen in between
+        await asyncio.sleep(i * 0.5 / requests)
+        start = time.perf_counter()
+        try:
+            await limiters[i % workers](_request("203.0.113.7"))
+            return True
+        except Exception:
+            return False
+        finally:
+            latencies.append((time.perf_counter() - start) * 1e6)
+
+    allowed = sum(await asyncio.gather(*(hit(i) for i in range(requests))))
+    sync_task.cancel()
+
+    latencies.sort()
+    redis_checks = sum(limiter.stats["redis_checks"] for limiter in limiters)
+    redis_syncs = sum(limiter.stats["redis_syncs"] for limiter in limiters)
+    print(f"{workers} workers, {backend} backend, one client, {requests} requests (limit 10/60s)")
+    print(f"  allowed {allowed}, rejected {requests - allowed}")
+    print(
+        f"  decision latency p50 {statistics.median(latencies):.1f} us, "
+        f"p99 {latencies[int(len(latencies) * 0.99)]:.1f} us, "
+        f"inline Redis checks {redis_checks}, batched syncs {redis_syncs}"
+    )
+
+
+async def main() -> None:
+    await app_scenario(fakeredis.FakeServer())
+    print()
+    await workers_scenario("redis")
+    print()
+    await workers_scenario("memory")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,37 @@
+"""Gunicorn settings for the production API (multi-worker mode).
+
+    gunicorn -c gunicorn.conf.py src.app.main:app
+
+The app is imported and all datasets are loaded once in the master process
+(`preload_app`), the forked workers share those memory pages copy-on-write
+instead of each parsing its own copy. The number of workers is set via the
+WEB_CONCURRENCY environment variable.
+"""
+
+import gc
+import shutil
+
+from src.config import METRICS_DIR, WEB_CONCURRENCY
+
+bind = "0.0.0.0:5000"
+workers = WEB_CONCURRENCY
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+
+def on_starting(server):
+    # Metrics snapshots of a previous run would be added to the new counters
+    if METRICS_DIR:
+        shutil.rmtree(METRICS_DIR, ignore_errors=True)
+
+
+def when_ready(server):
+    # Runs in the master after the app was imported and before the workers are forked
+    from src.app.file_io import load_datasets
+
+    load_datasets()
+    # Move everything loaded so far out of the garbage collector's reach, a
+    # collection in a worker would otherwise write to (and copy) the shared pages
+    gc.collect()
+    gc.freeze()
+    server.log.info("Datasets loaded in the master, forking %s worker(s)", workers)
@@ -0,0 +1,97 @@
+import json
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
+from typing import Any, Optional
+
+
+class DailyResponseCache:
+    """Bounded cache for responses that only change once per day or on data reload.
+
+    Entries are keyed by (zone, reference date, dataset version) and the whole
+    cache is dropped as soon as the local date or the dataset version changes
+    (a reload), so stale entries don't linger until midnight. Optionally a Redis
+    client can be attached to share entries between workers, it expires its
+    keys at the next local midnight as well.
+    """
+
+    def __init__(self, name: str, max_entries: int = 1024):
+        self.name = name
+        self.max_entries = max_entries
+        self._day: Optional[date] = None
+        self._version: Optional[str] = None
+        self._entries: OrderedDict = OrderedDict()
+        self._redis = None
+        self.stats = {"hits": 0, "misses": 0, "redis_hits": 0, "redis_errors": 0}
+
+    def attach_redis(self, redis_client) -> None:
+        self._redis = redis_client
+
+    def detach_redis(self) -> None:
+        self._redis = None
+
+    def _roll(self, today: date, version: str) -> None:
+        # Everything cached belongs to the same day and data version, a new one invalidates it all
+        if today != self._day or version != self._version:
+            self._entries.clear()
+            self._day = today
+            self._version = version
+
+    def _redis_key(self, key: tuple) -> str:
+        return f"cache:{self.name}:" + ":".join(str(part) for part in key)
+
+    async def get(self, zone_code: str, today: date, version: str) -> Optional[Any]:
+        """Return the cached response or None."""
+        self._roll(today, version)
+        key = (zone_code, today.isoformat(), version)
+
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return value
+
+        if self._redis is not None:
+            try:
+                raw = await self._redis.get(self._redis_key(key))
+            except Exception:
+                self.stats["redis_errors"] += 1
+                raw = None
+            if raw is not None:
+                value = json.loads(raw)
+                self._store(key, value)
+                self.stats["redis_hits"] += 1
+                return value
+
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, zone_code: str, today: date, version: str, value: Any) -> None:
+        self._roll(today, version)
+        key = (zone_code, today.isoformat(), version)
+        self._store(key, value)
+
+        if self._redis is not None:
+            # Expire shared entries at the next local midnight
+            midnight = datetime.combine(today + timedelta(days=1), time.min)
+            try:
+                await self._redis.set(
+                    self._redis_key(key),
+                    json.dumps(value, ensure_ascii=False),
+                    exat=int(midnight.timestamp()),
+                )
+            except Exception:
+                self.stats["redis_errors"] += 1
+
+    def _store(self, key: tuple, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def info(self) -> dict:
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "shared": self._redis is not None,
+        }
@@ -1,8 +1,22 @@
+import asyncio
+import hashlib
 import json
+import mmap
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple
 from fastapi import HTTPException
 from .exceptions import ZoneNotFoundError
-from .utils import extract_zone_identifiers
+from .geometry import SegmentGridIndex, encode_streets_polyline
+from .ical import render_zone_calendar
+from .responses import PreparedResponse
+from .schedule_index import ZoneSchedule
+from .street_search import StreetSearchIndex
 from ..config import WASTE_JSON_DIR, STREET_ZONES_DIR, DOWNLOAD_LINKS_DIR
+from ..street_geometry_format import StreetGeometryBuffers
+from ..street_matcher import StreetMatcher
 
 
 def load_all_waste_data():
@@ -43,18 +57,55 @@ def load_all_waste_data():
     return merged_data
 
 
-def load_zone_data(zone_code: str):
-    data = load_all_waste_data()
+class WasteDataStore:
+    """Read-only, in-memory view of the merged waste collection schedules.
 
-    zone_letter, zone_number = extract_zone_identifiers(zone_code)
+    Built once from all files in WASTE_JSON_DIR and keyed by the full zone
+    code (e.g. "A4"), so a zone lookup is a single dict access and the
+    request path never touches the disk. Each zone's schedule is precompiled
+    into a sorted ZoneSchedule index.
+
+    `version` is a content hash of the merged data, so it is identical across
+    workers and only changes when the schedules do.
+    """
+
+    def __init__(self, merged_data: dict, modified_at: float = 0.0):
+        self.version = hashlib.sha1(
+            json.dumps(merged_data, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:12]
+        # Modification time of the newest source file
+        self.modified_at = modified_at
+
+        zones = {}
+        zone_versions = {}
+        for zone_letter, zone_numbers in merged_data.items():
+            for zone_number, zone_data in zone_numbers.items():
+                zone_code = f"{zone_letter}{zone_number}"
+                zones[zone_code] = ZoneSchedule(zone_data)
+                # Content hash per zone, derived outputs only need to be rebuilt when it changes
+                zone_versions[zone_code] = hashlib.sha1(
+                    json.dumps(zone_data, sort_keys=True).encode("utf-8")
+                ).hexdigest()[:12]
+        self._zones = MappingProxyType(zones)
+        self.zone_versions = MappingProxyType(zone_versions)
+
+    @property
+    def zone_codes(self):
+        return tuple(self._zones.keys())
+
+    def get_zone(self, zone_code: str) -> ZoneSchedule:
+        """Return the indexed waste collection schedule for the zone code."""
+        try:
+            return self._zones[zone_code]
+        except KeyError:
+            raise ZoneNotFoundError(
+                f"Zone '{zone_code}' not found in waste collection data"
+            )
 
-    if zone_letter not in data or zone_number not in data[zone_letter]:
-        raise ZoneNotFoundError(
-            f"Zone '{zone_code}' not found in waste collection data"
-        )
 
-    # Return the waste collection dates and types for the corresponding zone code
-    return data[zone_letter][zone_number]
+def load_zone_data(zone_code: str) -> ZoneSchedule:
+    # Return the indexed waste collection schedule for the corresponding zone code
+    return get_waste_data_store().get_zone(zone_code)
 
 
 def load_street_zone_mapping():
@@ -98,6 +149,32 @@ def load_street_coords_mapping():
         )
 
 
+def load_street_coords_binary() -> PreparedResponse:
+    """Memory-map the binary street geometry file (see street_geometry_format).
+
+    Nothing is parsed, the mapped file is served as is and viewed as typed arrays.
+    """
+    binary_file = STREET_ZONES_DIR / "street-coords-mapping.bin"
+
+    try:
+        with open(binary_file, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        geometries = StreetGeometryBuffers(buffer)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Street coordinates binary file {binary_file.name} not found",
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Street coordinates binary file {binary_file.name} is corrupted",
+        )
+    return PreparedResponse(
+        geometries, media_type="application/octet-stream", body=memoryview(buffer)
+    )
+
+
 def load_download_links_availability():
     """Load the download links availability state from the JSON file."""
     json_file = DOWNLOAD_LINKS_DIR / "availability_state.json"
@@ -116,3 +193,292 @@ def load_download_links_availability():
             status_code=500,
             detail=f"Download links availability file {json_file.name} is corrupted",
         )
+
+
+# --- In-memory datasets and hot reload ---
+#
+# Every dataset served by the API is loaded once into memory and replaced as a
+# whole when its source file(s) change. The backend-path-checker and the
+# extraction pipeline write into the shared resources volume, so the files are
+# polled (mtime + size) and changed datasets are rebuilt in a background thread.
+
+
+def _waste_schedule_files() -> List[Path]:
+    return sorted(WASTE_JSON_DIR.glob("*.json"))
+
+
+def _load_waste_data_store() -> WasteDataStore:
+    modified_at = max((path.stat().st_mtime for path in _waste_schedule_files()), default=0.0)
+    return WasteDataStore(load_all_waste_data(), modified_at)
+
+
+class StreetZoneData(NamedTuple):
+    response: PreparedResponse  # Full mapping response
+    search_index: StreetSearchIndex
+    matcher: StreetMatcher
+
+
+def _load_street_zone_data() -> StreetZoneData:
+    """Prepare the street zone mapping response, the street search index and fuzzy matcher."""
+    data = load_street_zone_mapping()
+    return StreetZoneData(
+        response=PreparedResponse(data),
+        search_index=StreetSearchIndex(data),
+        matcher=StreetMatcher.from_raw(data),
+    )
+
+
+class StreetCoordsData(NamedTuple):
+    responses: Dict[str, PreparedResponse]  # Format -> full mapping response
+    spatial_index: SegmentGridIndex
+
+
+def _load_street_coords_data() -> StreetCoordsData:
+    """Prepare the street coordinates mapping in every format it is served in and index it."""
+    data = load_street_coords_mapping()
+    return StreetCoordsData(
+        responses={
+            "json": PreparedResponse(data),
+            "polyline": PreparedResponse(encode_streets_polyline(data["streets"])),
+        },
+        spatial_index=SegmentGridIndex(data["streets"]),
+    )
+
+
+# Dataset name -> (function listing its source files, loader building the in-memory value)
+DATASET_SOURCES: Dict[str, Tuple[Callable[[], List[Path]], Callable[[], Any]]] = {
+    "waste_schedule": (_waste_schedule_files, _load_waste_data_store),
+    # The mappings are static payloads, serialize them once at load time
+    "street_zone_mapping": (
+        lambda: [STREET_ZONES_DIR / "street-zones-mapping.json"],
+        _load_street_zone_data,
+    ),
+    "street_coords_mapping": (
+        lambda: [STREET_ZONES_DIR / "street-coords-mapping.json"],
+        _load_street_coords_data,
+    ),
+    # Written by map_extract via rename, so a mapped previous version stays valid
+    "street_coords_binary": (
+        lambda: [STREET_ZONES_DIR / "street-coords-mapping.bin"],
+        load_street_coords_binary,
+    ),
+    "download_links_availability": (
+        lambda: [DOWNLOAD_LINKS_DIR / "availability_state.json"],
+        load_download_links_availability,
+    ),
+}
+
+
+class LoadedDataset(NamedTuple):
+    value: Any
+    version: int  # Increases with every successful (re)load of the dataset
+    loaded_at: float  # Unix timestamp of the load
+
+
+# Dataset name -> LoadedDataset
+# Never mutated in place: a reload builds a new dict and rebinds the name,
+# so readers always see a complete set of fully built datasets
+_datasets: Dict[str, LoadedDataset] = {}
+
+# Dataset name -> (name, mtime_ns, size) of each source file at the last load attempt
+# Failed attempts are remembered too, so a broken file is only retried once it changes again
+_source_signatures: Dict[str, tuple] = {}
+
+# Serializes writers (startup, watcher thread, lazy loads), readers never lock
+_reload_lock = threading.Lock()
+
+# Dataset name -> reload metrics
+RELOAD_STATS: Dict[str, Dict[str, Any]] = {
+    name: {
+        "version": 0,
+        "reloads": 0,
+        "failures": 0,
+        "last_reload_duration_ms": None,
+        "last_reload_at": None,
+        "last_error": None,
+    }
+    for name in DATASET_SOURCES
+}
+
+
+def _files_signature(files: List[Path]) -> tuple:
+    """Return a cheap change marker (name, mtime, size) for the given files."""
+    signature = []
+    for path in files:
+        try:
+            stat = path.stat()
+            signature.append((path.name, stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            signature.append((path.name, None, None))
+    return tuple(signature)
+
+
+def reload_dataset(name: str) -> LoadedDataset:
+    """Rebuild a single dataset from disk and atomically publish it.
+
+    On failure the previously loaded data stays in place and the error is
+    re-raised (as the HTTPException the loaders use) after being recorded.
+    """
+    global _datasets
+    list_files, loader = DATASET_SOURCES[name]
+    stats = RELOAD_STATS[name]
+
+    with _reload_lock:
+        _source_signatures[name] = _files_signature(list_files())
+        start = time.perf_counter()
+        try:
+            value = loader()
+        except Exception as e:
+            stats["failures"] += 1
+            stats["last_error"] = getattr(e, "detail", None) or repr(e)
+            raise
+        finally:
+            stats["last_reload_duration_ms"] = round(
+                (time.perf_counter() - start) * 1000, 3
+            )
+
+        previous = _datasets.get(name)
+        version = previous.version + 1 if previous else 1
+        loaded = LoadedDataset(value, version, time.time())
+        _datasets = {**_datasets, name: loaded}
+
+        stats["version"] = version
+        stats["reloads"] += 1
+        stats["last_reload_at"] = loaded.loaded_at
+        stats["last_error"] = None
+        return loaded
+
+
+def reload_datasets(names=None) -> None:
+    """Reload the given (default: all) datasets, keeping old data on failures."""
+    for name in names or DATASET_SOURCES:
+        try:
+            reload_dataset(name)
+        except Exception:
+            pass  # Recorded in RELOAD_STATS, old data keeps being served
+
+
+def get_loaded_dataset(name: str) -> LoadedDataset:
+    """Return the current dataset, loading it on first access.
+
+    A dataset whose load failed isn't parsed again on the request path (that
+    would add the full load time to every request), it's a 500 with the
+    recorded error until `watch_resource_files` loads it after its files changed.
+    """
+    loaded = _datasets.get(name)
+    if loaded is not None:
+        return loaded
+    if name in _source_signatures:
+        # Attempted before, wait for a load still in progress in another thread
+        with _reload_lock:
+            loaded = _datasets.get(name)
+        if loaded is not None:
+            return loaded
+        raise HTTPException(
+            status_code=500,
+            detail=RELOAD_STATS[name]["last_error"] or f"Dataset {name} is not available",
+        )
+    return reload_dataset(name)
+
+
+def get_waste_data_store() -> WasteDataStore:
+    return get_loaded_dataset("waste_schedule").value
+
+
+class ZoneCalendar(NamedTuple):
+    zone_version: str
+    response: PreparedResponse
+    modified_at: float
+
+
+# Zone code -> rendered iCalendar feed
+_zone_calendars: Dict[str, ZoneCalendar] = {}
+
+
+def get_zone_calendar(zone_code: str) -> ZoneCalendar:
+    """Return the iCalendar feed of the zone, rendering it on first use per zone version.
+
+    The feed (DTSTAMP, ETag, Last-Modified) only depends on the zone's data and
+    the modification time of the schedule files, never on when this worker
+    (re)loaded them. A feed rendered before a reload is therefore replaced as
+    soon as the files' modification time changes, so a worker that rendered it
+    earlier and one rendering it fresh serve the same bytes and ETag.
+    """
+    store = get_waste_data_store()
+    zone_schedule = store.get_zone(zone_code)
+    zone_version = store.zone_versions[zone_code]
+
+    calendar = _zone_calendars.get(zone_code)
+    if (
+        calendar is None
+        or calendar.zone_version != zone_version
+        or calendar.modified_at != store.modified_at
+    ):
+        body = render_zone_calendar(zone_code, zone_schedule, store.modified_at)
+        calendar = ZoneCalendar(
+            zone_version,
+            PreparedResponse(None, media_type="text/calendar; charset=utf-8", body=body),
+            store.modified_at,
+        )
+        _zone_calendars[zone_code] = calendar
+    return calendar
+
+
+def get_street_zone_mapping_response() -> PreparedResponse:
+    return get_loaded_dataset("street_zone_mapping").value.response
+
+
+def get_street_search_index() -> StreetSearchIndex:
+    return get_loaded_dataset("street_zone_mapping").value.search_index
+
+
+def get_street_matcher() -> StreetMatcher:
+    return get_loaded_dataset("street_zone_mapping").value.matcher
+
+
+def get_street_coords_mapping_response(format: str = "json") -> PreparedResponse:
+    if format == "binary":
+        return get_loaded_dataset("street_coords_binary").value
+    return get_loaded_dataset("street_coords_mapping").value.responses[format]
+
+
+def get_street_segment_index() -> SegmentGridIndex:
+    return get_loaded_dataset("street_coords_mapping").value.spatial_index
+
+
+def get_download_links_availability():
+    return get_loaded_dataset("download_links_availability").value
+
+
+def changed_datasets() -> List[str]:
+    """Return the names of all datasets whose source files changed since their last load."""
+    changed = []
+    for name, (list_files, _) in DATASET_SOURCES.items():
+        if _source_signatures.get(name) != _files_signature(list_files()):
+            changed.append(name)
+    return changed
+
+
+def load_datasets() -> None:
+    """Load every dataset that wasn't attempted yet or whose files changed since.
+
+    With gunicorn's preload the master process loads all datasets before
+    forking (see gunicorn.conf.py), the workers then start with nothing to do
+    and share those pages copy-on-write.
+    """
+    changed = changed_datasets()
+    if changed:
+        reload_datasets(changed)
+
+
+async def watch_resource_files(interval: float) -> None:
+    """Poll the resource files and reload changed datasets in the background.
+
+    Runs until cancelled (on app shutdown). Parsing happens in a worker thread,
+    so the event loop keeps serving requests from the current data meanwhile.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        changed = await asyncio.to_thread(changed_datasets)
+        if changed:
+            await asyncio.to_thread(reload_datasets, changed)
@@ -0,0 +1,335 @@
+import json
+import math
+from array import array
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+# Fixed point precision of the encoded polylines (5 decimals, ~1 m, enough for street geometry)
+# Makes the Amberg mapping 5.05x smaller than compact JSON (4.38x with 6 decimals)
+POLYLINE_PRECISION = 5
+
+# Mean earth radius in meters
+EARTH_RADIUS_M = 6_371_008.8
+
+
+def encode_polyline(coords: Iterable[Sequence[float]], precision: int = POLYLINE_PRECISION) -> str:
+    """Encode [lat, lon] pairs with the Google encoded polyline algorithm.
+
+    Each coordinate is stored as the delta to the previous one in fixed point,
+    split into 5 bit chunks and mapped to printable ASCII characters.
+
+    Args:
+        coords: Iterable of [lat, lon] pairs.
+        precision: Number of decimals kept (5 is Google's default, 6 like OSRM/Valhalla).
+
+    Returns:
+        The encoded polyline string.
+    """
+    factor = 10**precision
+    chunks: List[str] = []
+    prev_lat = prev_lon = 0
+    for lat, lon in coords:
+        lat_i = round(lat * factor)
+        lon_i = round(lon * factor)
+        for delta in (lat_i - prev_lat, lon_i - prev_lon):
+            # Zig-zag encode the sign into the lowest bit
+            value = ~(delta << 1) if delta < 0 else delta << 1
+            while value >= 0x20:
+                chunks.append(chr((0x20 | (value & 0x1F)) + 63))
+                value >>= 5
+            chunks.append(chr(value + 63))
+        prev_lat, prev_lon = lat_i, lon_i
+    return "".join(chunks)
+
+
+def decode_polyline(encoded: str, precision: int = POLYLINE_PRECISION) -> List[List[float]]:
+    """Decode a Google encoded polyline back into [lat, lon] pairs."""
+    factor = 10**precision
+    coords: List[List[float]] = []
+    index = lat = lon = 0
+    length = len(encoded)
+    while index < length:
+        deltas = []
+        for _ in range(2):
+            shift = result = 0
+            while True:
+                b = ord(encoded[index]) - 63
+                index += 1
+                result |= (b & 0x1F) << shift
+                shift += 5
+                if b < 0x20:
+                    break
+            deltas.append(~(result >> 1) if result & 1 else result >> 1)
+        lat += deltas[0]
+        lon += deltas[1]
+        coords.append([lat / factor, lon / factor])
+    return coords
+
+
+def encode_streets_polyline(streets: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Group street segments per (name, zone) and encode their coordinates as polylines.
+
+    Args:
+        streets: Segments as served by the street coordinates mapping: {"name", "coords", "zone"}.
+
+    Returns:
+        {"format", "precision", "streets": [{"name", "zone", "segments": [polyline, ...]}]}
+    """
+    grouped: Dict[tuple, List[str]] = {}
+    for street in streets:
+        key = (street["name"], street["zone"])
+        grouped.setdefault(key, []).append(encode_polyline(street["coords"]))
+
+    return {
+        "format": "polyline",
+        "precision": POLYLINE_PRECISION,
+        "streets": [
+            {"name": name, "zone": zone, "segments": segments}
+            for (name, zone), segments in grouped.items()
+        ],
+    }
+
+
+class SegmentGridIndex:
+    """Uniform grid spatial index over the bounding boxes of street segments.
+
+    Every segment is registered in all grid cells its bounding box overlaps,
+    so a viewport query only looks at the segments of the cells it covers.
+    Each segment is also pre-serialized to JSON, a query response is just a
+    join of those bytes.
+
+    For nearest segment lookups the vertices are additionally projected to
+    local planar meters (equirectangular around the data's center), which is
+    accurate to well below a meter at city scale.
+    """
+
+    def __init__(self, streets: List[Dict[str, Any]], cell_size: float = 0.001):
+        # 0.001° is ~110 m north-south and ~70 m east-west in Amberg
+        # Small cells keep the candidate set of nearest segment lookups at a few segments
+        self.cell_size = cell_size
+        self.names: List[str] = []
+        self.zones: List[str] = []
+        self.bboxes: List[Tuple[float, float, float, float]] = []
+        self.segment_json: List[bytes] = []
+        self.cells: Dict[Tuple[int, int], array] = {}
+
+        for i, street in enumerate(streets):
+            lats = [lat for lat, _ in street["coords"]]
+            lons = [lon for _, lon in street["coords"]]
+            bbox = (min(lats), min(lons), max(lats), max(lons))
+            self.names.append(street["name"])
+            self.zones.append(street["zone"])
+            self.bboxes.append(bbox)
+            self.segment_json.append(
+                json.dumps(street, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            )
+            for cell in self._cells_for(*bbox):
+                self.cells.setdefault(cell, array("I")).append(i)
+
+        # Local planar projection (meters) for distance computations
+        if self.bboxes:
+            center_lat = (min(b[0] for b in self.bboxes) + max(b[2] for b in self.bboxes)) / 2
+        else:
+            center_lat = 0.0
+        self._m_per_deg_lat = math.radians(1) * EARTH_RADIUS_M
+        self._m_per_deg_lon = self._m_per_deg_lat * math.cos(math.radians(center_lat))
+        # (min row, max row, min col, max col) of the occupied cells, no ring search leaves them
+        if self.cells:
+            rows = [row for row, _ in self.cells]
+            cols = [col for _, col in self.cells]
+            self._cell_bounds = (min(rows), max(rows), min(cols), max(cols))
+        else:
+            self._cell_bounds = None
+        self.projected: List[array] = [
+            array(
+                "d",
+                (
+                    v
+                    for lat, lon in street["coords"]
+                    for v in (lon * self._m_per_deg_lon, lat * self._m_per_deg_lat)
+                ),
+            )
+            for street in streets
+        ]
+
+    def __len__(self):
+        return len(self.bboxes)
+
+    def _cells_for(self, min_lat, min_lon, max_lat, max_lon):
+        size = self.cell_size
+        for row in range(math.floor(min_lat / size), math.floor(max_lat / size) + 1):
+            for col in range(math.floor(min_lon / size), math.floor(max_lon / size) + 1):
+                yield row, col
+
+    def query_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> List[int]:
+        """Return the (sorted) indices of all segments whose bounding box intersects the given one."""
+        cells = self.cells
+        size = self.cell_size
+        row_range = (math.floor(min_lat / size), math.floor(max_lat / size))
+        col_range = (math.floor(min_lon / size), math.floor(max_lon / size))
+
+        candidates = set()
+        # Iterate the occupied cells instead of the query's cells for huge viewports
+        if (row_range[1] - row_range[0] + 1) * (col_range[1] - col_range[0] + 1) > len(cells):
+            for (row, col), ids in cells.items():
+                if row_range[0] <= row <= row_range[1] and col_range[0] <= col <= col_range[1]:
+                    candidates.update(ids)
+        else:
+            for cell in self._cells_for(min_lat, min_lon, max_lat, max_lon):
+                ids = cells.get(cell)
+                if ids is not None:
+                    candidates.update(ids)
+
+        bboxes = self.bboxes
+        return sorted(
+            i
+            for i in candidates
+            if bboxes[i][0] <= max_lat
+            and bboxes[i][2] >= min_lat
+            and bboxes[i][1] <= max_lon
+            and bboxes[i][3] >= min_lon
+        )
+
+    def query_bbox_json(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> bytes:
+        """Return {"streets": [...]} with the segments intersecting the bounding box as JSON bytes."""
+        segment_json = self.segment_json
+        ids = self.query_bbox(min_lat, min_lon, max_lat, max_lon)
+        return b'{"streets":[' + b",".join(segment_json[i] for i in ids) + b"]}"
+
+    def nearest(self, lat: float, lon: float, max_distance_m: float = 500.0):
+        """Return (segment index, distance in meters) of the segment closest to the point.
+
+        Searches the grid in rings of cells around the point and stops as soon
+        as no unvisited cell can contain a closer segment, or the rings have
+        passed all occupied cells. Only the occupied part of a ring is visited,
+        so a point far away from the streets costs as little as one next to
+        them. Returns None if there's no segment within `max_distance_m`.
+        """
+        if self._cell_bounds is None:
+            return None
+        size = self.cell_size
+        row0 = math.floor(lat / size)
+        col0 = math.floor(lon / size)
+        px = lon * self._m_per_deg_lon
+        py = lat * self._m_per_deg_lat
+        row_min, row_max, col_min, col_max = self._cell_bounds
+
+        # Occupied area in planar meters relative to the point
+        occupied = (
+            (col_min * size - lon) * self._m_per_deg_lon,
+            (row_min * size - lat) * self._m_per_deg_lat,
+            ((col_max + 1) * size - lon) * self._m_per_deg_lon,
+            ((row_max + 1) * size - lat) * self._m_per_deg_lat,
+        )
+
+        best = None
+        best_dist = max_distance_m
+        seen = set()
+        bboxes = self.bboxes
+        # Rings before the first one touching the occupied cells are empty, so are those after the last
+        first_ring = max(row_min - row0, row0 - row_max, col_min - col0, col0 - col_max, 0)
+        last_ring = max(row0 - row_min, row_max - row0, col0 - col_min, col_max - col0)
+        for ring in range(first_ring, last_ring + 1):
+            # Segments outside the already visited rings (0 .. ring - 1) are at least this far away
+            visited = (
+                ((col0 - ring + 1) * size - lon) * self._m_per_deg_lon,
+                ((row0 - ring + 1) * size - lat) * self._m_per_deg_lat,
+                ((col0 + ring) * size - lon) * self._m_per_deg_lon,
+                ((row0 + ring) * size - lat) * self._m_per_deg_lat,
+            )
+            if ring > 0 and _distance_outside(occupied, visited) > best_dist:
+                break
+            for row, col in _ring_cells(row0, col0, ring, self._cell_bounds):
+                ids = self.cells.get((row, col))
+                if ids is None:
+                    continue
+                # Skip the cells of a ring that are farther away than the best hit so far
+                cell_dy = max(row * size - lat, lat - (row + 1) * size, 0) * self._m_per_deg_lat
+                cell_dx = max(col * size - lon, lon - (col + 1) * size, 0) * self._m_per_deg_lon
+                if math.hypot(cell_dx, cell_dy) > best_dist:
+                    continue
+                for i in ids:
+                    if i in seen:
+                        continue
+                    seen.add(i)
+                    min_lat, min_lon, max_lat, max_lon = bboxes[i]
+                    box_dy = max(min_lat - lat, lat - max_lat, 0) * self._m_per_deg_lat
+                    box_dx = max(min_lon - lon, lon - max_lon, 0) * self._m_per_deg_lon
+                    if math.hypot(box_dx, box_dy) > best_dist:
+                        continue
+                    dist = _point_polyline_distance(px, py, self.projected[i])
+                    if dist <= best_dist:
+                        best, best_dist = i, dist
+        if best is None:
+            return None
+        return best, best_dist
+
+
+def _distance_outside(rect: Tuple[float, ...], box: Tuple[float, ...]) -> float:
+    """Return the distance from the origin to the part of `rect` that is outside of `box`.
+
+    Both are (min x, min y, max x, max y), `box` contains the origin. Returns
+    inf if `rect` lies completely inside `box`.
+    """
+    x0, y0, x1, y1 = rect
+    bx0, by0, bx1, by1 = box
+    # Closest point of the rectangle, if it isn't inside the box that's the answer
+    qx = min(max(0.0, x0), x1)
+    qy = min(max(0.0, y0), y1)
+    if not (bx0 < qx < bx1 and by0 < qy < by1):
+        return math.hypot(qx, qy)
+    # Otherwise the closest remaining point lies on an edge of the box within the rectangle
+    best = math.inf
+    lo, hi = max(by0, y0), min(by1, y1)
+    for x in (bx0, bx1):
+        if x0 <= x <= x1 and lo <= hi:
+            best = min(best, math.hypot(x, min(max(0.0, lo), hi)))
+    lo, hi = max(bx0, x0), min(bx1, x1)
+    for y in (by0, by1):
+        if y0 <= y <= y1 and lo <= hi:
+            best = min(best, math.hypot(min(max(0.0, lo), hi), y))
+    return best
+
+
+def _ring_cells(row0: int, col0: int, ring: int, bounds: Tuple[int, int, int, int]):
+    """Yield the grid cells at Chebyshev distance `ring` around (row0, col0).
+
+    Only cells within `bounds` (min row, max row, min col, max col) are yielded.
+    """
+    row_min, row_max, col_min, col_max = bounds
+    if ring == 0:
+        yield row0, col0
+        return
+    cols = range(max(col0 - ring, col_min), min(col0 + ring, col_max) + 1)
+    for row in (row0 - ring, row0 + ring):
+        if row_min <= row <= row_max:
+            for col in cols:
+                yield row, col
+    rows = range(max(row0 - ring + 1, row_min), min(row0 + ring - 1, row_max) + 1)
+    for col in (col0 - ring, col0 + ring):
+        if col_min <= col <= col_max:
+            for row in rows:
+                yield row, col
+
+
+def _point_polyline_distance(px: float, py: float, xy: array) -> float:
+    """Return the planar distance from a point to a polyline given as flat [x0, y0, x1, y1, ...]."""
+    best_sq = math.inf
+    ax, ay = xy[0], xy[1]
+    if len(xy) == 2:
+        return math.hypot(px - ax, py - ay)
+    for j in range(2, len(xy), 2):
+        bx, by = xy[j], xy[j + 1]
+        dx, dy = bx - ax, by - ay
+        length_sq = dx * dx + dy * dy
+        if length_sq > 0:
+            # Project the point onto the segment, clamped to its end points
+            t = ((px - ax) * dx + (py - ay) * dy) / length_sq
+            t = 0.0 if t < 0 else 1.0 if t > 1 else t
+            cx, cy = ax + t * dx, ay + t * dy
+        else:
+            cx, cy = ax, ay
+        d_sq = (px - cx) ** 2 + (py - cy) ** 2
+        if d_sq < best_sq:
+            best_sq = d_sq
+        ax, ay = bx, by
+    return math.sqrt(best_sq)
@@ -0,0 +1,83 @@
+from datetime import date, datetime, timedelta, timezone
+
+from .schedule_index import ZoneSchedule
+
+_UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+
+# Calendar clients re-fetch the feed at this interval (where supported)
+REFRESH_INTERVAL = "PT12H"
+
+
+def _escape(text: str) -> str:
+    """Escape a TEXT property value (RFC 5545, 3.3.11)."""
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Fold a content line into chunks of at most 75 octets (RFC 5545, 3.1)."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    chunk = ""
+    size = 0
+    limit = 75
+    for char in line:
+        char_size = len(char.encode("utf-8"))
+        if size + char_size > limit:
+            parts.append(chunk)
+            # Continuation lines start with a space, which counts towards the limit
+            chunk, size, limit = "", 0, 74
+        chunk += char
+        size += char_size
+    parts.append(chunk)
+    return "\r\n ".join(parts)
+
+
+def _uid_slug(waste_type: str) -> str:
+    return "".join(c for c in waste_type.lower().translate(_UMLAUTS) if c.isalnum())
+
+
+def render_zone_calendar(zone_code: str, zone_schedule: ZoneSchedule, modified_at: float) -> bytes:
+    """Render all pickups of a zone as an iCalendar feed, one all-day event per waste type and date.
+
+    The output only depends on the arguments (`modified_at` is used as DTSTAMP),
+    so every worker renders byte-identical feeds with the same ETag.
+    """
+    stamp = datetime.fromtimestamp(modified_at, tz=timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//Amberg Waste Collection//DE",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(f'Müllabfuhr Amberg {zone_code}')}",
+        f"REFRESH-INTERVAL;VALUE=DURATION:{REFRESH_INTERVAL}",
+        f"X-PUBLISHED-TTL:{REFRESH_INTERVAL}",
+    ]
+    for date_str, ordinal, waste_types in zip(
+        zone_schedule.dates, zone_schedule.ordinals, zone_schedule.waste_types
+    ):
+        day = date.fromordinal(ordinal)
+        start = day.strftime("%Y%m%d")
+        end = (day + timedelta(days=1)).strftime("%Y%m%d")
+        for waste_type in waste_types:
+            lines.extend(
+                (
+                    "BEGIN:VEVENT",
+                    f"UID:{date_str}-{_uid_slug(waste_type)}-{zone_code}@amberg-waste-collection",
+                    f"DTSTAMP:{stamp}",
+                    f"DTSTART;VALUE=DATE:{start}",
+                    f"DTEND;VALUE=DATE:{end}",
+                    f"SUMMARY:{_escape(waste_type)}",
+                    "TRANSP:TRANSPARENT",
+                    "END:VEVENT",
+                )
+            )
+    lines.append("END:VCALENDAR")
+    return ("\r\n".join(_fold(line) for line in lines) + "\r\n").encode("utf-8")
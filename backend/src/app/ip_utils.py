@@ -1,103 +1,161 @@
+import hashlib
+import ipaddress
+from functools import lru_cache
+from typing import Iterable, Optional
+from urllib.parse import urlsplit
+
 from fastapi import Request
 
+from ..config import TRUSTED_PROXIES
+
+
+class TrustedProxyResolver:
+    """Resolves the client address behind a chain of trusted reverse proxies.
+
+    The trusted networks (CIDR notation) are parsed once. Forwarding headers
+    are only believed if they were set by a trusted proxy, and the same header
+    values repeat across requests (one proxy, returning clients), so the
+    results per address and per raw header value are kept in small LRU caches.
+    """
+
+    def __init__(self, cidrs: Iterable[str], cache_size: int = 1024):
+        self.networks = tuple(
+            ipaddress.ip_network(cidr.strip(), strict=False) for cidr in cidrs if cidr.strip()
+        )
+        self.is_trusted = lru_cache(maxsize=cache_size)(self._is_trusted)
+        self.client_from_forwarded_for = lru_cache(maxsize=cache_size)(
+            self._client_from_forwarded_for
+        )
+        self.client_from_real_ip = lru_cache(maxsize=cache_size)(self._client_from_real_ip)
+
+    def _is_trusted(self, host: str) -> bool:
+        """Check if the address belongs to a trusted proxy network."""
+        try:
+            address = ipaddress.ip_address(host)
+        except ValueError:
+            return False
+        return any(address in network for network in self.networks)
+
+    def _client_from_forwarded_for(self, forwarded_for: bytes) -> Optional[str]:
+        """Return the last untrusted address of an X-Forwarded-For chain.
+
+        Every proxy appends the address it received the request from, so the
+        chain is walked from the right: the first address that isn't a trusted
+        proxy is the client. Anything left of it may be forged by the client.
+        Returns None if the chain only consists of trusted addresses or the
+        client entry isn't a valid address.
+        """
+        for part in reversed(forwarded_for.decode("latin-1").split(",")):
+            host = part.strip()
+            if not host:
+                continue
+            if self.is_trusted(host):
+                continue
+            return host if _is_ip_address(host) else None
+        return None
+
+    def _client_from_real_ip(self, real_ip: bytes) -> Optional[str]:
+        """Return the X-Real-IP address, unless it's invalid or a trusted proxy itself."""
+        host = real_ip.decode("latin-1").strip()
+        if not _is_ip_address(host) or self.is_trusted(host):
+            return None
+        return host
+
+
+def _is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+trusted_proxies = TrustedProxyResolver(TRUSTED_PROXIES)
+
+
+@lru_cache(maxsize=1024)
+def _lan_host_from_referer(referer: bytes) -> Optional[str]:
+    """Return the host of a Referer URL if it's a local network (non proxy) address."""
+    try:
+        hostname = urlsplit(referer.decode("latin-1")).hostname
+        address = ipaddress.ip_address(hostname) if hostname else None
+    except ValueError:
+        return None
+    if address is None or not address.is_private or address.is_loopback:
+        return None
+    if trusted_proxies.is_trusted(hostname):
+        return None
+    return hostname
+
+
+@lru_cache(maxsize=1024)
+def _device_id(user_agent: bytes) -> str:
+    # MD5 is sufficient here since we only need device differentiation, not security
+    # First 8 characters provide enough uniqueness for local development
+    return f"local-{hashlib.md5(user_agent).hexdigest()[:8]}"
+
 
 def get_real_client_ip(request: Request) -> str:
     """
     Extract the real client IP from the request for rate limiting purposes.
 
-    This function handles multiple scenarios to identify unique clients:
-    1. Production: Uses real external IPs from proxy headers
-    2. Development: Uses User-Agent hashing for Docker NAT scenarios
-    3. Fallback: Uses direct client IP when available
+    Forwarding headers are only used if the request comes from a trusted
+    proxy (TRUSTED_PROXIES), otherwise the direct peer address is the client:
+    1. Production: The last untrusted address of X-Forwarded-For / X-Real-IP
+    2. Development: Referer host or User-Agent hash for Docker NAT scenarios
+    3. Fallback: The direct client IP
 
     Returns:
         str: The best guess at the real client IP address for rate limiting
     """
-
-    # STEP 1: Check X-Forwarded-For header
-    # This header is set by reverse proxies (nginx, load balancers) and contains
-    # the chain of IPs: "original_client, proxy1, proxy2"
-    # Try to extract the first IP in the chain (the original client)
-    forwarded_for = request.headers.get("X-Forwarded-For")
+    client = request.scope.get("client")
+    client_host = client[0] if client else "unknown"
+
+    # STEP 1: Clients connecting directly can't be behind one of our proxies
+    # Their headers are ignored, anyone could send X-Forwarded-For
+    if not trusted_proxies.is_trusted(client_host):
+        return client_host
+
+    # Pick the relevant headers in a single pass over the raw (lowercase) ASGI headers
+    forwarded_for = real_ip = referer = None
+    user_agent = b""
+    for name, value in request.scope["headers"]:
+        if name == b"x-forwarded-for":
+            # Repeated headers form one list
+            forwarded_for = value if forwarded_for is None else forwarded_for + b"," + value
+        elif name == b"x-real-ip":
+            real_ip = value
+        elif name == b"referer":
+            referer = value
+        elif name == b"user-agent":
+            user_agent = value
+
+    # STEP 2: Check X-Forwarded-For header
+    # Set by reverse proxies (nginx, load balancers): "original_client, proxy1, proxy2"
     if forwarded_for:
-        # Get the first IP (original client) from the chain
-        first_ip = forwarded_for.split(",")[0].strip()
-        # Only use it if it's not a Docker internal IP (172.16.x.x - 172.31.x.x range)
-        # Docker internal IPs indicate the user is still behind Docker's NAT
-        if first_ip and not first_ip.startswith("172.1"):
-            return first_ip
-
-    # STEP 2: Check X-Real-IP header
-    # This header is set by nginx's real_ip module and contains the "real" client IP
-    # after processing X-Forwarded-For chains and trusted proxy configurations
-    real_ip = request.headers.get("X-Real-IP")
-    if real_ip and not real_ip.startswith("172.1"):
-        return real_ip
-
-    # STEP 3: Try to extract real IP from Referer header (Docker development)
-    # In Docker environments, the Referer header often contains the real local IP
+        client_ip = trusted_proxies.client_from_forwarded_for(forwarded_for)
+        if client_ip:
+            return client_ip
+
+    # STEP 3: Check X-Real-IP header
+    # Set by nginx to the address it received the request from
+    if real_ip:
+        client_ip = trusted_proxies.client_from_real_ip(real_ip)
+        if client_ip:
+            return client_ip
+
+    # Every known hop is a trusted (e.g. Docker internal) address
+    # Docker's port mapping (NAT) makes all local network devices appear as the Docker gateway
+
+    # STEP 4: Try to extract the real IP from the Referer header (Docker development)
     # Example: "http://192.168.178.38/" shows the actual device IP
-    referer = request.headers.get("Referer", "")
     if referer:
-        try:
-            from urllib.parse import urlparse
-
-            parsed = urlparse(referer)
-            if parsed.hostname:
-                # Check if it's a local network IP (not Docker internal)
-                if (
-                    parsed.hostname.startswith("192.168.")
-                    or parsed.hostname.startswith("10.")
-                    or (
-                        parsed.hostname.startswith("172.")
-                        and not parsed.hostname.startswith("172.1")
-                    )
-                ):
-                    return parsed.hostname
-        except (ValueError, AttributeError, TypeError):
-            pass  # Continue to fallback methods if parsing fails
-
-    # STEP 4: Fallback to direct client IP from FastAPI
-    # This is the immediate client that connected to the server
-    # In Docker environments, this will be the nginx container IP
-    client_host = request.client.host if request.client else "unknown"
-
-    # STEP 5: Handle Docker development scenario with User-Agent
-    # Problem: Docker's port mapping (NAT) causes all local network devices
-    # to appear as the same IP (172.18.0.1 - Docker gateway)
-    # Solution: Use User-Agent header to differentiate devices for rate limiting
-    if client_host.startswith("172.1") or request.headers.get(
-        "X-Real-IP", ""
-    ).startswith("172.1"):
-        # All devices appear as 172.18.0.1
-        # Create a unique identifier based on User-Agent header
-        # Different devices/browsers have different User-Agent strings:
-        # - Chrome on Windows: "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/..."
-        # - Safari on iPhone: "Mozilla/5.0 (iPhone; CPU iPhone OS 15_0 like Mac OS X)..."
-        # - Chrome on Android: "Mozilla/5.0 (Linux; Android 12; SM-G973F)..."
-        user_agent = request.headers.get("User-Agent", "")
-
-        # Create MD5 hash of User-Agent to generate consistent device identifier
-        # MD5 is sufficient here since we only need device differentiation, not security
-        # First 8 characters provide enough uniqueness for local development
-        # NOTE: Not a perfect solution, but "unique enough" for those cases
-        import hashlib
-
-        device_hash = hashlib.md5(user_agent.encode()).hexdigest()[:8]
-
-        # Return format: "local-{hash}"
-        # Examples: "local-3c3e6c9b" (Windows Chrome), "local-ea23dc97" (Android Chrome)
-        return f"local-{device_hash}"
-
-    # STEP 6: Final fallback
-    # Use the direct client IP if we haven't handled it above
-    # This occurs in non-Docker deployments or when we have real external IPs
-    return client_host
-
-
-async def rate_limit_key_func(request: Request) -> str:
-    """
-    Custom key function for fastapi-limiter to use real client IP.
-    This ensures rate limiting works correctly behind reverse proxies (nginx).
-    """
-    return get_real_client_ip(request)
\ No newline at end of file
+        lan_host = _lan_host_from_referer(referer)
+        if lan_host:
+            return lan_host
+
+    # STEP 5: Use the User-Agent header to differentiate devices
+    # Different devices/browsers have different User-Agent strings
+    # NOTE: Not a perfect solution, but "unique enough" for those cases
+    # Examples: "local-3c3e6c9b" (Windows Chrome), "local-ea23dc97" (Android Chrome)
+    return _device_id(user_agent)
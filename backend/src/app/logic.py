@@ -1,93 +1,83 @@
-from datetime import datetime, date
+from datetime import date
+from typing import List, Optional
 
-from .utils import sort_zone_code_schedule
+from .cache import DailyResponseCache
+from .geometry import SegmentGridIndex
+from .schedule_index import ZoneSchedule, WASTE_TYPES
 
 # Cache the next pick up dates for each zone as they
-# only change, at most, once per day
-CACHED_NEXT_PICKUPS = {}
+# only change, at most, once per day (or when the schedule data is reloaded)
+next_pickups_cache = DailyResponseCache("next_pickups", max_entries=256)
 
 # Check if there is a valid result in cache and if not determine and cache it
-def get_next_pickups(zone_code: str, zone_data: dict):
+async def get_next_pickups(zone_code: str, zone_schedule: ZoneSchedule, version: str):
     today = date.today()
 
-    # Check cache is not empty
-    if CACHED_NEXT_PICKUPS != {}:
-        # Check if zone_code is in cache
-        if zone_code in CACHED_NEXT_PICKUPS:
-            # Check if reference date is today
-            cached_date_str = CACHED_NEXT_PICKUPS[zone_code]["reference_date"]
-            cached_date = datetime.fromisoformat(cached_date_str).date()
-            if today == cached_date:
-                return CACHED_NEXT_PICKUPS[zone_code]
+    cached = await next_pickups_cache.get(zone_code, today, version)
+    if cached is not None:
+        return cached
 
     # If there is no valid result in cache determine the next pickup dates
-    return determine_next_pickups(zone_code, zone_data, today)
+    next_pickups_response = determine_next_pickups(zone_code, zone_schedule, today)
+    await next_pickups_cache.set(zone_code, today, version, next_pickups_response)
+    return next_pickups_response
 
-def determine_next_pickups(zone_code: str, zone_data: dict, today: date):
-    global CACHED_NEXT_PICKUPS
+def determine_next_pickups(zone_code: str, zone_schedule: ZoneSchedule, today: date):
     next_pickups_response = {}
 
     # Set zone and date 
     next_pickups_response['zone'] = zone_code
     next_pickups_response['reference_date'] = today.isoformat()
 
-    # Init the next pickups dictionary
-    next_pickups = {
-        "Restmüll": "",
-        "Biomüll": "",
-        "Papiermüll": "",
-        "Gelber Sack": ""
-    }
-
-    # Sort pickup data by dates even though its pre-sorted after the extraction process
-    # It's crucial for the proper determination of the next pickup dates
-    sorted_zone_data = sort_zone_code_schedule(zone_data)
-
-    # Find next pickup dates for each waste type
-    for date_str, waste_types in sorted_zone_data.items():
-        date_obj = datetime.strptime(date_str, "%Y-%m-%d").date()
-        # Only dates later than or equal to today can be future pickup dates
-        if date_obj < today: 
-            continue # Skip over dates in the past
-        # Look at each waste type that gets collected on the current date
-        for waste_type in waste_types:
-            # Check if the next pickup slot is empty and if so set it to the current date
-            if next_pickups.get(waste_type) == "":
-                next_pickups[waste_type] = date_str
-        # Check if all next pickup dates for every type of waste have already been set
-        if all(value != "" for value in next_pickups.values()):
-            break # Search is over
-
-    # Convert the pickup dates to the API response format
-    # If the date for the type is still "" means there is no pickup date in the dataset 
+    # Binary search the next pickup date (on or after today) for each waste type
+    # If the date for the type is "" means there is no pickup date in the dataset 
+    day = today.toordinal()
     next_pickups_api = []
-    for waste_type, date_str in next_pickups.items():
-        next_pickups_api.append({"type": waste_type ,"date": date_str})
+    for waste_type in WASTE_TYPES:
+        next_pickups_api.append(
+            {"type": waste_type, "date": zone_schedule.next_pickup(waste_type, day)}
+        )
 
     # Set the resulting list as next_pickups in the api response
     next_pickups_response['next_pickups'] = next_pickups_api
-
-    # Cache and return the full result
-    CACHED_NEXT_PICKUPS[zone_code] = next_pickups_response
     return next_pickups_response
 
 
-def get_future_pickups(zone_code, zone_data):
+def get_future_pickups(
+    zone_code,
+    zone_schedule: ZoneSchedule,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    types: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+):
     today = date.today()
     schedule_response = {}
 
     # Set zone and date 
     schedule_response['zone'] = zone_code
     schedule_response['reference_date'] = today.isoformat()
-    schedule_response['schedule'] = {}
 
-    sorted_zone_data = sort_zone_code_schedule(zone_data)
+    # The pick up dates from `start` (default today) to `end` are a slice of the sorted schedule
+    start = start or today
+    schedule_response['schedule'] = zone_schedule.pickups_between(
+        start.toordinal(), end.toordinal() if end else None, types, limit
+    )
 
-    # Add every pick up date that is in the future
-    for date_str, waste_types in sorted_zone_data.items():
-        date_obj = datetime.strptime(date_str, "%Y-%m-%d").date()
-        # Only dates later than or equal to today can be future pickup dates
-        if date_obj >= today: 
-            schedule_response['schedule'][date_str] = waste_types
-    
     return schedule_response
+
+
+def locate_street(index: SegmentGridIndex, lat: float, lon: float, max_distance_m: float):
+    """Return the nearest street segment's name and zone for a point, or None if there is none in range."""
+    nearest = index.nearest(lat, lon, max_distance_m)
+    if nearest is None:
+        return None
+
+    segment, distance_m = nearest
+    return {
+        "lat": lat,
+        "lon": lon,
+        "street": index.names[segment],
+        "zone": index.zones[segment],
+        "distance_m": round(distance_m, 1),
+    }
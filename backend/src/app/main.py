@@ -1,34 +1,147 @@
-from fastapi import FastAPI, Depends, Request
+import asyncio
+import logging
+from fastapi import FastAPI, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from fastapi_limiter import FastAPILimiter
-from fastapi_limiter.depends import RateLimiter
 from fastapi.middleware.gzip import GZipMiddleware
 import redis.asyncio as redis
 
 from .routes import router as api_router
-from .ip_utils import rate_limit_key_func
+from .rate_limit import RateLimit, configure_rate_limits, sync_rate_limits, rate_limit_info
+from .file_io import load_datasets, watch_resource_files, RELOAD_STATS
+from .logic import next_pickups_cache
+from .metrics import MetricsRegistry, MetricsMiddleware, AppBytesMiddleware, SharedMetrics
+from ..config import (
+    DATA_RELOAD_INTERVAL,
+    RESPONSE_CACHE_REDIS,
+    RATE_LIMIT_BACKEND,
+    RATE_LIMIT_SYNC_INTERVAL,
+    REDIS_URL,
+    WEB_CONCURRENCY,
+    METRICS_DIR,
+)
+
+logger = logging.getLogger(__name__)
+
+# Per client and route limits, decided in-process and shared between workers via Redis
+# Always registered, the backend is chosen at startup (see configure_rate_limits)
+api_rate_limit = RateLimit("api", times=10, seconds=60, workers=WEB_CONCURRENCY)
+root_rate_limit = RateLimit("root", times=10, seconds=10, workers=WEB_CONCURRENCY)
+
+
+def app_counters() -> dict:
+    """Return the cache, data reload and rate limit counters for the metrics endpoint."""
+    cache = next_pickups_cache
+    return {
+        "cache_requests_total": {
+            "help": "Response cache lookups by result.",
+            "type": "counter",
+            "values": [
+                [[["cache", cache.name], ["result", result]], cache.stats[stat]]
+                for result, stat in (("hit", "hits"), ("redis_hit", "redis_hits"), ("miss", "misses"))
+            ],
+        },
+        "cache_redis_errors_total": {
+            "help": "Failed Redis operations of the response cache.",
+            "type": "counter",
+            "values": [[[["cache", cache.name]], cache.stats["redis_errors"]]],
+        },
+        # Every worker reloads the same files, report the highest count instead of the sum
+        "dataset_reloads_total": {
+            "help": "Successful (re)loads per dataset.",
+            "type": "counter",
+            "merge": "max",
+            "values": [[[["dataset", name]], stats["reloads"]] for name, stats in RELOAD_STATS.items()],
+        },
+        "dataset_reload_failures_total": {
+            "help": "Failed (re)loads per dataset.",
+            "type": "counter",
+            "merge": "max",
+            "values": [[[["dataset", name]], stats["failures"]] for name, stats in RELOAD_STATS.items()],
+        },
+        "dataset_last_reload_timestamp_seconds": {
+            "help": "Unix time of the last successful (re)load per dataset.",
+            "type": "gauge",
+            "merge": "max",
+            "values": [
+                [[["dataset", name]], stats["last_reload_at"] or 0]
+                for name, stats in RELOAD_STATS.items()
+            ],
+        },
+        "rate_limit_requests_total": {
+            "help": "Rate limit decisions by limiter and result.",
+            "type": "counter",
+            "values": [
+                [[["limiter", name], ["result", result]], info[result]]
+                for name, info in rate_limit_info().items()
+                for result in ("allowed", "rejected")
+            ],
+        },
+    }
+
 
-redis_available = False
+metrics_registry = MetricsRegistry()
+shared_metrics = SharedMetrics(metrics_registry, METRICS_DIR, app_counters)
+
+
+async def connect_redis(url: str):
+    """Return a connected Redis client, or None (logged) if Redis isn't reachable."""
+    client = redis.from_url(url, encoding="utf-8", decode_responses=True)
+    try:
+        await client.ping()
+        return client
+    except Exception as e:
+        logger.warning("Redis at %s is not reachable: %s", url, e)
+        await client.close()
+        return None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global redis_available
+    # Load all datasets once, requests are served from memory
+    # Already done if the gunicorn master preloaded them before forking this worker
+    # A dataset that can't be loaded at startup answers 500 until the watcher loads its changed files
+    load_datasets()
+    # Pick up files written by the path checker / extraction pipeline without a restart
+    watcher = None
+    if DATA_RELOAD_INTERVAL > 0:
+        watcher = asyncio.create_task(watch_resource_files(DATA_RELOAD_INTERVAL))
+
     r = None
+    if RATE_LIMIT_BACKEND == "redis" or RESPONSE_CACHE_REDIS:
+        r = await connect_redis(REDIS_URL)
+
+    rate_limit_backend = RATE_LIMIT_BACKEND
+    if rate_limit_backend == "redis" and r is None:
+        # Still limit, just per worker instead of across all of them
+        logger.warning("Rate limits fall back to the in-memory backend (per worker)")
+        rate_limit_backend = "memory"
+    configure_rate_limits(rate_limit_backend, r)
+    logger.info("Rate limit backend: %s", rate_limit_backend)
+
+    rate_limit_sync = None
+    if rate_limit_backend == "redis":
+        rate_limit_sync = asyncio.create_task(sync_rate_limits(RATE_LIMIT_SYNC_INTERVAL))
+    if RESPONSE_CACHE_REDIS and r is not None:
+        next_pickups_cache.attach_redis(r)
+
+    # Publish this worker's metrics for scrapes answered by the other workers
+    metrics_writer = None
+    if METRICS_DIR:
+        metrics_writer = asyncio.create_task(shared_metrics.run(10))
+
     try:
-        r = redis.from_url(
-            "redis://redis:6379/0",  # Hostname specified in docker-compose
-            encoding="utf-8",
-            decode_responses=True,
-        )
-        await FastAPILimiter.init(r, identifier=rate_limit_key_func)
-        redis_available = True
-        yield
-    except Exception:
         yield
     finally:
+        if watcher:
+            watcher.cancel()
+        if metrics_writer:
+            metrics_writer.cancel()
+        if rate_limit_sync:
+            rate_limit_sync.cancel()
         if r:
+            configure_rate_limits("memory")
+            next_pickups_cache.detach_redis()
             await r.close()
 
 
@@ -60,16 +173,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Compress API responses bigger than 1kb (especially relevant for the coordinates mapping)
-# Since the file is over 1mb and on slow network connections that could trigger the max timeout of an API call
+# Response sizes as produced by the routes, inside the GZipMiddleware
+app.add_middleware(AppBytesMiddleware, registry=metrics_registry)
+
+# Compress API responses bigger than 1kb
+# The large mapping payloads are precompressed at load time (see responses.py) and skip this middleware
 app.add_middleware(GZipMiddleware, minimum_size=1024)
 
-rate_limiter_dep = (
-    [Depends(RateLimiter(times=10, seconds=60))] if redis_available else []
-)
-rate_limiter_dep_10 = (
-    [Depends(RateLimiter(times=10, seconds=10))] if redis_available else []
-)
+# Latency, status codes and bytes sent per route, outermost to time the whole stack
+app.add_middleware(MetricsMiddleware, registry=metrics_registry)
+
+rate_limiter_dep = [Depends(api_rate_limit)]
+rate_limiter_dep_10 = [Depends(root_rate_limit)]
 
 app.include_router(api_router, dependencies=rate_limiter_dep)
 
@@ -82,3 +197,20 @@ async def root():
 @app.get("/ping", dependencies=rate_limiter_dep_10)
 async def ping():
     return {"status": "ok"}
+
+
+@app.get("/status", dependencies=rate_limiter_dep_10)
+async def status():
+    """Return the reload metrics of every in-memory dataset, the cache and rate limit statistics."""
+    return {
+        "datasets": RELOAD_STATS,
+        "caches": {next_pickups_cache.name: next_pickups_cache.info()},
+        "rate_limits": rate_limit_info(),
+    }
+
+
+# Not rate limited, scrapers poll it regularly and it only reads in-memory counters
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Return the metrics of all workers in the Prometheus text format."""
+    return Response(shared_metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
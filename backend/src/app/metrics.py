@@ -0,0 +1,329 @@
+import asyncio
+import json
+import os
+import time
+from time import perf_counter
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class MetricsRegistry:
+    """Request metrics of this worker process.
+
+    The middlewares only append a tuple per request to a list, the
+    histograms and counters are computed from those in batches (on scrape or
+    once AGGREGATE_EVERY requests piled up). Everything runs on the event
+    loop thread, so no locks are needed. With several workers each one
+    writes a snapshot into a shared directory and a scrape merges all of them.
+    """
+
+    AGGREGATE_EVERY = 10_000
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        # (route, method, status, seconds, bytes sent) per request, not aggregated yet
+        self.pending: List[tuple] = []
+        # (route, body bytes before compression) per request, not aggregated yet
+        self.pending_app_bytes: List[tuple] = []
+        # (route, method, status) -> requests
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        # route -> [count per bucket..., count above the last bucket, sum of seconds]
+        self.latency: Dict[str, List[float]] = {}
+        # (route, stage) -> body bytes, stage "app" (before compression) or "sent"
+        self.response_bytes: Dict[Tuple[str, str], int] = {}
+
+    def aggregate(self) -> None:
+        """Fold the pending per-request records into the counters and histograms."""
+        pending, self.pending = self.pending, []
+        pending_app_bytes, self.pending_app_bytes = self.pending_app_bytes, []
+        requests = self.requests
+        latency = self.latency
+        response_bytes = self.response_bytes
+        buckets = self.buckets
+
+        for route, method, status, seconds, sent_bytes in pending:
+            key = (route, method, status)
+            requests[key] = requests.get(key, 0) + 1
+            histogram = latency.get(route)
+            if histogram is None:
+                histogram = latency[route] = [0] * (len(buckets) + 2)
+            histogram[bisect_left(buckets, seconds)] += 1
+            histogram[-1] += seconds
+            key = (route, "sent")
+            response_bytes[key] = response_bytes.get(key, 0) + sent_bytes
+
+        for route, app_bytes in pending_app_bytes:
+            key = (route, "app")
+            response_bytes[key] = response_bytes.get(key, 0) + app_bytes
+
+    def snapshot(self) -> dict:
+        """Return the recorded metrics as JSON serializable data."""
+        self.aggregate()
+        return {
+            "requests": [[*key, value] for key, value in self.requests.items()],
+            "latency": self.latency,
+            "response_bytes": [[*key, value] for key, value in self.response_bytes.items()],
+        }
+
+
+def merge_snapshots(snapshots: List[dict], bucket_count: int) -> dict:
+    """Sum the snapshots of several workers into one."""
+    requests: Dict[tuple, int] = {}
+    latency: Dict[str, List[float]] = {}
+    response_bytes: Dict[tuple, int] = {}
+    for snapshot in snapshots:
+        for route, method, status, value in snapshot["requests"]:
+            key = (route, method, status)
+            requests[key] = requests.get(key, 0) + value
+        for route, histogram in snapshot["latency"].items():
+            merged = latency.setdefault(route, [0] * (bucket_count + 2))
+            for i, value in enumerate(histogram):
+                merged[i] += value
+        for route, stage, value in snapshot["response_bytes"]:
+            key = (route, stage)
+            response_bytes[key] = response_bytes.get(key, 0) + value
+    return {
+        "requests": [[*key, value] for key, value in requests.items()],
+        "latency": latency,
+        "response_bytes": [[*key, value] for key, value in response_bytes.items()],
+    }
+
+
+class MetricsMiddleware:
+    """Outermost ASGI middleware: latency, status and bytes sent per route."""
+
+    def __init__(self, app, registry: MetricsRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter()
+        # [status, bytes sent]
+        response = [500, 0]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.body":
+                response[1] += len(message.get("body", b""))
+            elif message["type"] == "http.response.start":
+                response[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route in the scope, label by its path template
+            route = scope.get("route")
+            registry = self.registry
+            registry.pending.append(
+                (
+                    route.path if route is not None else "unmatched",
+                    scope["method"],
+                    response[0],
+                    perf_counter() - start,
+                    response[1],
+                )
+            )
+            if len(registry.pending) >= registry.AGGREGATE_EVERY:
+                registry.aggregate()
+
+
+class AppBytesMiddleware:
+    """ASGI middleware inside the GZipMiddleware: body bytes as produced by the routes."""
+
+    def __init__(self, app, registry: MetricsRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        app_bytes = [0]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.body":
+                app_bytes[0] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            self.registry.pending_app_bytes.append(
+                (route.path if route is not None else "unmatched", app_bytes[0])
+            )
+
+
+class SharedMetrics:
+    """Combines the metrics of all worker processes for a scrape.
+
+    Every worker writes its snapshot to `<directory>/<pid>.json` (when
+    scraped and periodically), a scrape sums up all files. Files of workers
+    that exited (e.g. replaced by gunicorn) or stopped writing for `max_age`
+    seconds are deleted on scrape. Without a directory only this process's
+    metrics are reported.
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        directory: Optional[Path],
+        extra: Callable[[], dict],
+        max_age: float = 60.0,
+    ):
+        self.registry = registry
+        self.directory = Path(directory) if directory else None
+        # Returns the counters kept elsewhere (caches, reloads, rate limits)
+        self.extra = extra
+        # Snapshots older than this belong to a dead or hung worker (live ones rewrite theirs periodically)
+        self.max_age = max_age
+
+    def _snapshot(self) -> dict:
+        return {**self.registry.snapshot(), "extra": self.extra()}
+
+    def write(self) -> None:
+        """Write this worker's snapshot (atomically replacing the previous one)."""
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{os.getpid()}.json"
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._snapshot()), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    async def run(self, interval: float) -> None:
+        """Periodically write this worker's snapshot, so scrapes served by other workers see it."""
+        while True:
+            await asyncio.sleep(interval)
+            self.write()
+
+    def collect(self) -> Tuple[dict, dict]:
+        """Return the merged request metrics and the summed extra counters of all workers."""
+        if self.directory is None:
+            snapshots = [self._snapshot()]
+        else:
+            self.write()
+            snapshots = []
+            now = time.time()
+            for path in self.directory.glob("*.json"):
+                try:
+                    if self._is_stale(path, now):
+                        path.unlink(missing_ok=True)
+                        continue
+                    snapshots.append(json.loads(path.read_text(encoding="utf-8")))
+                except (OSError, ValueError):
+                    continue  # Being replaced right now, or gone
+        merged = merge_snapshots(snapshots, len(self.registry.buckets))
+        return merged, _sum_counters([snapshot["extra"] for snapshot in snapshots])
+
+    def _is_stale(self, path: Path, now: float) -> bool:
+        """Check if a snapshot file belongs to a worker that exited or stopped writing."""
+        try:
+            pid = int(path.stem)
+        except ValueError:
+            return True
+        if pid == os.getpid():
+            return False
+        if now - path.stat().st_mtime > self.max_age:
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass  # Exists, owned by another user
+        return False
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        merged, extra = self.collect()
+        return render_prometheus(merged, extra, self.registry.buckets)
+
+
+def _sum_counters(counters: List[dict]) -> dict:
+    """Merge the extra metrics of all workers: summed, or the maximum for `"merge": "max"`.
+
+    Each metric is {"help", "type", "merge" (optional), "values": [[label pairs, value], ...]}.
+    """
+    total: Dict[str, dict] = {}
+    for worker_counters in counters:
+        for name, metric in worker_counters.items():
+            merged = total.setdefault(
+                name, {"help": metric["help"], "type": metric["type"], "values": {}}
+            )
+            values = merged["values"]
+            for labels, value in metric["values"]:
+                labels = tuple(tuple(pair) for pair in labels)
+                if labels not in values:
+                    values[labels] = value
+                elif metric.get("merge") == "max":
+                    values[labels] = max(values[labels], value)
+                else:
+                    values[labels] += value
+    return total
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in pairs) + "}"
+
+
+def render_prometheus(merged: dict, extra: dict, buckets: Tuple[float, ...]) -> str:
+    lines = [
+        "# HELP http_requests_total Requests by route template, method and status code.",
+        "# TYPE http_requests_total counter",
+    ]
+    for route, method, status, value in sorted(merged["requests"]):
+        lines.append(
+            f"http_requests_total{_labels((('route', route), ('method', method), ('status', status)))} {value}"
+        )
+
+    lines += [
+        "# HELP http_request_duration_seconds Request latency by route template.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for route, histogram in sorted(merged["latency"].items()):
+        cumulative = 0
+        for bound, count in zip(buckets, histogram):
+            cumulative += count
+            lines.append(
+                f"http_request_duration_seconds_bucket{_labels((('route', route), ('le', bound)))} {cumulative}"
+            )
+        cumulative += histogram[len(buckets)]
+        lines.append(
+            f"http_request_duration_seconds_bucket{_labels((('route', route), ('le', '+Inf')))} {cumulative}"
+        )
+        lines.append(f"http_request_duration_seconds_sum{_labels((('route', route),))} {histogram[-1]}")
+        lines.append(f"http_request_duration_seconds_count{_labels((('route', route),))} {cumulative}")
+
+    lines += [
+        "# HELP http_response_bytes_total Response body bytes by route, as produced by the app "
+        "(stage=app, before the GZip middleware) and as sent (stage=sent).",
+        "# TYPE http_response_bytes_total counter",
+    ]
+    for route, stage, value in sorted(merged["response_bytes"]):
+        lines.append(
+            f"http_response_bytes_total{_labels((('route', route), ('stage', stage)))} {value}"
+        )
+
+    for name, metric in sorted(extra.items()):
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        for labels, value in sorted(metric["values"].items()):
+            lines.append(f"{name}{_labels(labels)} {value}")
+
+    return "\n".join(lines) + "\n"
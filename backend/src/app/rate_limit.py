@@ -0,0 +1,237 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from typing import List
+
+from fastapi import HTTPException, Request
+from starlette.status import HTTP_429_TOO_MANY_REQUESTS
+
+from .ip_utils import get_real_client_ip
+
+# Below this share of the limit (known global count + unsynced local hits) a
+# request is decided locally, above it Redis is asked before every request
+# The unsynced hits of all workers together stay below this share as well
+NEAR_LIMIT_FRACTION = 0.5
+
+
+class _ClientState:
+    """Rate limit state of one client in this process."""
+
+    __slots__ = ("tokens", "updated", "window", "pending", "remote_used", "near_limit")
+
+    def __init__(self, tokens: float, now: float, window: int):
+        self.tokens = tokens  # Local token bucket
+        self.updated = now
+        self.window = window  # Current fixed Redis window
+        self.pending = 0  # Hits in this window not yet added to the Redis counter
+        self.remote_used = 0  # Hits of all workers in this window, as of the last sync
+        self.near_limit = False  # Checked against Redis for the rest of the window
+
+
+class RateLimit:
+    """Two tier rate limit dependency: `times` requests per `seconds` per client and route.
+
+    Tier 1 is an in-process token bucket keyed by the real client IP, it
+    answers most requests without any I/O. With a Redis client attached,
+    hits are additionally counted in a fixed window counter shared by all
+    workers: they're added in batches by `sync_rate_limits` and only when a
+    client gets close to its limit (see NEAR_LIMIT_FRACTION) Redis is asked
+    directly before a request is let through.
+
+    Between two syncs each of the `workers` processes decides at most its
+    share of NEAR_LIMIT_FRACTION of the limit (`local_budget`) on its own,
+    which bounds how far concurrent workers can exceed the shared limit: a
+    worker that hasn't seen the shared count since other workers used it up
+    lets at most `local_budget` more requests through, so a client gets at
+    most `times + workers * local_budget` requests per window. Redis errors
+    fall back to the local decision.
+    """
+
+    def __init__(
+        self, name: str, times: int, seconds: int, workers: int = 1, max_clients: int = 10_000
+    ):
+        self.name = name
+        self.times = times
+        self.seconds = seconds
+        self.rate = times / seconds  # Tokens refilled per second
+        # Hits per client this process may let through between two syncs without asking Redis
+        self.local_budget = max(1, int(times * NEAR_LIMIT_FRACTION / max(1, workers)))
+        self.max_clients = max_clients
+        self._clients: "OrderedDict[tuple, _ClientState]" = OrderedDict()
+        self._redis = None
+        self.enabled = True
+        self.stats = {
+            "allowed": 0,
+            "rejected": 0,
+            "redis_checks": 0,
+            "redis_syncs": 0,
+            "redis_errors": 0,
+        }
+        _limiters.append(self)
+
+    def attach_redis(self, redis_client) -> None:
+        self._redis = redis_client
+
+    def detach_redis(self) -> None:
+        self._redis = None
+
+    def _redis_key(self, key: tuple, window: int) -> str:
+        return f"ratelimit:{self.name}:" + ":".join(key) + f":{window}"
+
+    def _window_ttl_ms(self, window: int) -> int:
+        # Keep the counter a little longer than its window, late syncs still land in it
+        return int(((window + 1) * self.seconds - time.time()) * 1000) + 1000
+
+    def _state(self, key: tuple, now: float, window: int) -> _ClientState:
+        state = self._clients.get(key)
+        if state is None:
+            state = _ClientState(self.times, now, window)
+            self._clients[key] = state
+            while len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+        else:
+            self._clients.move_to_end(key)
+            state.tokens = min(self.times, state.tokens + (now - state.updated) * self.rate)
+            state.updated = now
+            if state.window != window:
+                # Hits of a past window don't count anymore
+                state.window = window
+                state.pending = 0
+                state.remote_used = 0
+                state.near_limit = False
+        return state
+
+    def _reject(self, retry_after: float):
+        self.stats["rejected"] += 1
+        raise HTTPException(
+            HTTP_429_TOO_MANY_REQUESTS,
+            "Too Many Requests",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+    async def __call__(self, request: Request):
+        if not self.enabled:
+            return
+        route = request.scope.get("route")
+        key = (get_real_client_ip(request), getattr(route, "path", request.url.path))
+        now = time.monotonic()
+        window = int(time.time() // self.seconds)
+        state = self._state(key, now, window)
+
+        if state.tokens < 1:
+            self._reject((1 - state.tokens) / self.rate)
+        # Take the token before awaiting Redis, concurrent requests must not reuse it
+        state.tokens -= 1
+
+        if self._redis is not None and (
+            state.near_limit
+            or state.pending >= self.local_budget
+            or state.remote_used + state.pending + 1 > self.times * NEAR_LIMIT_FRACTION
+        ):
+            # Close to the limit: add this and the unsynced hits and check the shared count
+            # Stays that way, concurrent requests must not be decided locally while this one awaits
+            state.near_limit = True
+            hits = state.pending + 1
+            state.pending = 0
+            self.stats["redis_checks"] += 1
+            try:
+                total = await self._incr(self._redis_key(key, window), hits, window)
+            except Exception:
+                self.stats["redis_errors"] += 1
+                state.pending += hits
+            else:
+                if state.window == window:
+                    state.remote_used = total
+                if total > self.times:
+                    self._reject((window + 1) * self.seconds - time.time())
+        else:
+            state.pending += 1
+
+        self.stats["allowed"] += 1
+
+    async def _incr(self, redis_key: str, hits: int, window: int) -> int:
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.incrby(redis_key, hits)
+        pipe.pexpire(redis_key, self._window_ttl_ms(window))
+        total, _ = await pipe.execute()
+        return int(total)
+
+    async def sync(self) -> None:
+        """Add the unsynced hits of all clients to the shared counters in one round trip."""
+        if self._redis is None:
+            return
+        batch = []
+        for key, state in self._clients.items():
+            if state.pending:
+                batch.append((key, state, state.window, state.pending))
+                state.pending = 0
+        if not batch:
+            return
+
+        pipe = self._redis.pipeline(transaction=False)
+        for key, _, window, hits in batch:
+            redis_key = self._redis_key(key, window)
+            pipe.incrby(redis_key, hits)
+            pipe.pexpire(redis_key, self._window_ttl_ms(window))
+        try:
+            results = await pipe.execute()
+        except Exception:
+            self.stats["redis_errors"] += 1
+            # Retry with the next sync, unless the window has passed meanwhile
+            for _, state, window, hits in batch:
+                if state.window == window:
+                    state.pending += hits
+            return
+
+        self.stats["redis_syncs"] += 1
+        for (_, state, window, _), total in zip(batch, results[::2]):
+            if state.window == window:
+                state.remote_used = int(total)
+
+    def info(self) -> dict:
+        return {
+            **self.stats,
+            "limit": f"{self.times}/{self.seconds}s",
+            "enabled": self.enabled,
+            "clients": len(self._clients),
+            "shared": self._redis is not None,
+        }
+
+
+# Every RateLimit instance, for configuring and syncing
+_limiters: List[RateLimit] = []
+
+RATE_LIMIT_BACKENDS = ("redis", "memory", "off")
+
+
+def configure_rate_limits(backend: str, redis_client=None) -> None:
+    """Switch all limiters to the given backend ("redis" needs a connected client).
+
+    Raises:
+        ValueError: If the backend is unknown or "redis" is requested without a client.
+    """
+    if backend not in RATE_LIMIT_BACKENDS:
+        raise ValueError(
+            f"Unknown rate limit backend '{backend}', expected one of: {', '.join(RATE_LIMIT_BACKENDS)}"
+        )
+    if backend == "redis" and redis_client is None:
+        raise ValueError("The redis rate limit backend needs a Redis client")
+    for limiter in _limiters:
+        limiter.enabled = backend != "off"
+        if backend == "redis":
+            limiter.attach_redis(redis_client)
+        else:
+            limiter.detach_redis()
+
+
+async def sync_rate_limits(interval: float) -> None:
+    """Periodically push the locally counted hits of all limiters to Redis."""
+    while True:
+        await asyncio.sleep(interval)
+        for limiter in _limiters:
+            await limiter.sync()
+
+
+def rate_limit_info() -> dict:
+    return {limiter.name: limiter.info() for limiter in _limiters}
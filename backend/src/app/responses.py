@@ -0,0 +1,155 @@
+import gzip
+import hashlib
+import json
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+try:
+    import brotli
+except ImportError:  # Optional, without it only gzip variants are prepared
+    brotli = None
+
+# The mapping data only changes with a new street directory/OSM extraction
+# Clients and CDNs may reuse it for a day and revalidate it via ETag afterwards
+MAPPING_CACHE_CONTROL = "public, max-age=86400, stale-while-revalidate=604800"
+
+# Calendar subscriptions poll often, let them revalidate (cheap 304) after an hour
+CALENDAR_CACHE_CONTROL = "public, max-age=3600"
+
+# Same threshold as the GZipMiddleware, smaller bodies aren't worth compressing
+PRECOMPRESS_MIN_SIZE = 1024
+
+# Preferred content codings, best compression first
+PREFERRED_ENCODINGS = ("br", "gzip")
+
+
+class PreparedResponse:
+    """A payload serialized and compressed once, with strong content hash ETags.
+
+    Large bodies are precompressed with gzip and (if installed) brotli at the
+    highest level, the variant is picked per request from `Accept-Encoding`.
+    Keeps a reference to the parsed data for other in-memory consumers.
+
+    `data` is serialized as compact JSON, unless an already encoded `body`
+    (bytes or any buffer, e.g. an mmap) is passed.
+    """
+
+    __slots__ = ("data", "body", "etag", "media_type", "variants")
+
+    def __init__(self, data: Any, media_type: str = "application/json", body=None):
+        self.data = data
+        if body is None:
+            body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode(
+                "utf-8"
+            )
+        self.body = body
+        digest = hashlib.sha256(self.body).hexdigest()[:32]
+        self.etag = f'"{digest}"'
+        self.media_type = media_type
+
+        # Content coding -> (body, ETag), every representation needs its own strong ETag
+        self.variants: Dict[str, Tuple[Any, str]] = {"identity": (self.body, self.etag)}
+        if len(self.body) >= PRECOMPRESS_MIN_SIZE:
+            self.variants["gzip"] = (
+                gzip.compress(self.body, compresslevel=9, mtime=0),
+                f'"{digest}-gzip"',
+            )
+            if brotli is not None:
+                self.variants["br"] = (
+                    brotli.compress(self.body, quality=11),
+                    f'"{digest}-br"',
+                )
+
+    def select_variant(self, accept_encoding: str) -> str:
+        """Return the best available content coding for the Accept-Encoding header."""
+        if len(self.variants) == 1:
+            return "identity"
+        accepted = parse_accept_encoding(accept_encoding)
+        for encoding in PREFERRED_ENCODINGS:
+            if encoding in self.variants and accepted.get(encoding, accepted.get("*", 0)) > 0:
+                return encoding
+        return "identity"
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q-value}."""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match header against the given ETag."""
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so ignore a "W/" prefix
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified_since(request: Request, last_modified: float) -> bool:
+    """Check the request's If-Modified-Since header against a Unix timestamp."""
+    if_modified_since = request.headers.get("If-Modified-Since")
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have a resolution of one second
+    return int(last_modified) <= since.timestamp()
+
+
+def serve_prepared(
+    request: Request,
+    prepared: PreparedResponse,
+    cache_control: str = MAPPING_CACHE_CONTROL,
+    last_modified: Optional[float] = None,
+) -> Response:
+    """Return the best precompressed variant, or an empty 304 if the client already has it.
+
+    Compressed variants set Content-Encoding, so the GZipMiddleware passes them through.
+    With `last_modified` (Unix timestamp) a Last-Modified header is sent and
+    If-Modified-Since is honored for clients that don't send If-None-Match.
+    """
+    encoding = prepared.select_variant(request.headers.get("Accept-Encoding", ""))
+    body, etag = prepared.variants[encoding]
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+    if len(prepared.variants) > 1:
+        headers["Vary"] = "Accept-Encoding"
+    if "If-None-Match" in request.headers:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110, 13.2.2)
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+    elif last_modified is not None and not_modified_since(request, last_modified):
+        return Response(status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    elif len(body) >= PRECOMPRESS_MIN_SIZE:
+        # The GZipMiddleware adds the Vary header itself to uncompressed large bodies
+        del headers["Vary"]
+    return Response(body, media_type=prepared.media_type, headers=headers)
@@ -1,17 +1,60 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date
+from enum import Enum
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import BaseModel, Field
 from .utils import validate_zone_code
 from .file_io import (
     load_zone_data,
-    load_street_zone_mapping,
-    load_street_coords_mapping,
-    load_download_links_availability,
+    get_waste_data_store,
+    get_zone_calendar,
+    get_street_zone_mapping_response,
+    get_street_coords_mapping_response,
+    get_street_segment_index,
+    get_street_search_index,
+    get_street_matcher,
+    get_download_links_availability,
 )
-from .logic import get_next_pickups, get_future_pickups
+from .logic import get_next_pickups, get_future_pickups, locate_street
 from .exceptions import ZoneNotFoundError
+from .schedule_index import WASTE_TYPES
+from .responses import CALENDAR_CACHE_CONTROL, serve_prepared
 
 router = APIRouter()
 
 
+class StreetCoordsFormat(str, Enum):
+    JSON = "json"
+    POLYLINE = "polyline"
+    BINARY = "binary"
+
+
+class BatchInclude(str, Enum):
+    NEXT = "next"
+    SCHEDULE = "schedule"
+
+
+class BatchRequest(BaseModel):
+    zones: List[str] = Field(..., min_length=1, max_length=100)
+    include: List[BatchInclude] = Field([BatchInclude.NEXT], min_length=1)
+
+
+# Caps of the locate endpoints, a batch of far away points at the maximum radius
+# must stay well below a second of CPU (see tests/test_spatial_index.py)
+LOCATE_MAX_DISTANCE = 1000
+LOCATE_MAX_POINTS = 500
+
+
+class LocatePoint(BaseModel):
+    lat: float = Field(..., ge=-90, le=90)
+    lon: float = Field(..., ge=-180, le=180)
+
+
+class LocateBatchRequest(BaseModel):
+    points: List[LocatePoint] = Field(..., min_length=1, max_length=LOCATE_MAX_POINTS)
+    max_distance: float = Field(500, gt=0, le=LOCATE_MAX_DISTANCE)
+
+
 @router.get(
     "/api/waste-collection/{zone_code}/next",
     summary="Get next pickups for a zone",
@@ -35,8 +78,9 @@ async def next_pickups(zone_code: str = Depends(validate_zone_code)):
     in `YYYY-MM-DD` format.
     """
     try:
-        zone_data = load_zone_data(zone_code)
-        return get_next_pickups(zone_code, zone_data)
+        store = get_waste_data_store()
+        zone_schedule = store.get_zone(zone_code)
+        return await get_next_pickups(zone_code, zone_schedule, store.version)
     except ZoneNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except HTTPException:
@@ -52,23 +96,49 @@ async def next_pickups(zone_code: str = Depends(validate_zone_code)):
     tags=["Waste Collection"],
     responses={
         200: {"description": "Schedule returned successfully."},
-        400: {"description": "Invalid zone code (validation failed)."},
+        400: {"description": "Invalid zone code, date range or waste type."},
         404: {"description": "Zone not found."},
         500: {
             "description": "Server error (e.g. missing or corrupted waste data files)."
         },
     },
 )
-async def future_schedule(zone_code: str = Depends(validate_zone_code)):
+async def future_schedule(
+    zone_code: str = Depends(validate_zone_code),
+    from_date: Optional[date] = Query(
+        None, alias="from", description="First date (YYYY-MM-DD), defaults to today."
+    ),
+    to_date: Optional[date] = Query(
+        None, alias="to", description="Last date (YYYY-MM-DD, inclusive)."
+    ),
+    types: Optional[str] = Query(
+        None, description="Comma separated waste types, e.g. `Biomüll,Papiermüll`."
+    ),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of dates."),
+):
     """Returns the future schedule for the provided `zone_code`.
 
-    The response contains upcoming pickup dates for the next several weeks/months.
+    The response contains upcoming pickup dates for the next several weeks/months,
+    optionally restricted to a date range and to certain waste types.
     The response includes a `reference_date` field which is given in UTC
     in `YYYY-MM-DD` format.
     """
     try:
-        zone_data = load_zone_data(zone_code)
-        return get_future_pickups(zone_code, zone_data)
+        if from_date and to_date and from_date > to_date:
+            raise HTTPException(status_code=400, detail="`from` must not be after `to`")
+        waste_types = None
+        if types is not None:
+            waste_types = [t.strip() for t in types.split(",") if t.strip()]
+            unknown = [t for t in waste_types if t not in WASTE_TYPES]
+            if not waste_types or unknown:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Invalid waste type, expected one of: {', '.join(WASTE_TYPES)}",
+                )
+        zone_schedule = load_zone_data(zone_code)
+        return get_future_pickups(
+            zone_code, zone_schedule, from_date, to_date, waste_types, limit
+        )
     except ZoneNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except HTTPException:
@@ -77,9 +147,100 @@ async def future_schedule(zone_code: str = Depends(validate_zone_code)):
         raise HTTPException(status_code=500, detail="Unexpected server error")
 
 
-# Don't offer a "(partial)street_name" route that returns possible candidates and their zone codes
-# but send all street mapping entries to the client and let them do the search/filter
-# NOTE: Works because Amberg only has a few hundred streets and saves server workload
+@router.get(
+    "/api/waste-collection/{zone_code}/calendar.ics",
+    summary="Get an iCalendar feed for a zone",
+    description=(
+        "Returns all pickup dates of the given zone as an iCalendar (.ics) feed for "
+        "calendar subscriptions. Supports conditional requests via ETag/Last-Modified."
+    ),
+    tags=["Waste Collection"],
+    response_class=Response,
+    responses={
+        200: {"description": "Calendar returned successfully.", "content": {"text/calendar": {}}},
+        304: {"description": "Calendar unchanged (matches `If-None-Match`/`If-Modified-Since`)."},
+        400: {"description": "Invalid zone code (validation failed)."},
+        404: {"description": "Zone not found."},
+        500: {
+            "description": "Server error (e.g. missing or corrupted waste data files)."
+        },
+    },
+)
+async def zone_calendar(request: Request, zone_code: str = Depends(validate_zone_code)):
+    """Return the pickups of the provided `zone_code` as an iCalendar feed.
+
+    The feed is rendered once per zone and schedule version, polling calendar
+    clients get an empty `304` as long as nothing changed.
+    """
+    try:
+        calendar = get_zone_calendar(zone_code)
+        return serve_prepared(
+            request,
+            calendar.response,
+            cache_control=CALENDAR_CACHE_CONTROL,
+            last_modified=calendar.modified_at,
+        )
+    except ZoneNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(status_code=500, detail="Unexpected server error")
+
+
+@router.post(
+    "/api/waste-collection/batch",
+    summary="Get next pickups and/or schedules for several zones",
+    description=(
+        "Returns the next pickups and/or the future schedule for every requested zone "
+        "in one response (counts as a single request for the rate limit)."
+    ),
+    tags=["Waste Collection"],
+    responses={
+        200: {"description": "Results returned successfully."},
+        400: {"description": "Invalid zone code (validation failed)."},
+        500: {
+            "description": "Server error (e.g. missing or corrupted waste data files)."
+        },
+    },
+)
+async def batch_pickups(batch: BatchRequest):
+    """Return `{"zones": {zone_code: {"next", "schedule"}}, "not_found": [...]}`.
+
+    Each zone entry holds the same responses as the single zone `/next` and
+    `/schedule` routes (only the requested ones). Duplicate zone codes are
+    answered once, zones without data are listed in `not_found`.
+    """
+    try:
+        zone_codes = list(dict.fromkeys(validate_zone_code(code) for code in batch.zones))
+        include = set(batch.include)
+        # One store for the whole batch, all zones are answered from the same data version
+        store = get_waste_data_store()
+
+        zones = {}
+        not_found = []
+        for zone_code in zone_codes:
+            try:
+                zone_schedule = store.get_zone(zone_code)
+            except ZoneNotFoundError:
+                not_found.append(zone_code)
+                continue
+            result = {}
+            if BatchInclude.NEXT in include:
+                result["next"] = await get_next_pickups(zone_code, zone_schedule, store.version)
+            if BatchInclude.SCHEDULE in include:
+                result["schedule"] = get_future_pickups(zone_code, zone_schedule)
+            zones[zone_code] = result
+        return {"zones": zones, "not_found": not_found}
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(status_code=500, detail="Unexpected server error")
+
+
+# Send all street mapping entries to the client and let them do the search/filter
+# NOTE: Works because Amberg only has a few hundred streets, clients that can't (low-end phones)
+# or don't want to download the whole directory use the search route below instead
 @router.get(
     "/api/waste-collection/street-zone-mapping",
     summary="Get street → zone mapping",
@@ -90,13 +251,78 @@ async def future_schedule(zone_code: str = Depends(validate_zone_code)):
     tags=["Mapping"],
     responses={
         200: {"description": "Mapping returned successfully."},
+        304: {"description": "Mapping unchanged (matches `If-None-Match`)."},
+        500: {"description": "Server error (mapping file missing or corrupted)."},
+    },
+)
+async def street_zone_mapping(request: Request):
+    """Return the street to zone mapping for all streets in Amberg.
+
+    The body is serialized once at load time and served with a content hash
+    `ETag`, a matching `If-None-Match` returns an empty `304`.
+    """
+    try:
+        return serve_prepared(request, get_street_zone_mapping_response())
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(status_code=500, detail="Unexpected server error")
+
+
+@router.get(
+    "/api/waste-collection/streets/search",
+    summary="Search streets by (partial) name",
+    description=(
+        "Returns the best matching streets and their zone codes for a (partial) street "
+        "name. Matching ignores case, umlaut spelling (ü/ue, ß/ss), `Str.`/`Straße` "
+        "and punctuation and tolerates small typos."
+    ),
+    tags=["Mapping"],
+    responses={
+        200: {"description": "Matches returned successfully."},
+        500: {"description": "Server error (mapping file missing or corrupted)."},
+    },
+)
+async def street_search(
+    q: str = Query(..., min_length=1, max_length=100, description="(Partial) street name."),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of results."),
+):
+    """Return `{"query", "results": [{"street", "zone"}]}`, best matches first.
+
+    Prefix matches rank before substring matches, followed by similar names.
+    """
+    try:
+        return {"query": q, "results": get_street_search_index().search(q, limit)}
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(status_code=500, detail="Unexpected server error")
+
+
+@router.get(
+    "/api/waste-collection/streets/lookup",
+    summary="Typo tolerant street lookup",
+    description=(
+        "Returns the streets whose name is most similar to the given (possibly "
+        "misspelled) full street name, with their zone codes and a similarity score (0-100)."
+    ),
+    tags=["Mapping"],
+    responses={
+        200: {"description": "Candidates returned successfully."},
         500: {"description": "Server error (mapping file missing or corrupted)."},
     },
 )
-async def street_zone_mapping():
-    """Return the street to zone mapping for all streets in Amberg."""
+async def street_lookup(
+    name: str = Query(..., min_length=1, max_length=100, description="Street name."),
+    limit: int = Query(5, ge=1, le=20, description="Maximum number of results."),
+):
+    """Return `{"query", "results": [{"street", "zone", "score"}]}`, best match first.
+
+    Uses the same normalization and scorer as the OSM street matching of the
+    extraction pipeline (see street_matcher.py).
+    """
     try:
-        return load_street_zone_mapping()
+        return {"query": name, "results": get_street_matcher().lookup(name, limit)}
     except HTTPException:
         raise
     except Exception:
@@ -109,20 +335,153 @@ async def street_zone_mapping():
     summary="Get street → zone → coordinates mapping",
     description=(
         "Returns a full mapping of street names to zone codes and geo-coordinates. "
-        "Useful for rendering maps on the client side."
+        "Useful for rendering maps on the client side. With `format=polyline` the "
+        "segments are grouped per street and zone and encoded as Google polylines. "
+        "With `format=binary` flat typed arrays are returned (see street_geometry_format.py)."
     ),
     tags=["Mapping"],
     responses={
         200: {"description": "Coordinates mapping returned successfully."},
+        304: {"description": "Mapping unchanged (matches `If-None-Match`)."},
+        500: {
+            "description": "Server error (coordinates mapping file missing or corrupted)."
+        },
+    },
+)
+async def street_coordinates_mapping(
+    request: Request,
+    format: StreetCoordsFormat = Query(
+        StreetCoordsFormat.JSON, description="Response format of the geometries."
+    ),
+):
+    """Return a mapping of streets, their zone codes, and geo-coordinates.
+
+    - `json`: `{"streets": [{"name", "coords": [[lat, lon], ...], "zone"}]}`, one entry per segment
+    - `polyline`: `{"format", "precision", "streets": [{"name", "zone", "segments": [...]}]}`,
+      each segment is an encoded polyline with `precision` decimals
+    - `binary`: little-endian int32 coordinates, uint32 segment offsets and a
+      street/zone dictionary, served straight from the memory-mapped file
+
+    The body is serialized once at load time and served with a content hash
+    `ETag`, a matching `If-None-Match` returns an empty `304`.
+    """
+    try:
+        return serve_prepared(request, get_street_coords_mapping_response(format.value))
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(status_code=500, detail="Unexpected server error")
+
+
+# Returns only the segments of the street coordinates mapping that are inside a viewport
+# Lets the map load incrementally instead of downloading every segment up front
+@router.get(
+    "/api/waste-collection/street-coordinates-mapping/bbox",
+    summary="Get street segments within a bounding box",
+    description=(
+        "Returns the street segments (name, zone code, coordinates) whose bounding "
+        "box intersects the requested viewport."
+    ),
+    tags=["Mapping"],
+    responses={
+        200: {"description": "Segments returned successfully."},
+        400: {"description": "Invalid bounding box (min greater than max)."},
         500: {
             "description": "Server error (coordinates mapping file missing or corrupted)."
         },
     },
 )
-async def street_coordinates_mapping():
-    """Return a mapping of streets, their zone codes, and geo-coordinates."""
+async def street_coordinates_bbox(
+    min_lat: float = Query(..., alias="minLat", ge=-90, le=90),
+    min_lon: float = Query(..., alias="minLon", ge=-180, le=180),
+    max_lat: float = Query(..., alias="maxLat", ge=-90, le=90),
+    max_lon: float = Query(..., alias="maxLon", ge=-180, le=180),
+):
+    """Return the street segments intersecting the bounding box.
+
+    The response has the same shape as the `json` format of the full mapping:
+    `{"streets": [{"name", "coords": [[lat, lon], ...], "zone"}]}`.
+    """
+    if min_lat > max_lat or min_lon > max_lon:
+        raise HTTPException(status_code=400, detail="Invalid bounding box")
+    try:
+        body = get_street_segment_index().query_bbox_json(
+            min_lat, min_lon, max_lat, max_lon
+        )
+        return Response(body, media_type="application/json")
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(status_code=500, detail="Unexpected server error")
+
+
+# "Which zone am I in" for a GPS position, without the client needing the coordinates mapping
+@router.get(
+    "/api/waste-collection/locate",
+    summary="Get the nearest street and zone for a position",
+    description=(
+        "Returns the street name and zone code of the street segment closest to "
+        "the given coordinates."
+    ),
+    tags=["Mapping"],
+    responses={
+        200: {"description": "Nearest street returned successfully."},
+        404: {"description": "No street within `max_distance` meters."},
+        500: {
+            "description": "Server error (coordinates mapping file missing or corrupted)."
+        },
+    },
+)
+async def locate(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    max_distance: float = Query(
+        500, gt=0, le=LOCATE_MAX_DISTANCE, description="Search radius in meters."
+    ),
+):
+    """Return `{"lat", "lon", "street", "zone", "distance_m"}` of the nearest street segment."""
+    try:
+        result = locate_street(get_street_segment_index(), lat, lon, max_distance)
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(status_code=500, detail="Unexpected server error")
+    if result is None:
+        raise HTTPException(
+            status_code=404, detail=f"No street found within {max_distance:g} meters"
+        )
+    return result
+
+
+@router.post(
+    "/api/waste-collection/locate",
+    summary="Get the nearest streets and zones for multiple positions",
+    description=(
+        f"Batch variant of the locate endpoint for up to {LOCATE_MAX_POINTS} positions. "
+        "Positions without a street in range have a `null` result."
+    ),
+    tags=["Mapping"],
+    responses={
+        200: {"description": "Nearest streets returned successfully."},
+        500: {
+            "description": "Server error (coordinates mapping file missing or corrupted)."
+        },
+    },
+)
+def locate_batch(body: LocateBatchRequest):
+    """Return `{"results": [...]}` in the order of the requested points.
+
+    A plain `def`, FastAPI runs it in the threadpool so a large batch doesn't
+    block the event loop.
+    """
     try:
-        return load_street_coords_mapping()
+        index = get_street_segment_index()
+        return {
+            "results": [
+                locate_street(index, point.lat, point.lon, body.max_distance)
+                for point in body.points
+            ]
+        }
     except HTTPException:
         raise
     except Exception:
@@ -144,7 +503,7 @@ async def street_coordinates_mapping():
 async def download_links_availability():
     """Return the download links availability state."""
     try:
-        return load_download_links_availability()
+        return get_download_links_availability()
     except HTTPException:
         raise
     except Exception:
@@ -0,0 +1,123 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Dict, Iterable, Optional, Tuple
+
+# Waste types in the order they're returned by the API
+WASTE_TYPES = ("Restmüll", "Biomüll", "Papiermüll", "Gelber Sack")
+
+# Waste type -> bit in the per date waste type mask
+WASTE_TYPE_BITS = {waste_type: 1 << i for i, waste_type in enumerate(WASTE_TYPES)}
+
+
+class ZoneSchedule:
+    """Pickup schedule of a single zone, precompiled into sorted arrays.
+
+    All date parsing and sorting happens once at load time. On the request
+    path dates are compared as ordinal day numbers (`date.toordinal()`), so
+    the next pickup is a binary search and the future schedule a slice.
+    """
+
+    __slots__ = ("dates", "ordinals", "masks", "waste_types", "type_dates", "type_ordinals")
+
+    def __init__(self, zone_data: dict):
+        entries = sorted(zone_data.items())
+
+        # Parallel arrays, one entry per pickup date
+        self.dates = tuple(date_str for date_str, _ in entries)
+        self.ordinals = array(
+            "l", (date.fromisoformat(date_str).toordinal() for date_str in self.dates)
+        )
+        self.waste_types = tuple(tuple(waste_types) for _, waste_types in entries)
+        self.masks = array(
+            "B",
+            (
+                sum(WASTE_TYPE_BITS.get(waste_type, 0) for waste_type in set(waste_types))
+                for waste_types in self.waste_types
+            ),
+        )
+
+        # Per waste type: sorted pickup dates of only that type
+        type_dates = {}
+        type_ordinals = {}
+        for date_str, ordinal, waste_types in zip(
+            self.dates, self.ordinals, self.waste_types
+        ):
+            for waste_type in waste_types:
+                type_dates.setdefault(waste_type, []).append(date_str)
+                type_ordinals.setdefault(waste_type, array("l")).append(ordinal)
+        self.type_dates = {t: tuple(dates) for t, dates in type_dates.items()}
+        self.type_ordinals = type_ordinals
+
+    def __len__(self):
+        return len(self.dates)
+
+    def first_index(self, day_ordinal: int) -> int:
+        """Return the index of the first pickup on or after the given day."""
+        return bisect_left(self.ordinals, day_ordinal)
+
+    def next_pickup(self, waste_type: str, day_ordinal: int) -> str:
+        """Return the next pickup date of a waste type on or after the given day.
+
+        Returns "" if there is no such date in the dataset.
+        """
+        ordinals = self.type_ordinals.get(waste_type)
+        if ordinals is None:
+            return ""
+        i = bisect_left(ordinals, day_ordinal)
+        if i == len(ordinals):
+            return ""
+        return self.type_dates[waste_type][i]
+
+    def pickups_between(
+        self,
+        start: int,
+        end: Optional[int] = None,
+        types: Optional[Iterable[str]] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Tuple[str, ...]]:
+        """Return {date: waste types} of the pickups from `start` to `end` (ordinals, inclusive).
+
+        The date range is found by binary search and answered as a slice. With
+        `types`, only dates with one of these types are returned (listing only
+        those types), a single type is a slice of its own date array. `limit`
+        caps the number of dates.
+        """
+        if types is None:
+            lo, hi = _bounds(self.ordinals, start, end)
+            if limit is not None:
+                hi = min(hi, lo + limit)
+            return dict(zip(self.dates[lo:hi], self.waste_types[lo:hi]))
+
+        types = set(types)
+        if len(types) == 1:
+            (waste_type,) = types
+            ordinals = self.type_ordinals.get(waste_type)
+            if ordinals is None:
+                return {}
+            lo, hi = _bounds(ordinals, start, end)
+            if limit is not None:
+                hi = min(hi, lo + limit)
+            only_type = (waste_type,)
+            return {date_str: only_type for date_str in self.type_dates[waste_type][lo:hi]}
+
+        # Several types: walk the date range and skip dates by their type mask
+        type_mask = sum(WASTE_TYPE_BITS.get(waste_type, 0) for waste_type in types)
+        lo, hi = _bounds(self.ordinals, start, end)
+        pickups = {}
+        masks = self.masks
+        for i in range(lo, hi):
+            if masks[i] & type_mask:
+                pickups[self.dates[i]] = tuple(
+                    waste_type for waste_type in self.waste_types[i] if waste_type in types
+                )
+                if limit is not None and len(pickups) == limit:
+                    break
+        return pickups
+
+
+def _bounds(ordinals: array, start: int, end: Optional[int]) -> Tuple[int, int]:
+    """Return the slice bounds of the sorted ordinals within [start, end]."""
+    lo = bisect_left(ordinals, start)
+    hi = len(ordinals) if end is None else bisect_right(ordinals, end)
+    return lo, hi
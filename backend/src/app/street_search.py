@@ -0,0 +1,101 @@
+import re
+from bisect import bisect_left
+from collections import Counter
+from itertools import chain
+from typing import Dict, List, Tuple
+
+_UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+_STR_ABBREVIATION = re.compile(r"str\.")
+_NON_ALNUM = re.compile(r"[^a-z0-9]")
+
+
+def fold_street_name(name: str) -> str:
+    """Fold a street name for matching.
+
+    Lowercases, transliterates umlauts/ß, expands the "Str." abbreviation and
+    drops spaces, hyphens and punctuation, so "Adalbert-Stifter-Str.",
+    "adalbert stifter straße" and "Adalbert-Stifter-Strasse" all fold to
+    "adalbertstifterstrasse".
+    """
+    folded = name.lower().translate(_UMLAUTS)
+    folded = _STR_ABBREVIATION.sub("strasse", folded)
+    return _NON_ALNUM.sub("", folded)
+
+
+def _trigrams(folded: str) -> set:
+    return {folded[i : i + 3] for i in range(len(folded) - 2)}
+
+
+class StreetSearchIndex:
+    """Autocomplete index over the street → zone mapping.
+
+    Keeps the folded street names in a sorted array for prefix lookups
+    (binary search) and a trigram → street postings index for substring and
+    approximate matches.
+    """
+
+    def __init__(self, mapping: Dict[str, str]):
+        # (folded name, street name, zone code), sorted by folded name
+        self.entries: List[Tuple[str, str, str]] = sorted(
+            (fold_street_name(street), street, zone) for street, zone in mapping.items()
+        )
+        self.keys = [folded for folded, _, _ in self.entries]
+        self.trigrams: Dict[str, List[int]] = {}
+        self.trigram_counts: List[int] = []
+        for i, folded in enumerate(self.keys):
+            trigrams = _trigrams(folded)
+            self.trigram_counts.append(len(trigrams))
+            for trigram in trigrams:
+                self.trigrams.setdefault(trigram, []).append(i)
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
+        """Return up to `limit` streets matching the query, best matches first.
+
+        Ranking: prefix matches, then substring matches (earlier position first),
+        then streets sharing most of the query's trigrams (tolerates typos).
+        """
+        folded = fold_street_name(query)
+        if not folded:
+            return []
+
+        # 1. Prefix matches are a contiguous range of the sorted keys
+        matches: List[int] = []
+        i = bisect_left(self.keys, folded)
+        while i < len(self.keys) and self.keys[i].startswith(folded) and len(matches) < limit:
+            matches.append(i)
+            i += 1
+
+        query_trigrams = _trigrams(folded)
+        if len(matches) < limit and query_trigrams:
+            # Count shared trigrams per street from the postings lists
+            shared = Counter(
+                chain.from_iterable(self.trigrams.get(t, ()) for t in query_trigrams)
+            )
+
+            found = set(matches)
+            # 2. Substring matches contain every trigram of the query
+            substring = sorted(
+                (self.keys[entry].find(folded), entry)
+                for entry, count in shared.items()
+                if count == len(query_trigrams) and entry not in found
+                and folded in self.keys[entry]
+            )
+            matches.extend(entry for _, entry in substring[: limit - len(matches)])
+            found.update(matches)
+
+            # 3. Approximate matches by trigram similarity (Jaccard)
+            if len(matches) < limit:
+                similar = []
+                query_count = len(query_trigrams)
+                counts = self.trigram_counts
+                for entry, count in shared.items():
+                    score = count / (query_count + counts[entry] - count)
+                    if score >= 0.3 and entry not in found:
+                        similar.append((-score, entry))
+                similar.sort()
+                matches.extend(entry for _, entry in similar[: limit - len(matches)])
+
+        return [
+            {"street": self.entries[entry][1], "zone": self.entries[entry][2]}
+            for entry in matches
+        ]
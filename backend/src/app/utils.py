@@ -1,4 +1,4 @@
-from fastapi import Depends, Path, HTTPException
+from fastapi import Path, HTTPException
 import re
 
 def validate_zone_code(zone_code: str = Path(...)) -> str:
@@ -9,13 +9,3 @@ def validate_zone_code(zone_code: str = Path(...)) -> str:
     if not re.match(pattern, clean_code):
         raise HTTPException(status_code=400, detail="Invalid zone code")
     return clean_code
-
-def extract_zone_identifiers(zone_code: str = Depends(validate_zone_code)):
-    # Extract zone code (A4) into zone identifiers letter (A) and number (4) for lookup in the schedule data
-    zone_letter = zone_code[0]
-    zone_number = zone_code[1]
-
-    return zone_letter, zone_number
-
-def sort_zone_code_schedule(zone_data):
-    return dict(sorted(zone_data.items()))
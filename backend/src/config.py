@@ -13,3 +13,40 @@ PDF_PLAN_DIR = BASE_DIR / "resources" / "pdf_waste_collection_plans"
 WASTE_JSON_DIR = BASE_DIR / "resources" / "waste_collection_api_data"
 STREET_ZONES_DIR = BASE_DIR / "resources" / "street_zones_mapping"
 DOWNLOAD_LINKS_DIR = BASE_DIR / "resources" / "download_links"
+
+# Worker processes of the calendar OCR (data extraction), 1 runs it in this process
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", "1"))
+
+# Calendar OCR engine: "cells" (detection + recognition per cell) or "batched" (one detection pass per month column)
+OCR_ENGINE = os.getenv("OCR_ENGINE", "cells").lower()
+
+# Reuse rendered PDF pages and the OCR results of earlier runs on identical (preprocessed) pixels
+OCR_CACHE = os.getenv("OCR_CACHE", "true").lower() in ("1", "true", "yes")
+OCR_CACHE_PATH = BASE_DIR / "resources" / "ocr_cache" / "ocr_results.sqlite"
+PDF_RENDER_CACHE_DIR = BASE_DIR / "resources" / "ocr_cache" / "pages"
+
+# Seconds between checks of the resource files for changes (hot reload in the API), 0 disables it
+DATA_RELOAD_INTERVAL = float(os.getenv("DATA_RELOAD_INTERVAL", "30"))
+
+# Share cached API responses between workers through Redis (only used if Redis is reachable)
+RESPONSE_CACHE_REDIS = os.getenv("RESPONSE_CACHE_REDIS", "false").lower() in ("1", "true", "yes")
+
+# Number of API worker processes, they share the rate limits through Redis
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+# Seconds between the batched syncs of the locally counted rate limit hits to Redis
+RATE_LIMIT_SYNC_INTERVAL = float(os.getenv("RATE_LIMIT_SYNC_INTERVAL", "1"))
+
+# Rate limit backend of the API: "redis" (shared between workers, falls back to
+# "memory" if Redis isn't reachable), "memory" (per worker only) or "off"
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "redis").lower()
+
+# Redis used for the rate limits and the shared response cache
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")  # Hostname specified in docker-compose
+
+# Reverse proxies (CIDR, comma separated) whose X-Forwarded-For / X-Real-IP headers are trusted
+# Defaults to loopback and the private range Docker assigns its networks from
+TRUSTED_PROXIES = os.getenv("TRUSTED_PROXIES", "127.0.0.1/32,::1/128,172.16.0.0/12").split(",")
+
+# Directory the API workers share their metrics through (aggregated on /metrics), unset for a single process
+METRICS_DIR = os.getenv("METRICS_DIR") or None
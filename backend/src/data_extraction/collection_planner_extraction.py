@@ -1,4 +1,7 @@
 import easyocr
+from easyocr.config import imgH as RECOGNITION_HEIGHT
+from easyocr.recognition import get_text
+from easyocr.utils import get_image_list
 import cv2
 from PIL import Image
 import numpy as np
@@ -6,54 +9,131 @@ import pandas as pd
 from pdf2image import convert_from_path
 from tqdm import tqdm
 
+import hashlib
+import os
 import sys
+import time
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
 # Add the parent directory to sys.path to import config
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 import config
+from ocr_cache import OcrCache
 
 PDF_PLAN_DIR = config.PDF_PLAN_DIR
 OCR_RESULTS_DIR = config.OCR_RESULTS_DIR
+OCR_WORKERS = config.OCR_WORKERS
+OCR_ENGINE = config.OCR_ENGINE
+OCR_CACHE = config.OCR_CACHE
+OCR_CACHE_PATH = config.OCR_CACHE_PATH
+PDF_RENDER_CACHE_DIR = config.PDF_RENDER_CACHE_DIR
+
+# Resolution the calendar pages are rendered at (the box coordinates refer to it)
+PDF_DPI = 300
+
+# Longest side (px) the text detection runs at, EasyOCR's default
+DETECTION_CANVAS_SIZE = 2560
+
+# Extraction engines: "cells" runs detection + recognition per cell, "batched"
+# detects the text once per month column and recognizes all boxes in batches
+OCR_ENGINES = ("cells", "batched")
+
+
+def _file_sha256(file_path):
+    """
+    Return the SHA-256 hex digest of a file, read in chunks.
+
+    Args:
+        file_path (Path): File to hash.
+
+    Returns:
+        str: Hex digest of the file content.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _render_pdf_page(file_path, dpi=PDF_DPI, page=1, use_cache=True):
+    """
+    Render a single page of a PDF, reusing an earlier rendering if possible.
+
+    Only the requested page is rasterized (not the whole document). The
+    rendered page is stored as a (lossless) PNG in PDF_RENDER_CACHE_DIR,
+    keyed by the hash of the PDF content, the page and the DPI, so repeated
+    extraction runs with other crop boxes skip the rendering.
+
+    Args:
+        file_path (Path): PDF file.
+        dpi (int): Render resolution (default PDF_DPI).
+        page (int): 1-based page number (default 1).
+        use_cache (bool): Read/write the render cache (default True).
+
+    Returns:
+        PIL.Image: Rendered page.
+    """
+    cache_path = None
+    if use_cache:
+        cache_path = (
+            PDF_RENDER_CACHE_DIR / f"{_file_sha256(file_path)}_p{page}_{dpi}dpi.png"
+        )
+        if cache_path.exists():
+            with Image.open(cache_path) as cached:
+                return cached.convert("RGB")
+
+    img = convert_from_path(file_path, dpi=dpi, first_page=page, last_page=page)[0]
+
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        img.save(tmp_path, format="PNG")
+        os.replace(tmp_path, cache_path)
+    return img
 
 
 # Load and crop the pdf
-def _load_pdf_image(pdf_name, box_coords):
+def _load_pdf_image(pdf_name, box_coords, use_cache=True):
     """
     Load a PDF file and crop the first page to the specified bounding box.
 
     Args:
         pdf_name (str): Name of the PDF file in the PDF_PLAN_DIR.
         box_coords (tuple): (left, top, right, bottom) coordinates for cropping.
+        use_cache (bool): Reuse an earlier rendering of the page (default True).
 
     Returns:
-        PIL.Image: Cropped image of the PDF page.
+        np.ndarray: Cropped RGB image of the PDF page (a view of the page array).
     """
     file_path = PDF_PLAN_DIR / pdf_name
 
-    images = convert_from_path(file_path, dpi=300)
-    img = images[0]
-    cropped = img.crop(box_coords)
-    return cropped
+    page = np.asarray(_render_pdf_page(file_path, use_cache=use_cache))
+    left, top, right, bottom = box_coords
+    return page[top:bottom, left:right]
 
 
 # Image preprocessing
 def _preprocess_image(image):
     """
-    Preprocess a PIL image for OCR by converting to grayscale, enhancing contrast,
+    Preprocess an RGB image for OCR by converting to grayscale, enhancing contrast,
     and applying denoising.
 
     Args:
-        image (PIL.Image): Input image to preprocess.
+        image (np.ndarray): Input RGB image to preprocess.
 
     Returns:
-        PIL.Image: Preprocessed grayscale image.
+        np.ndarray: Preprocessed grayscale image (uint8).
     """
-    # PIL → OpenCV
-    img = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
-
     # Convert to grayscale
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
 
     # CLAHE = local contrast enhancement (works for light text on darker backgrounds and dark text on light backgrounds)
     clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
@@ -63,7 +143,7 @@ def _preprocess_image(image):
     gray = cv2.bilateralFilter(gray, 9, 75, 75)
 
     # No hard thresholding here, to keep all text in picture
-    return Image.fromarray(gray)
+    return gray
 
 
 def _compute_bounds(total_pixels, parts):
@@ -117,48 +197,146 @@ def _cell_coords(col_idx, row_idx, col_bounds, row_bounds, overlap, width, heigh
 
 def _upscale_image(img, scale=2):
     """
-    Safely upscale a PIL image, falling back on the original on error.
-
-    Uses BICUBIC resampling for quality. If resizing fails, returns original image.
+    Upscale a grayscale image with bicubic interpolation.
 
     Args:
-        img (PIL.Image): Image to upscale.
+        img (np.ndarray): Image to upscale.
         scale (int): Scaling factor (default 2).
 
     Returns:
-        PIL.Image: Upscaled image or original if error.
+        np.ndarray: Upscaled image.
     """
-    try:
-        return img.resize(
-            (max(1, img.width * scale), max(1, img.height * scale)),
-            resample=Image.BICUBIC,
-        )
-    except Exception:
-        return img
+    return cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
 
 
-def _ocr_from_image(img, reader_obj):
+def _ocr_from_image(arr, reader_obj):
     """
-    Run easyocr on a PIL image and return token list (may be empty).
-
-    Converts image to array, performs OCR, and splits text into tokens.
+    Run easyocr on an image array and return token list (may be empty).
 
     Args:
-        img (PIL.Image): Image to perform OCR on.
+        arr (np.ndarray): Grayscale image to perform OCR on.
         reader_obj: EasyOCR reader object.
 
     Returns:
         list: List of text tokens from OCR.
     """
-    arr = np.array(img)
     if arr.size == 0:
         return []
-    texts = reader_obj.readtext(arr, detail=0)
+    # Cells are strided views of the page, EasyOCR expects a contiguous image
+    texts = reader_obj.readtext(np.ascontiguousarray(arr), detail=0)
     return " ".join(texts).strip().split()
 
 
+def _grid_cells(image, rows, cols, overlap_px, scale=1):
+    """
+    Return the cells of the grid in extraction order (column by column, top to bottom).
+
+    The cells are views into `image`, nothing is copied. The grid is computed
+    on the original size, `scale` maps it onto an image upscaled by that factor.
+
+    Args:
+        image (np.ndarray): Preprocessed (and possibly upscaled) image to split.
+        rows (int): Number of rows in the grid.
+        cols (int): Number of columns in the grid.
+        overlap_px (int): Overlap in pixels between cells (original size).
+        scale (int): Factor `image` was upscaled by (default 1).
+
+    Returns:
+        list: (col, row, np.ndarray) for every cell with a valid crop.
+    """
+    height, width = image.shape[0] // scale, image.shape[1] // scale
+
+    col_bounds = _compute_bounds(width, cols)
+    row_bounds = _compute_bounds(height, rows)
+
+    cells = []
+    for col in range(cols):
+        for row in range(rows):
+            coords = _cell_coords(
+                col, row, col_bounds, row_bounds, overlap_px, width, height
+            )
+            if coords is None:
+                continue
+            left, top, right, bottom = (c * scale for c in coords)
+            cells.append((col, row, image[top:bottom, left:right]))
+    return cells
+
+
+# EasyOCR reader of a pool worker process, built once by _init_ocr_worker
+_worker_reader = None
+
+
+def _init_ocr_worker(lang, threads):
+    """
+    Initializer of the OCR pool workers: build the EasyOCR reader once per process.
+
+    Args:
+        lang (list): Languages for OCR.
+        threads (int): Torch threads per worker, so the workers don't oversubscribe the CPU.
+    """
+    global _worker_reader
+    import torch
+
+    torch.set_num_threads(threads)
+    _worker_reader = easyocr.Reader(lang, gpu=False)
+
+
+def _ocr_cell_buffer(cell):
+    """
+    OCR one cell in a pool worker.
+
+    The cell arrives as the raw bytes of its upscaled grayscale (uint8) crop
+    plus its shape, which pickles much smaller than an image object.
+
+    Args:
+        cell (tuple): (buffer, shape) of the cropped cell.
+
+    Returns:
+        list: List of text tokens from OCR.
+    """
+    buffer, shape = cell
+    arr = np.frombuffer(buffer, dtype=np.uint8).reshape(shape)
+    return _ocr_from_image(arr, _worker_reader)
+
+
+def _ocr_cells_parallel(cell_arrays, lang, workers):
+    """
+    OCR the cells in a process pool, one EasyOCR reader per worker process.
+
+    Args:
+        cell_arrays (list): Upscaled cells (grayscale uint8 arrays).
+        lang (list): Languages for OCR.
+        workers (int): Number of worker processes.
+
+    Returns:
+        list: Token lists in the order of `cell_arrays`.
+    """
+    buffers = [(arr.tobytes(), arr.shape) for arr in cell_arrays]
+
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_ocr_worker,
+        initargs=(lang, threads),
+    ) as executor:
+        # map() returns the results in submission order, so the output matches the serial run
+        results = executor.map(_ocr_cell_buffer, buffers)
+        return list(
+            tqdm(results, total=len(buffers), desc="Calender cells", unit="cell")
+        )
+
+
 # Extract the columns/rows and run OCR on those cells
-def extract_cells(image, months, rows=31, cols=6, lang=["de", "en"], overlap_px=4):
+def extract_cells(
+    image,
+    months,
+    rows=31,
+    cols=6,
+    lang=["de", "en"],
+    overlap_px=4,
+    workers=1,
+    cache=None,
+):
     """
     Extract text from grid-like image reliably.
 
@@ -167,59 +345,375 @@ def extract_cells(image, months, rows=31, cols=6, lang=["de", "en"], overlap_px=
     - Add a small overlap (in pixels) between adjacent cells so thin lines or imperfect cropping are still captured.
     - Clamp crop coordinates to image bounds to avoid empty crops at edges.
     - Skip empty crops.
+    - Upscale the whole image once (2x, bicubic) and OCR zero-copy views of it as cells.
+    - With `workers` > 1 the cells are OCR'd in parallel worker processes, the entries are the same and in the same order.
+    - With a `cache` only cells whose pixels aren't in it yet are OCR'd.
 
     Args:
-        image (PIL.Image): Preprocessed image to extract from.
+        image (np.ndarray): Preprocessed grayscale image to extract from.
         months (list): List of month names for columns.
         rows (int): Number of rows in the grid (default 31 for days).
         cols (int): Number of columns (default 6 for months).
         lang (list): Languages for OCR (default ['de', 'en']).
         overlap_px (int): Overlap in pixels between cells (default 4).
+        workers (int): Number of OCR worker processes (default 1, no pool).
+        cache (OcrCache, optional): Cache of the tokens per cell pixels.
 
     Returns:
         list: List of dictionaries with 'Month', 'Day', 'Text' for each cell.
     """
-    width, height = image.size
+    # One resize for all cells instead of a crop + resize per cell
+    upscaled = _upscale_image(image, scale=2)
+    cells = _grid_cells(upscaled, rows, cols, overlap_px, scale=2)
+
+    token_lists = [None] * len(cells)
+    if cache is not None:
+        params = {
+            "engine": "cells",
+            "lang": lang,
+            "upscale": "cv2_cubic_2x",
+            "easyocr": easyocr.__version__,
+        }
+        keys = [cache.key(arr, params) for _, _, arr in cells]
+        cached = cache.get_many(keys)
+        token_lists = [cached.get(key) for key in keys]
+        print(f"🗄️ {len(cached)} cell(s) from the OCR cache")
+
+    # Only OCR the cells that weren't cached
+    missing = [i for i, tokens in enumerate(token_lists) if tokens is None]
+    if missing and workers > 1:
+        results = _ocr_cells_parallel([cells[i][2] for i in missing], lang, workers)
+    elif missing:
+        reader = easyocr.Reader(lang, gpu=False)
+        results = []
+
+        # Show progress bar in console on OCR extraction
+        for i in tqdm(missing, desc="Calender cells", unit="cell"):
+            results.append(_ocr_from_image(cells[i][2], reader))
+    else:
+        results = []
+
+    for i, tokens in zip(missing, results):
+        token_lists[i] = tokens
+    if cache is not None and missing:
+        cache.put_many({keys[i]: token_lists[i] for i in missing})
+
+    entries = []
+    for (col, row, _), tokens in zip(cells, token_lists):
+        entries.append(
+            {
+                "Month": months[col] if col < len(months) else None,
+                "Day": row + 1,
+                "Text": tokens,
+            }
+        )
+
+    return entries
+
+
+def _detect_column(reader, arr, col, col_bounds, row_bounds, overlap_px, mag_ratio):
+    """
+    Run the text detection on one month column of the table.
+
+    A column strip magnified by `mag_ratio` is capped to EasyOCR's default
+    canvas (DETECTION_CANVAS_SIZE), which keeps the CRAFT feature maps small.
+    The whole table at 2x (~6600x3900 px) needs a single 6.6 GB allocation.
+    Boxes are returned in table coordinates, and only those centered in this
+    column are kept (the overlap is seen by both neighbouring strips).
+
+    Args:
+        reader: EasyOCR reader object.
+        arr (np.ndarray): Preprocessed grayscale table.
+        col (int): Column index.
+        col_bounds (list): List of column boundaries.
+        row_bounds (list): List of row boundaries.
+        overlap_px (int): Pixels the strip extends into the neighbouring columns.
+        mag_ratio (float): Requested magnification.
+
+    Returns:
+        tuple: (horizontal boxes [x_min, x_max, y_min, y_max], free boxes [[x, y] * 4]).
+    """
+    width = arr.shape[1]
+    left = max(0, col_bounds[col] - overlap_px)
+    right = min(width, col_bounds[col + 1] + overlap_px)
+    strip = np.ascontiguousarray(arr[:, left:right])
+
+    horizontal_list, free_list = reader.detect(
+        strip,
+        mag_ratio=min(mag_ratio, DETECTION_CANVAS_SIZE / max(strip.shape)),
+        canvas_size=DETECTION_CANVAS_SIZE,
+    )
+
+    horizontal = []
+    for x_min, x_max, y_min, y_max in horizontal_list[0]:
+        center_x = left + (x_min + x_max) / 2
+        if _cell_index(center_x, 0, col_bounds, row_bounds)[0] == col:
+            horizontal.append([x_min + left, x_max + left, y_min, y_max])
+    free = []
+    for box in free_list[0]:
+        xs = [x for x, _ in box]
+        center_x = left + (min(xs) + max(xs)) / 2
+        if _cell_index(center_x, 0, col_bounds, row_bounds)[0] == col:
+            free.append([[x + left, y] for x, y in box])
+    return horizontal, free
+
+
+def _recognize_batched(reader, arr, horizontal_list, free_list, batch_size):
+    """
+    Recognize the text of all boxes, up to `batch_size` crops per forward pass.
+
+    On the CPU `Reader.recognize` ignores its batch size and runs the
+    recognizer once per box. The crops are prepared like `recognize` does for
+    a single box and grouped by the width a single box is padded to, so every
+    crop gets the same input tensor as on its own, only batched with others.
+
+    Args:
+        reader: EasyOCR reader object.
+        arr (np.ndarray): Preprocessed grayscale table.
+        horizontal_list (list): Boxes [x_min, x_max, y_min, y_max].
+        free_list (list): Boxes [[x, y] * 4].
+        batch_size (int): Maximum number of crops per forward pass.
+
+    Returns:
+        list: (box, text, confidence) per recognized box.
+    """
+    # Padded width -> crops, like `get_image_list` computes it for a single box
+    groups = {}
+    for h_list, f_list in [([box], []) for box in horizontal_list] + [
+        ([], [box]) for box in free_list
+    ]:
+        image_list, max_width = get_image_list(
+            h_list, f_list, arr, model_height=RECOGNITION_HEIGHT
+        )
+        groups.setdefault(int(max_width), []).extend(image_list)
+
+    # The same characters as `recognize` ignores by default
+    ignore_char = "".join(set(reader.character) - set(reader.lang_char))
+    results = []
+    for max_width, image_list in groups.items():
+        results += get_text(
+            reader.character,
+            RECOGNITION_HEIGHT,
+            max_width,
+            reader.recognizer,
+            reader.converter,
+            image_list,
+            ignore_char,
+            batch_size=batch_size,
+            # In-process like `recognize`, get_text defaults to a DataLoader worker process
+            workers=0,
+            device=reader.device,
+        )
+    return results
+
+
+def _cell_index(x, y, col_bounds, row_bounds):
+    """
+    Return the (col, row) grid cell containing the point, clamped to the grid.
+
+    Args:
+        x (float): X coordinate.
+        y (float): Y coordinate.
+        col_bounds (list): List of column boundaries.
+        row_bounds (list): List of row boundaries.
+
+    Returns:
+        tuple: (col, row) indices.
+    """
+    col = min(max(bisect_right(col_bounds, x) - 1, 0), len(col_bounds) - 2)
+    row = min(max(bisect_right(row_bounds, y) - 1, 0), len(row_bounds) - 2)
+    return col, row
+
+
+# Detect once per month column, then recognize all boxes in batches
+def extract_cells_batched(
+    image,
+    months,
+    rows=31,
+    cols=6,
+    lang=["de", "en"],
+    overlap_px=4,
+    mag_ratio=2.0,
+    batch_size=32,
+    cache=None,
+):
+    """
+    Extract text from the grid image with one text detection pass per column.
+
+    Running `readtext` per cell repeats the CRAFT text detection on every tiny
+    crop. Here the detection runs once per month column (see _detect_column),
+    each detected box is assigned to the grid cell containing its center (same
+    `_compute_bounds` grid as `extract_cells`) and all boxes are recognized in
+    batches. The tokens of a cell are ordered top to bottom, left to right.
+
+    Args:
+        image (np.ndarray): Preprocessed grayscale image to extract from.
+        months (list): List of month names for columns.
+        rows (int): Number of rows in the grid (default 31 for days).
+        cols (int): Number of columns (default 6 for months).
+        lang (list): Languages for OCR (default ['de', 'en']).
+        overlap_px (int): Overlap of the column strips, also skips the same invalid cells
+            as `extract_cells` (default 4).
+        mag_ratio (float): Magnification for the detection, like the 2x upscale of the cells,
+            capped so a column fits EasyOCR's default canvas (default 2.0).
+        batch_size (int): Number of boxes recognized per batch (default 32).
+        cache (OcrCache, optional): Cache of the tokens of all cells per table pixels.
+
+    Returns:
+        list: List of dictionaries with 'Month', 'Day', 'Text' for each cell,
+        in the same order as `extract_cells`.
+    """
+    height, width = image.shape[:2]
 
     col_bounds = _compute_bounds(width, cols)
     row_bounds = _compute_bounds(height, rows)
 
+    arr = np.ascontiguousarray(image)
+
+    if cache is not None:
+        params = {
+            "engine": "batched",
+            "lang": lang,
+            "rows": rows,
+            "cols": cols,
+            "mag_ratio": mag_ratio,
+            "detection": "columns",
+            "easyocr": easyocr.__version__,
+        }
+        key = cache.key(arr, params)
+        cached = cache.get_many([key])
+        if key in cached:
+            print("🗄️ Table from the OCR cache")
+            cell_tokens = {(col, row): tokens for col, row, tokens in cached[key]}
+            return _grid_entries(
+                cell_tokens,
+                months,
+                rows,
+                cols,
+                col_bounds,
+                row_bounds,
+                overlap_px,
+                width,
+                height,
+            )
+
     reader = easyocr.Reader(lang, gpu=False)
-    entries = []
 
-    # Show progress bar in console on OCR extraction
-    total = rows * cols
-    with tqdm(total=total, desc="Calender cells", unit="cell") as pbar:
-        for col in range(cols):
-            for row in range(rows):
-                coords = _cell_coords(
-                    col, row, col_bounds, row_bounds, overlap_px, width, height
-                )
+    horizontal_list = []
+    free_list = []
+    for col in range(cols):
+        strip_h, strip_f = _detect_column(
+            reader, arr, col, col_bounds, row_bounds, overlap_px, mag_ratio
+        )
+        horizontal_list.extend(strip_h)
+        free_list.extend(strip_f)
+    print(f"🔎 Detected {len(horizontal_list) + len(free_list)} text boxes")
+
+    results = _recognize_batched(reader, arr, horizontal_list, free_list, batch_size)
+
+    # (col, row) -> [(top, left, text), ...]
+    cell_texts = {}
+    for box, text, _confidence in results:
+        xs = [point[0] for point in box]
+        ys = [point[1] for point in box]
+        center_x = (min(xs) + max(xs)) / 2
+        center_y = (min(ys) + max(ys)) / 2
+        cell = _cell_index(center_x, center_y, col_bounds, row_bounds)
+        cell_texts.setdefault(cell, []).append((min(ys), min(xs), text))
+
+    cell_tokens = {
+        cell: " ".join(text for _, _, text in sorted(texts)).strip().split()
+        for cell, texts in cell_texts.items()
+    }
+    if cache is not None:
+        cache.put_many(
+            {key: [[col, row, tokens] for (col, row), tokens in cell_tokens.items()]}
+        )
 
-                if coords is None:
-                    pbar.update(1)
-                    continue
+    return _grid_entries(
+        cell_tokens,
+        months,
+        rows,
+        cols,
+        col_bounds,
+        row_bounds,
+        overlap_px,
+        width,
+        height,
+    )
+
+
+def _grid_entries(
+    cell_tokens, months, rows, cols, col_bounds, row_bounds, overlap_px, width, height
+):
+    """
+    Build the entries of all valid grid cells in extraction order.
 
-                cell_img = image.crop(coords)
-                cell_upscaled = _upscale_image(cell_img, scale=2)
+    Args:
+        cell_tokens (dict): (col, row) -> token list, missing cells get no tokens.
+        months (list): List of month names for columns.
+        rows (int): Number of rows in the grid.
+        cols (int): Number of columns in the grid.
+        col_bounds (list): List of column boundaries.
+        row_bounds (list): List of row boundaries.
+        overlap_px (int): Overlap in pixels between cells.
+        width (int): Image width.
+        height (int): Image height.
 
-                tokens = _ocr_from_image(cell_upscaled, reader)
+    Returns:
+        list: List of dictionaries with 'Month', 'Day', 'Text' for each cell.
+    """
+    entries = []
+    for col in range(cols):
+        for row in range(rows):
+            coords = _cell_coords(
+                col, row, col_bounds, row_bounds, overlap_px, width, height
+            )
+            if coords is None:
+                continue
+
+            entries.append(
+                {
+                    "Month": months[col] if col < len(months) else None,
+                    "Day": row + 1,
+                    "Text": cell_tokens.get((col, row), []),
+                }
+            )
 
-                entries.append(
-                    {
-                        "Month": months[col] if col < len(months) else None,
-                        "Day": row + 1,
-                        "Text": tokens,
-                    }
-                )
+    return entries
 
-                pbar.update(1)
 
-    return entries
+def _peak_memory():
+    """
+    Return the peak resident memory of this process and of its largest child process.
+
+    Covers everything the OS accounts for (numpy/OpenCV buffers, torch, the
+    OCR pool workers once they exited), at no cost during the run.
+
+    Returns:
+        str: Description of the peak memory, or "unknown" without the resource module.
+    """
+    if resource is None:
+        return "unknown"
+    # ru_maxrss is in KiB on Linux, in bytes on macOS
+    unit = 1 if sys.platform == "darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit / 2**20
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit / 2**20
+    if children:
+        return f"{own:.0f} MiB (largest worker/subprocess {children:.0f} MiB)"
+    return f"{own:.0f} MiB"
 
 
 # Run full extraction process
-def run_collection_extraction(pdf_name, box_coords, csv_name, months=None):
+def run_collection_extraction(
+    pdf_name,
+    box_coords,
+    csv_name,
+    months=None,
+    workers=None,
+    engine=None,
+    use_cache=None,
+):
     """
     Run the full extraction process: load PDF, preprocess, extract cells, and save to CSV.
 
@@ -228,21 +722,50 @@ def run_collection_extraction(pdf_name, box_coords, csv_name, months=None):
         box_coords (tuple): Cropping coordinates for the PDF.
         csv_name (str): Name for the output CSV file.
         months (list, optional): List of month names (default Jan-Jun).
+        workers (int, optional): Number of OCR worker processes (default OCR_WORKERS).
+        engine (str, optional): "cells" or "batched" (default OCR_ENGINE).
+        use_cache (bool, optional): Reuse the rendered page and the OCR results of identical cells (default OCR_CACHE).
 
     Returns:
         pd.DataFrame: DataFrame of extracted entries.
     """
     if months is None:
         months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun"]
+    if workers is None:
+        workers = OCR_WORKERS
+    if engine is None:
+        engine = OCR_ENGINE
+    if use_cache is None:
+        use_cache = OCR_CACHE
+    if engine not in OCR_ENGINES:
+        raise ValueError(
+            f"Unknown OCR engine '{engine}', expected one of: {', '.join(OCR_ENGINES)}"
+        )
 
     print(f"📄 Loading PDF: {pdf_name}")
-    img = _load_pdf_image(pdf_name, box_coords)
+    img = _load_pdf_image(pdf_name, box_coords, use_cache=use_cache)
 
     print("🧪 Preprocessing...")
     processed = _preprocess_image(img)
 
-    print("🔍 OCR per Cell...")
-    entries = extract_cells(processed, months)
+    cache = OcrCache(OCR_CACHE_PATH) if use_cache else None
+    start = time.perf_counter()
+    try:
+        if engine == "batched":
+            print("🔍 OCR of the whole table (batched)...")
+            entries = extract_cells_batched(processed, months, cache=cache)
+        else:
+            print(f"🔍 OCR per Cell ({workers} worker(s))...")
+            entries = extract_cells(processed, months, workers=workers, cache=cache)
+    finally:
+        if cache is not None:
+            cache.close()
+    elapsed = time.perf_counter() - start
+    print(
+        f"⏱️ {elapsed:.1f} s for {len(entries)} cells "
+        f"({elapsed / max(1, len(entries)) * 1000:.0f} ms/cell), "
+        f"peak memory {_peak_memory()}"
+    )
 
     print(f"💾 Saved as: {csv_name}")
     df = pd.DataFrame(entries)
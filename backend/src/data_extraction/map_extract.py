@@ -7,73 +7,41 @@ from typing import Any, Dict, List, Optional
 import osmnx as ox
 from shapely.geometry import LineString, MultiLineString
 
-# rapidfuzz for fuzzy matching
-from rapidfuzz import fuzz, process
-
 # Add the parent directory to sys.path to import project config
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from config import STREET_ZONES_DIR
+from street_geometry_format import write_street_geometries
+from street_matcher import StreetMatcher
 
 
 STREET_ZONES_FILE = Path(STREET_ZONES_DIR) / "street-zones-mapping.json"
 OUTPUT_JSON_FILE = Path(STREET_ZONES_DIR) / "street-coords-mapping.json"
+OUTPUT_BINARY_FILE = Path(STREET_ZONES_DIR) / "street-coords-mapping.bin"
 AMBERG = "Amberg, Germany"
 
 
-def load_street_zones(path: Path) -> Dict[str, str]:
-    """Load and normalize the street-zone mapping from a JSON file.
+def load_street_zones(path: Path) -> StreetMatcher:
+    """Load the street-zone mapping from a JSON file into a fuzzy matcher.
 
     Args:
         path: Path to the JSON file containing a mapping of street name -> zone.
 
     Returns:
-        A dictionary mapping normalized street name to zone code.
+        A StreetMatcher over the normalized street names (see normalize_mapping).
     """
     with open(path, encoding="utf-8") as fh:
         raw = json.load(fh)
-    return normalize_mapping(raw)
-
-
-def normalize_mapping(raw: Dict[str, str]) -> Dict[str, str]:
-    """Normalize raw mapping keys to a consistent form.
-
-    Performs lightweight normalization such as expanding common abbreviations
-    and trimming parts after house number separators (e.g. 'Nr.').
-    Creates multiple normalized versions for fuzzy matching flexibility.
-
-    Args:
-        raw: Raw mapping from file.
-
-    Returns:
-        Normalized mapping with multiple key variants per street.
-    """
-    mapping: Dict[str, str] = {}
-    for k, v in raw.items():
-        # Strip house number part (after "Nr.") and lowercase
-        key_base = k.split("Nr.")[0].strip().lower()
-
-        # Add the original lowercase version
-        mapping[key_base] = v
-
-        # Add Straße version and str version (if str. is present after lowercasing)
-        if "str." in key_base:
-            key_street = key_base.replace("str.", "straße")
-            mapping[key_street] = v
-
-            key_str = key_base.replace("str.", "str")
-            mapping[key_str] = v
-
-    return mapping
+    return StreetMatcher.from_raw(raw)
 
 
 def get_zone_fuzzy(
-    name: str, mapping: Dict[str, str], threshold: int = 75
+    name: str, matcher: StreetMatcher, threshold: int = 75
 ) -> Optional[str]:
     """Return the best-matching zone for a street name using fuzzy matching.
 
     Args:
         name: Street name to match.
-        mapping: Dictionary of normalized street names to zones.
+        matcher: Matcher over the normalized street names.
         threshold: Minimum fuzzy match score (0-100) to accept a match.
 
     Returns:
@@ -82,10 +50,8 @@ def get_zone_fuzzy(
     if not name or name == "unknown":
         return None
 
-    best = process.extractOne(name, mapping.keys(), scorer=fuzz.ratio)
-    if best and best[1] >= threshold:
-        return mapping[best[0]]
-    return None
+    best = matcher.match(name, threshold)
+    return best[2] if best else None
 
 
 def fetch_edges_for_city(city: str = AMBERG) -> Any:
@@ -136,25 +102,29 @@ def extract_segments_from_geometry(geom: Any) -> List[LineString]:
 
 
 def extract_streets_data(
-    gdf_edges: Any, mapping: Dict[str, str]
+    gdf_edges: Any, matcher: StreetMatcher
 ) -> List[Dict[str, Any]]:
     """Extract street segments with their inferred zones from edges GeoDataFrame.
 
     Args:
         gdf_edges: GeoDataFrame of edges from OSMnx.
-        mapping: Normalized street name -> zone mapping.
+        matcher: Fuzzy matcher over the normalized street names.
 
     Returns:
         A list of street segment dicts: {"name", "coords", "zone"}.
     """
     streets_data: List[Dict[str, Any]] = []
 
-    for _, row in gdf_edges.iterrows():
-        geom = row.get("geometry")
-        name = normalize_street_name(row.get("name"))
-        zone = get_zone_fuzzy(name, mapping, threshold=85) or (
-            "unknown" if name == "unknown" else None
-        )
+    names = [normalize_street_name(name) for name in gdf_edges["name"]]
+
+    # Match every distinct name once in a single batch (edges repeat street names a lot)
+    matches = matcher.match_many(
+        (name for name in names if name != "unknown"), threshold=85
+    )
+
+    for name, geom in zip(names, gdf_edges["geometry"]):
+        match = matches.get(name)
+        zone = match[2] if match else ("unknown" if name == "unknown" else None)
 
         segments = extract_segments_from_geometry(geom)
         for seg in segments:
@@ -192,25 +162,29 @@ def write_json(path: Path, data: List[Dict[str, Any]]) -> None:
 
 
 def run_streets_coordinates(city: str = AMBERG) -> None:
-    """Main entry point: build street segments with zones and write JSON.
+    """Main entry point: build street segments with zones and write JSON + binary.
 
     Args:
         city: City/place string for OSMnx to download the graph for.
     """
     print(f"Loading street-zone mapping from {STREET_ZONES_FILE}")
-    mapping = load_street_zones(STREET_ZONES_FILE)
+    matcher = load_street_zones(STREET_ZONES_FILE)
 
     print(f"Fetching street graph for '{city}'")
     gdf_edges = fetch_edges_for_city(city)
 
     print("Extracting street segments and matching zones...")
-    streets = extract_streets_data(gdf_edges, mapping)
+    streets = extract_streets_data(gdf_edges, matcher)
 
     filtered = filter_streets_data(streets)
 
     write_json(OUTPUT_JSON_FILE, filtered)
     print(f"Exported {len(filtered)} streets with zones to {OUTPUT_JSON_FILE}")
 
+    # Same segments as flat typed arrays, the API memory-maps them without parsing
+    write_street_geometries(OUTPUT_BINARY_FILE, filtered)
+    print(f"Exported binary street geometries to {OUTPUT_BINARY_FILE}")
+
 
 if __name__ == "__main__":
     run_streets_coordinates()
@@ -0,0 +1,83 @@
+import hashlib
+import json
+import sqlite3
+
+
+class OcrCache:
+    """
+    On-disk cache of OCR results, keyed by the content of the OCR'd pixels.
+
+    A key is the SHA-256 of the image buffer (shape and bytes) plus the OCR
+    parameters (engine, languages, EasyOCR version, ...), so re-runs on
+    identical input are served from the cache. Any change to the pixels or the
+    parameters simply misses, including a changed crop box: it changes the
+    size of the cells and the contrast enhancement of the whole table, so
+    every cell's pixels differ. Values are JSON (token lists) in a SQLite file.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (Path): SQLite file of the cache, created if missing.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS ocr_results (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+
+    def key(self, arr, params):
+        """
+        Return the cache key of an image array (numpy).
+
+        Args:
+            arr (np.ndarray): Image pixels.
+            params (dict): OCR parameters that influence the result.
+
+        Returns:
+            str: Hex digest of the parameters, shape and pixel bytes.
+        """
+        digest = hashlib.sha256(json.dumps(params, sort_keys=True).encode("utf-8"))
+        digest.update(repr((arr.shape, arr.dtype.str)).encode("ascii"))
+        digest.update(arr.tobytes())
+        return digest.hexdigest()
+
+    def get_many(self, keys):
+        """
+        Look up several keys at once.
+
+        Args:
+            keys (list): Cache keys.
+
+        Returns:
+            dict: key -> cached value for the keys found.
+        """
+        found = {}
+        unique = list(dict.fromkeys(keys))
+        # Stay below SQLite's limit of bound parameters per statement
+        for start in range(0, len(unique), 500):
+            chunk = unique[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT key, value FROM ocr_results WHERE key IN ({placeholders})",
+                chunk,
+            )
+            for key, value in rows:
+                found[key] = json.loads(value)
+        return found
+
+    def put_many(self, items):
+        """
+        Store several results in one transaction.
+
+        Args:
+            items (dict): key -> JSON serializable value.
+        """
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO ocr_results (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in items.items()],
+            )
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,144 @@
+"""Binary columnar format for the street segment geometries.
+
+Shared by the extraction pipeline (writer) and the API (reader). The layout
+is a minimal GeoArrow-like set of flat, little-endian arrays that can be
+memory-mapped and handed to typed arrays (e.g. `Int32Array` in the browser)
+without any parsing:
+
+    header          32 bytes, see HEADER
+    coords          int32[point_count * 2]   lat, lon interleaved, fixed point (* COORD_SCALE)
+    offsets         uint32[segment_count + 1] index of each segment's first point
+    street_index    uint32[segment_count]    index into the dictionary per segment
+    dictionary      UTF-8 JSON array of [street name, zone code] pairs
+
+Segment i consists of the points offsets[i] .. offsets[i + 1] - 1.
+"""
+
+import json
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+MAGIC = b"AWCG"
+FORMAT_VERSION = 1
+# magic, version, reserved, segment_count, point_count, street_count, dictionary_size, padding
+HEADER = struct.Struct("<4sHHIIII8x")
+# 7 decimals, the precision OSM stores coordinates in, fits into int32 for lat/lon
+COORD_SCALE = 10_000_000
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def pack_street_geometries(streets: List[Dict[str, Any]]) -> bytes:
+    """Pack street segments ({"name", "coords": [[lat, lon], ...], "zone"}) into the binary format."""
+    dictionary: Dict[Tuple[str, str], int] = {}
+    coords = array("i")
+    offsets = array("I", [0])
+    street_index = array("I")
+
+    for street in streets:
+        key = (street["name"], street["zone"])
+        street_index.append(dictionary.setdefault(key, len(dictionary)))
+        for lat, lon in street["coords"]:
+            coords.append(round(lat * COORD_SCALE))
+            coords.append(round(lon * COORD_SCALE))
+        offsets.append(len(coords) // 2)
+
+    dictionary_bytes = json.dumps(
+        [list(key) for key in dictionary], ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+    header = HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        0,
+        len(street_index),
+        len(coords) // 2,
+        len(dictionary),
+        len(dictionary_bytes),
+    )
+    return b"".join(
+        (
+            header,
+            _little_endian(coords),
+            _little_endian(offsets),
+            _little_endian(street_index),
+            dictionary_bytes,
+        )
+    )
+
+
+def write_street_geometries(path: Path, streets: List[Dict[str, Any]]) -> None:
+    """Write the binary format to path.
+
+    The file is written next to the target and renamed over it, so readers
+    that memory-mapped the previous version keep a valid mapping.
+    """
+    tmp_path = Path(path).with_suffix(".tmp")
+    with open(tmp_path, "wb") as fh:
+        fh.write(pack_street_geometries(streets))
+    os.replace(tmp_path, path)
+
+
+class StreetGeometryBuffers:
+    """Zero-copy view of a binary street geometry buffer (bytes or mmap).
+
+    Raises:
+        ValueError: If the buffer is not a valid street geometry file.
+    """
+
+    def __init__(self, buffer):
+        if len(buffer) < HEADER.size:
+            raise ValueError("Buffer too small for a street geometry header")
+        (
+            magic,
+            version,
+            _,
+            self.segment_count,
+            self.point_count,
+            self.street_count,
+            dictionary_size,
+        ) = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Unsupported street geometry format")
+
+        coords_end = HEADER.size + self.point_count * 2 * 4
+        offsets_end = coords_end + (self.segment_count + 1) * 4
+        index_end = offsets_end + self.segment_count * 4
+        if len(buffer) != index_end + dictionary_size:
+            raise ValueError("Street geometry buffer size doesn't match its header")
+
+        self.buffer = buffer
+        view = memoryview(buffer)
+        self.coords = self._cast(view[HEADER.size:coords_end], "i")
+        self.offsets = self._cast(view[coords_end:offsets_end], "I")
+        self.street_index = self._cast(view[offsets_end:index_end], "I")
+        self.streets: List[Tuple[str, str]] = [
+            tuple(entry) for entry in json.loads(bytes(view[index_end:]).decode("utf-8"))
+        ]
+
+    @staticmethod
+    def _cast(view: memoryview, typecode: str):
+        if sys.byteorder == "little":
+            return view.cast(typecode)
+        values = array(typecode, view.tobytes())
+        values.byteswap()
+        return values
+
+    def segment_street(self, i: int) -> Tuple[str, str]:
+        """Return (street name, zone code) of segment i."""
+        return self.streets[self.street_index[i]]
+
+    def segment_coords(self, i: int) -> Iterator[Tuple[float, float]]:
+        """Yield the (lat, lon) points of segment i."""
+        coords = self.coords
+        for p in range(self.offsets[i], self.offsets[i + 1]):
+            yield coords[2 * p] / COORD_SCALE, coords[2 * p + 1] / COORD_SCALE
@@ -0,0 +1,147 @@
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from rapidfuzz import fuzz, process
+
+
+def normalize_mapping(raw: Dict[str, str]) -> Dict[str, str]:
+    """Normalize raw mapping keys to a consistent form.
+
+    Performs lightweight normalization such as expanding common abbreviations
+    and trimming parts after house number separators (e.g. 'Nr.').
+    Creates multiple normalized versions for fuzzy matching flexibility.
+
+    Args:
+        raw: Raw mapping from file.
+
+    Returns:
+        Normalized mapping with multiple key variants per street.
+    """
+    mapping: Dict[str, str] = {}
+    for k, v in raw.items():
+        # Strip house number part (after "Nr.") and lowercase
+        key_base = k.split("Nr.")[0].strip().lower()
+
+        # Add the original lowercase version
+        mapping[key_base] = v
+
+        # Add Straße version and str version (if str. is present after lowercasing)
+        if "str." in key_base:
+            key_street = key_base.replace("str.", "straße")
+            mapping[key_street] = v
+
+            key_str = key_base.replace("str.", "str")
+            mapping[key_str] = v
+
+    return mapping
+
+
+class StreetMatcher:
+    """Fuzzy matcher of street names against the street → zone mapping.
+
+    Shared by the extraction pipeline (matching OSM names) and the API (typo
+    tolerant lookup). The normalized choices are built once, single lookups
+    are cached and batches are scored in one `process.cdist` call across all
+    CPU cores.
+
+    Names are compared lowercased and stripped (like the normalized keys),
+    scored with `fuzz.ratio`.
+    """
+
+    def __init__(self, mapping: Dict[str, str], originals: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            mapping: Normalized street name -> zone mapping (see normalize_mapping).
+            originals: Optional normalized street name -> original street name.
+        """
+        self.mapping = mapping
+        self.choices: List[str] = list(mapping.keys())
+        self.originals = originals or {}
+        # Per instance cache, repeated names (e.g. many OSM edges of one street) are scored once
+        self.match = lru_cache(maxsize=4096)(self._match)
+
+    @classmethod
+    def from_raw(cls, raw: Dict[str, str]) -> "StreetMatcher":
+        """Build a matcher from the raw street-zones-mapping.json content."""
+        originals: Dict[str, str] = {}
+        for street in raw:
+            for key in normalize_mapping({street: ""}):
+                originals[key] = street
+        return cls(normalize_mapping(raw), originals)
+
+    @staticmethod
+    def _prepare(name: str) -> str:
+        return name.strip().lower()
+
+    def _match(self, name: str, threshold: int = 75) -> Optional[Tuple[str, float, str]]:
+        """Return (matched normalized name, score, zone) of the best match, or None below threshold."""
+        if not name:
+            return None
+        best = process.extractOne(
+            self._prepare(name),
+            self.choices,
+            scorer=fuzz.ratio,
+            processor=None,
+            score_cutoff=threshold,
+        )
+        if best is None:
+            return None
+        choice, score, _ = best
+        return choice, score, self.mapping[choice]
+
+    def match_many(
+        self, names: Iterable[str], threshold: int = 75
+    ) -> Dict[str, Optional[Tuple[str, float, str]]]:
+        """Match many names at once, returns {name: (matched name, score, zone) or None}."""
+        unique = list(dict.fromkeys(name for name in names if name))
+        if not unique or not self.choices:
+            return {name: None for name in unique}
+
+        scores = process.cdist(
+            [self._prepare(name) for name in unique],
+            self.choices,
+            scorer=fuzz.ratio,
+            processor=None,
+            score_cutoff=threshold,
+            workers=-1,
+        )
+        # argmax returns the first best choice, the same tie-break as extractOne
+        best_indices = scores.argmax(axis=1)
+
+        results = {}
+        for row, name in enumerate(unique):
+            i = int(best_indices[row])
+            score = float(scores[row, i])
+            if score >= threshold:
+                choice = self.choices[i]
+                results[name] = (choice, score, self.mapping[choice])
+            else:
+                results[name] = None
+        return results
+
+    def lookup(self, name: str, limit: int = 5, threshold: int = 60) -> List[Dict]:
+        """Return up to `limit` candidate streets for a possibly misspelled name, best first.
+
+        Key variants of the same street are collapsed into one result.
+        """
+        candidates = process.extract(
+            self._prepare(name),
+            self.choices,
+            scorer=fuzz.ratio,
+            processor=None,
+            score_cutoff=threshold,
+            limit=limit * 3,  # Room for variants of the same street
+        )
+        results = []
+        seen = set()
+        for choice, score, _ in candidates:
+            street = self.originals.get(choice, choice)
+            if street in seen:
+                continue
+            seen.add(street)
+            results.append(
+                {"street": street, "zone": self.mapping[choice], "score": round(score, 1)}
+            )
+            if len(results) == limit:
+                break
+        return results
@@ -0,0 +1,139 @@
+import asyncio
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from src.app import logic
+from src.app.cache import DailyResponseCache
+from src.app.schedule_index import ZoneSchedule
+
+DAY = date(2026, 3, 2)
+NEXT_DAY = date(2026, 3, 3)
+
+
+def test_hit_and_miss():
+    cache = DailyResponseCache("test")
+
+    async def run():
+        assert await cache.get("A1", DAY, "v1") is None
+        await cache.set("A1", DAY, "v1", {"zone": "A1"})
+        return await cache.get("A1", DAY, "v1"), await cache.get("A2", DAY, "v1")
+
+    assert asyncio.run(run()) == ({"zone": "A1"}, None)
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 2
+
+
+def test_day_rollover_drops_everything():
+    cache = DailyResponseCache("test")
+
+    async def run():
+        await cache.set("A1", DAY, "v1", {"zone": "A1"})
+        await cache.set("A2", DAY, "v1", {"zone": "A2"})
+        return await cache.get("A1", NEXT_DAY, "v1")
+
+    assert asyncio.run(run()) is None
+    # The other entry of the previous day is gone as well, not only the one asked for
+    assert cache.info()["entries"] == 0
+
+
+def test_version_change_drops_everything():
+    cache = DailyResponseCache("test")
+
+    async def run():
+        await cache.set("A1", DAY, "v1", {"zone": "A1", "old": True})
+        await cache.set("A2", DAY, "v1", {"zone": "A2", "old": True})
+        after_reload = await cache.get("A1", DAY, "v2")
+        await cache.set("A1", DAY, "v2", {"zone": "A1"})
+        return after_reload, await cache.get("A1", DAY, "v2")
+
+    assert asyncio.run(run()) == (None, {"zone": "A1"})
+    assert cache.info()["entries"] == 1
+
+
+def test_max_entries_evicts_least_recently_used():
+    cache = DailyResponseCache("test", max_entries=2)
+
+    async def run():
+        await cache.set("A1", DAY, "v1", 1)
+        await cache.set("A2", DAY, "v1", 2)
+        # Using A1 makes A2 the least recently used entry
+        await cache.get("A1", DAY, "v1")
+        await cache.set("A3", DAY, "v1", 3)
+        return [await cache.get(zone, DAY, "v1") for zone in ("A1", "A2", "A3")]
+
+    assert asyncio.run(run()) == [1, None, 3]
+    assert cache.info()["entries"] == 2
+
+
+def test_redis_entries_are_shared_and_expire_at_midnight():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    writer = DailyResponseCache("test")
+    reader = DailyResponseCache("test")
+    writer.attach_redis(client)
+    reader.attach_redis(fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+    # Has to be the real date, a key expiring at a past midnight is gone right away
+    today = date.today()
+
+    async def run():
+        await writer.set("A1", today, "v1", {"zone": "A1", "street": "Straße"})
+        keys = await client.keys("cache:test:*")
+        expire_at = await client.expiretime(keys[0])
+        return keys, expire_at, await reader.get("A1", today, "v1"), await reader.get("A1", today, "v2")
+
+    keys, expire_at, shared, other_version = asyncio.run(run())
+    assert keys == [f"cache:test:A1:{today.isoformat()}:v1"]
+    midnight = datetime.combine(today + timedelta(days=1), time.min)
+    assert expire_at == int(midnight.timestamp())
+    assert shared == {"zone": "A1", "street": "Straße"}
+    assert reader.stats["redis_hits"] == 1
+    # Entries of another dataset version aren't shared
+    assert other_version is None
+
+
+def test_redis_errors_are_counted():
+    class BrokenRedis:
+        async def get(self, key):
+            raise ConnectionError("Redis is down")
+
+        async def set(self, key, value, exat=None):
+            raise ConnectionError("Redis is down")
+
+    cache = DailyResponseCache("test")
+    cache.attach_redis(BrokenRedis())
+
+    async def run():
+        miss = await cache.get("A1", DAY, "v1")
+        await cache.set("A1", DAY, "v1", 1)
+        return miss, await cache.get("A1", DAY, "v1")
+
+    assert asyncio.run(run()) == (None, 1)
+    assert cache.stats["redis_errors"] == 2
+
+
+def test_next_pickups_roll_over_with_the_clock(monkeypatch):
+    class FakeDate(date):
+        current = DAY
+
+        @classmethod
+        def today(cls):
+            return cls.current
+
+    monkeypatch.setattr(logic, "date", FakeDate)
+    monkeypatch.setattr(logic, "next_pickups_cache", DailyResponseCache("test"))
+    schedule = ZoneSchedule({"2026-03-02": ["Restmüll"], "2026-03-09": ["Restmüll"]})
+
+    async def run():
+        first = await logic.get_next_pickups("A1", schedule, "v1")
+        FakeDate.current = NEXT_DAY
+        second = await logic.get_next_pickups("A1", schedule, "v1")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first["reference_date"] == "2026-03-02"
+    assert first["next_pickups"][0] == {"type": "Restmüll", "date": "2026-03-02"}
+    # A new day isn't answered from the previous day's entry
+    assert second["reference_date"] == "2026-03-03"
+    assert second["next_pickups"][0] == {"type": "Restmüll", "date": "2026-03-09"}
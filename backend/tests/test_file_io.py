@@ -0,0 +1,120 @@
+import asyncio
+import json
+import os
+
+import pytest
+from fastapi import HTTPException
+
+from src.app import file_io
+
+SCHEDULE = {
+    "A": {
+        "1": {"2026-01-05": ["Restmüll"], "2026-01-12": ["Biomüll"]},
+        "2": {"2026-01-06": ["Papiermüll"]},
+    }
+}
+
+
+@pytest.fixture
+def schedule_file(tmp_path, monkeypatch):
+    """A schedule file in its own data directory, with fresh dataset and reload state."""
+    monkeypatch.setattr(file_io, "WASTE_JSON_DIR", tmp_path)
+    # Only the schedules, the watcher would load the real mapping files otherwise
+    monkeypatch.setattr(
+        file_io, "DATASET_SOURCES", {"waste_schedule": file_io.DATASET_SOURCES["waste_schedule"]}
+    )
+    monkeypatch.setattr(file_io, "_datasets", {})
+    monkeypatch.setattr(file_io, "_source_signatures", {})
+    monkeypatch.setattr(
+        file_io,
+        "RELOAD_STATS",
+        {
+            name: {**stats, "version": 0, "reloads": 0, "failures": 0, "last_error": None}
+            for name, stats in file_io.RELOAD_STATS.items()
+            if name == "waste_schedule"
+        },
+    )
+    path = tmp_path / "waste-collection-2026.json"
+    write(path, json.dumps(SCHEDULE))
+    return path
+
+
+def write(path, text):
+    # Bump the mtime explicitly, two writes can fall into the same timestamp
+    mtime = path.stat().st_mtime + 10 if path.exists() else None
+    path.write_text(text, encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def test_changed_file_is_reloaded(schedule_file):
+    loaded = file_io.reload_dataset("waste_schedule")
+    store = file_io.get_waste_data_store()
+    assert loaded.version == 1
+    assert "waste_schedule" not in file_io.changed_datasets()
+
+    changed = json.loads(json.dumps(SCHEDULE))
+    changed["A"]["1"]["2026-01-19"] = ["Gelber Sack"]
+    write(schedule_file, json.dumps(changed))
+    assert "waste_schedule" in file_io.changed_datasets()
+
+    reloaded = file_io.reload_dataset("waste_schedule")
+    new_store = file_io.get_waste_data_store()
+    assert reloaded.version == 2
+    assert file_io.RELOAD_STATS["waste_schedule"]["version"] == 2
+    assert new_store is not store
+    assert new_store.version != store.version
+    # Only the changed zone gets a new content version
+    assert new_store.zone_versions["A1"] != store.zone_versions["A1"]
+    assert new_store.zone_versions["A2"] == store.zone_versions["A2"]
+    assert new_store.get_zone("A1").next_pickup("Gelber Sack", 0) == "2026-01-19"
+    assert "waste_schedule" not in file_io.changed_datasets()
+
+
+def test_corrupt_file_keeps_the_last_good_data(schedule_file):
+    file_io.reload_dataset("waste_schedule")
+    store = file_io.get_waste_data_store()
+
+    write(schedule_file, "{")
+    file_io.reload_datasets(["waste_schedule"])
+
+    assert file_io.get_waste_data_store() is store
+    stats = file_io.RELOAD_STATS["waste_schedule"]
+    assert stats["failures"] == 1
+    assert "corrupted" in stats["last_error"]
+    # A broken file is only retried once it changes again
+    assert "waste_schedule" not in file_io.changed_datasets()
+
+
+def test_failed_first_load_isnt_retried_per_request(schedule_file, monkeypatch):
+    write(schedule_file, "{")
+    calls = []
+    list_files, loader = file_io.DATASET_SOURCES["waste_schedule"]
+
+    def counting_loader():
+        calls.append(1)
+        return loader()
+
+    monkeypatch.setitem(file_io.DATASET_SOURCES, "waste_schedule", (list_files, counting_loader))
+
+    for _ in range(3):
+        with pytest.raises(HTTPException) as e:
+            file_io.get_waste_data_store()
+        assert e.value.status_code == 500
+        assert "corrupted" in e.value.detail
+    assert len(calls) == 1
+
+    # The watcher picks the fixed file up
+    write(schedule_file, json.dumps(SCHEDULE))
+
+    async def run():
+        watcher = asyncio.create_task(file_io.watch_resource_files(0.01))
+        for _ in range(200):
+            await asyncio.sleep(0.01)
+            if "waste_schedule" in file_io._datasets:
+                break
+        watcher.cancel()
+
+    asyncio.run(run())
+    assert len(calls) == 2
+    assert file_io.get_waste_data_store().get_zone("A2").next_pickup("Papiermüll", 0) == "2026-01-06"
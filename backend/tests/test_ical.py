@@ -0,0 +1,64 @@
+from src.app import file_io
+from src.app.file_io import WasteDataStore, get_zone_calendar
+from src.app.ical import _escape, _fold, render_zone_calendar
+from src.app.schedule_index import ZoneSchedule
+
+SCHEDULE = {"2026-01-07": ["Restmüll", "Biomüll"], "2026-01-14": ["Papiermüll"]}
+
+
+def test_short_lines_are_not_folded():
+    line = "X" * 75
+    assert _fold(line) == line
+
+
+def test_fold_at_75_octets():
+    folded = _fold("DESCRIPTION:" + "a" * 200)
+    parts = folded.split("\r\n")
+    assert all(len(part.encode("utf-8")) <= 75 for part in parts)
+    assert len(parts[0].encode("utf-8")) == 75
+    assert all(part.startswith(" ") for part in parts[1:])
+    # Unfolding (removing CRLF + space) restores the line
+    assert folded.replace("\r\n ", "") == "DESCRIPTION:" + "a" * 200
+
+
+def test_fold_keeps_multibyte_characters_intact():
+    line = "SUMMARY:" + "ü" * 100
+    folded = _fold(line)
+    for part in folded.split("\r\n"):
+        assert len(part.encode("utf-8")) <= 75
+        part.encode("utf-8").decode("utf-8")
+    assert folded.replace("\r\n ", "") == line
+
+
+def test_escape():
+    assert _escape("a;b,c\\d\ne") == r"a\;b\,c\\d\ne"
+
+
+def test_render_is_deterministic():
+    schedule = ZoneSchedule(SCHEDULE)
+    first = render_zone_calendar("A1", schedule, 1767225600.0)
+    assert first == render_zone_calendar("A1", ZoneSchedule(dict(SCHEDULE)), 1767225600.0)
+    text = first.decode("utf-8")
+    assert text.count("BEGIN:VEVENT") == 3
+    assert "DTSTAMP:20260101T000000Z" in text
+    assert all(line.endswith("\r") for line in text.split("\n")[:-1])
+
+
+def test_calendar_only_depends_on_data_and_file_time(monkeypatch):
+    data = {"A": {"1": SCHEDULE}}
+    monkeypatch.setattr(file_io, "_zone_calendars", {})
+
+    # A worker rendered the feed before the files were touched
+    monkeypatch.setattr(file_io, "get_waste_data_store", lambda: WasteDataStore(data, 1000.0))
+    stale = get_zone_calendar("A1")
+
+    # After the reload it has to serve what a freshly started worker renders
+    monkeypatch.setattr(file_io, "get_waste_data_store", lambda: WasteDataStore(data, 2000.0))
+    reloaded = get_zone_calendar("A1")
+    monkeypatch.setattr(file_io, "_zone_calendars", {})
+    fresh = get_zone_calendar("A1")
+
+    assert reloaded.response.etag == fresh.response.etag != stale.response.etag
+    assert reloaded.modified_at == fresh.modified_at == 2000.0
+    # Unchanged data and files keep the rendered feed
+    assert get_zone_calendar("A1") is get_zone_calendar("A1")
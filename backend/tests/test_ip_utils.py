@@ -0,0 +1,74 @@
+from starlette.requests import Request
+
+from src.app.ip_utils import TrustedProxyResolver, get_real_client_ip
+
+PROXY = "172.18.0.3"  # Docker network, trusted by default
+
+
+def make_request(peer, headers=None):
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+            "client": (peer, 12345),
+        }
+    )
+
+
+def test_forwarding_headers_from_untrusted_peer_are_ignored():
+    request = make_request(
+        "203.0.113.7",
+        {"X-Forwarded-For": "1.2.3.4", "X-Real-IP": "5.6.7.8", "Referer": "http://192.168.1.20/"},
+    )
+    assert get_real_client_ip(request) == "203.0.113.7"
+
+
+def test_forwarded_for_from_trusted_proxy():
+    request = make_request(PROXY, {"X-Forwarded-For": "203.0.113.7"})
+    assert get_real_client_ip(request) == "203.0.113.7"
+
+
+def test_forged_forwarded_for_entries_left_of_the_client_are_ignored():
+    # The client sent "1.2.3.4" itself, nginx appended the real address
+    request = make_request(PROXY, {"X-Forwarded-For": "1.2.3.4, 203.0.113.7, 172.18.0.2"})
+    assert get_real_client_ip(request) == "203.0.113.7"
+
+
+def test_repeated_forwarded_for_headers_form_one_chain():
+    request = Request(
+        {
+            "type": "http",
+            "headers": [(b"x-forwarded-for", b"1.2.3.4"), (b"x-forwarded-for", b"203.0.113.7")],
+            "client": (PROXY, 1),
+        }
+    )
+    assert get_real_client_ip(request) == "203.0.113.7"
+
+
+def test_invalid_forwarded_for_falls_back_to_real_ip():
+    request = make_request(PROXY, {"X-Forwarded-For": "not-an-ip", "X-Real-IP": "203.0.113.9"})
+    assert get_real_client_ip(request) == "203.0.113.9"
+
+
+def test_docker_nat_uses_referer_then_user_agent():
+    request = make_request(PROXY, {"X-Forwarded-For": "172.18.0.1", "Referer": "http://192.168.178.38/"})
+    assert get_real_client_ip(request) == "192.168.178.38"
+
+    first = get_real_client_ip(make_request(PROXY, {"User-Agent": "Phone"}))
+    second = get_real_client_ip(make_request(PROXY, {"User-Agent": "Laptop"}))
+    assert first.startswith("local-") and second.startswith("local-") and first != second
+    assert get_real_client_ip(make_request(PROXY, {"User-Agent": "Phone"})) == first
+
+
+def test_resolver():
+    resolver = TrustedProxyResolver(["10.0.0.0/8", " ::1/128 ", ""])
+    assert resolver.is_trusted("10.1.2.3")
+    assert resolver.is_trusted("::1")
+    assert not resolver.is_trusted("11.0.0.1")
+    assert not resolver.is_trusted("garbage")
+    assert resolver.client_from_forwarded_for(b"203.0.113.7, 10.0.0.2") == "203.0.113.7"
+    assert resolver.client_from_forwarded_for(b"10.0.0.1, 10.0.0.2") is None
+    assert resolver.client_from_real_ip(b"10.0.0.5") is None
+    assert resolver.client_from_real_ip(b" 2001:db8::1 ") == "2001:db8::1"
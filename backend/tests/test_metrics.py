@@ -0,0 +1,60 @@
+import json
+import os
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+
+from src.app.metrics import MetricsRegistry, SharedMetrics
+
+
+def dead_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def snapshot(requests: int) -> dict:
+    return {
+        "requests": [["/ping", "GET", 200, requests]],
+        "latency": {},
+        "response_bytes": [],
+        "extra": {},
+    }
+
+
+def test_collect_merges_live_workers_and_prunes_dead_ones(tmp_path):
+    shared = SharedMetrics(MetricsRegistry(), tmp_path, dict)
+    # A live process other than this one
+    live = tmp_path / f"{os.getppid()}.json"
+    live.write_text(json.dumps(snapshot(3)))
+    dead = tmp_path / f"{dead_pid()}.json"
+    dead.write_text(json.dumps(snapshot(5)))
+
+    merged, _ = shared.collect()
+
+    assert merged["requests"] == [["/ping", "GET", 200, 3]]
+    assert live.exists()
+    assert not dead.exists()
+    assert (tmp_path / f"{os.getpid()}.json").exists()
+
+
+def test_collect_prunes_snapshots_that_are_not_updated(tmp_path):
+    shared = SharedMetrics(MetricsRegistry(), tmp_path, dict, max_age=60)
+    hung = tmp_path / f"{os.getppid()}.json"
+    hung.write_text(json.dumps(snapshot(3)))
+    old = hung.stat().st_mtime - 120
+    os.utime(hung, (old, old))
+
+    merged, _ = shared.collect()
+
+    assert merged["requests"] == []
+    assert not hung.exists()
+
+
+def test_metrics_endpoint_is_not_rate_limited():
+    from src.app.main import app
+
+    with TestClient(app) as client:
+        statuses = {client.get("/metrics").status_code for _ in range(15)}
+    assert statuses == {200}
@@ -0,0 +1,70 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+easyocr = pytest.importorskip("easyocr")
+cv2 = pytest.importorskip("cv2")
+np = pytest.importorskip("numpy")
+pytest.importorskip("pdf2image")
+pytest.importorskip("pandas")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src" / "data_extraction"))
+
+from collection_planner_extraction import extract_cells, extract_cells_batched  # noqa: E402
+
+LANG = ["de", "en"]
+MONTHS = ["Jan", "Feb", "Mar"]
+# Rows of the fixture table, one text per month column
+ROWS = [
+    ["5 Mo A", "2 Mo C", "2 Mo C"],
+    ["6 Di B", "3 Di D", "3 Di D"],
+    ["7 Mi Feiertag", "4 Mi E", "4 Mi E"],
+    ["8 Do", "5 Do A", "5 Do Papier"],
+]
+# Roughly the cell size of the calendar pages rendered at 300 dpi
+CELL_WIDTH, CELL_HEIGHT = 550, 63
+
+
+@pytest.fixture(scope="module")
+def reader_available():
+    # Only with the EasyOCR models already downloaded, tests don't fetch them
+    try:
+        easyocr.Reader(LANG, gpu=False, download_enabled=False, verbose=False)
+    except FileNotFoundError:
+        pytest.skip("EasyOCR models not available")
+
+
+def fixture_table():
+    """Render a small calendar-like grid: dark text and grid lines on white."""
+    image = np.full((CELL_HEIGHT * len(ROWS), CELL_WIDTH * len(MONTHS)), 255, dtype=np.uint8)
+    for row, texts in enumerate(ROWS):
+        for col, text in enumerate(texts):
+            cv2.putText(
+                image,
+                text,
+                (col * CELL_WIDTH + 12, row * CELL_HEIGHT + 45),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                1.2,
+                0,
+                2,
+                cv2.LINE_AA,
+            )
+    for row in range(1, len(ROWS)):
+        image[row * CELL_HEIGHT, :] = 120
+    for col in range(1, len(MONTHS)):
+        image[:, col * CELL_WIDTH] = 120
+    return image
+
+
+def test_batched_engine_matches_cells_engine(reader_available):
+    image = fixture_table()
+    rows, cols = len(ROWS), len(MONTHS)
+
+    cells = extract_cells(image, MONTHS, rows=rows, cols=cols, lang=LANG)
+    batched = extract_cells_batched(image, MONTHS, rows=rows, cols=cols, lang=LANG)
+
+    assert [(e["Month"], e["Day"]) for e in batched] == [(e["Month"], e["Day"]) for e in cells]
+    assert [e["Text"] for e in batched] == [e["Text"] for e in cells]
+    # Both read the fixture, not just nothing
+    assert all(e["Text"] for e in cells)
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from src.app.geometry import (
+    POLYLINE_PRECISION,
+    decode_polyline,
+    encode_polyline,
+    encode_streets_polyline,
+)
+from src.config import STREET_ZONES_DIR
+
+STREET_COORDS_FILE = STREET_ZONES_DIR / "street-coords-mapping.json"
+
+# Largest rounding error of a coordinate (plus float noise)
+TOLERANCE = 0.5 * 10**-POLYLINE_PRECISION + 1e-9
+
+
+def test_google_reference_polyline():
+    # Example from Google's polyline algorithm documentation (5 decimals)
+    coords = [[38.5, -120.2], [40.7, -120.95], [43.252, -126.453]]
+    assert encode_polyline(coords, precision=5) == "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+    assert decode_polyline("_p~iF~ps|U_ulLnnqC_mqNvxq`@", precision=5) == coords
+
+
+@pytest.mark.parametrize(
+    "coords",
+    [
+        [],
+        [[49.4666428, 11.8517421]],
+        [[49.4666428, 11.8517421], [49.466678, 11.8518917], [-33.8688197, 151.2092955]],
+        [[0.0, 0.0], [-0.000001, 0.000001], [89.999999, -179.999999]],
+    ],
+)
+def test_round_trip(coords):
+    decoded = decode_polyline(encode_polyline(coords))
+    assert len(decoded) == len(coords)
+    for (lat, lon), (decoded_lat, decoded_lon) in zip(coords, decoded):
+        assert decoded_lat == pytest.approx(lat, abs=TOLERANCE)
+        assert decoded_lon == pytest.approx(lon, abs=TOLERANCE)
+
+
+@pytest.mark.skipif(not STREET_COORDS_FILE.exists(), reason="street coordinates not extracted")
+def test_street_coords_mapping_round_trip():
+    streets = json.loads(STREET_COORDS_FILE.read_text(encoding="utf-8"))
+    encoded = encode_streets_polyline(streets)
+
+    decoded = {}
+    for street in encoded["streets"]:
+        key = (street["name"], street["zone"])
+        decoded[key] = [decode_polyline(segment) for segment in street["segments"]]
+
+    # Segments keep their order within a (name, zone) group
+    position = {}
+    for street in streets:
+        key = (street["name"], street["zone"])
+        i = position.get(key, 0)
+        position[key] = i + 1
+        coords = decoded[key][i]
+        assert len(coords) == len(street["coords"])
+        for (lat, lon), (decoded_lat, decoded_lon) in zip(street["coords"], coords):
+            assert abs(decoded_lat - lat) <= TOLERANCE
+            assert abs(decoded_lon - lon) <= TOLERANCE
+
+
+@pytest.mark.skipif(not STREET_COORDS_FILE.exists(), reason="street coordinates not extracted")
+def test_street_coords_mapping_size():
+    streets = json.loads(STREET_COORDS_FILE.read_text(encoding="utf-8"))
+
+    def size(data):
+        return len(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+    # At least 5x smaller than the compact JSON it replaces
+    assert size({"streets": streets}) >= 5 * size(encode_streets_polyline(streets))
@@ -0,0 +1,135 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from src.app import rate_limit
+from src.app.rate_limit import RateLimit, configure_rate_limits
+
+
+@pytest.fixture(autouse=True)
+def isolated_limiters(monkeypatch):
+    # Limiters register themselves, keep the app's ones out of these tests
+    monkeypatch.setattr(rate_limit, "_limiters", [])
+
+
+def make_request(ip="203.0.113.7", path="/api/waste-collection/A1/next"):
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "headers": [],
+            "query_string": b"",
+            "client": (ip, 40000),
+        }
+    )
+
+
+async def hit(limiter, request) -> int:
+    try:
+        await limiter(request)
+    except HTTPException as e:
+        assert e.status_code == 429
+        assert int(e.headers["Retry-After"]) >= 1
+        return 429
+    return 200
+
+
+def test_local_token_bucket():
+    limiter = RateLimit("test", times=3, seconds=60)
+
+    async def run():
+        statuses = [await hit(limiter, make_request()) for _ in range(5)]
+        other_client = await hit(limiter, make_request(ip="203.0.113.8"))
+        other_route = await hit(limiter, make_request(path="/api/waste-collection/A1/schedule"))
+        return statuses, other_client, other_route
+
+    statuses, other_client, other_route = asyncio.run(run())
+    assert statuses == [200, 200, 200, 429, 429]
+    # Buckets are per client and route
+    assert other_client == 200
+    assert other_route == 200
+    assert limiter.stats["allowed"] == 5
+    assert limiter.stats["rejected"] == 2
+
+
+def test_backend_off_and_validation():
+    limiter = RateLimit("test", times=1, seconds=60)
+    configure_rate_limits("off")
+
+    async def run():
+        return [await hit(limiter, make_request()) for _ in range(3)]
+
+    assert asyncio.run(run()) == [200, 200, 200]
+    with pytest.raises(ValueError):
+        configure_rate_limits("redis")
+    with pytest.raises(ValueError):
+        configure_rate_limits("memcached")
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_limit_is_shared_across_workers(concurrent):
+    fakeredis = pytest.importorskip("fakeredis")
+    workers = 4
+    times = 10
+    server = fakeredis.FakeServer()
+    limiters = [RateLimit("shared", times=times, seconds=60, workers=workers) for _ in range(workers)]
+    for limiter in limiters:
+        limiter.attach_redis(fakeredis.FakeAsyncRedis(server=server))
+
+    async def sync_loop():
+        while True:
+            await asyncio.sleep(0.01)
+            for limiter in limiters:
+                await limiter.sync()
+
+    async def run():
+        sync_task = asyncio.create_task(sync_loop())
+        requests = [hit(limiters[i % workers], make_request()) for i in range(100)]
+        if concurrent:
+            statuses = await asyncio.gather(*requests)
+        else:
+            statuses = []
+            for request in requests:
+                statuses.append(await request)
+                await asyncio.sleep(0.002)
+        sync_task.cancel()
+        return statuses
+
+    statuses = asyncio.run(run())
+    allowed = statuses.count(200)
+    # Each worker alone would let `times` through. Together they stay at the shared limit,
+    # plus at most the local budget of each worker that hadn't seen the shared count yet
+    assert times <= allowed <= times + workers * limiters[0].local_budget
+    if concurrent:
+        # A burst within one sync interval goes to Redis once it nears the limit
+        assert allowed == times
+
+
+def test_redis_errors_fall_back_to_the_local_decision():
+    class BrokenPipeline:
+        def incrby(self, *args):
+            pass
+
+        def pexpire(self, *args):
+            pass
+
+        async def execute(self):
+            raise ConnectionError("Redis is down")
+
+    class BrokenRedis:
+        def pipeline(self, transaction=False):
+            return BrokenPipeline()
+
+    limiter = RateLimit("test", times=4, seconds=60, workers=2)
+    limiter.attach_redis(BrokenRedis())
+
+    async def run():
+        statuses = [await hit(limiter, make_request()) for _ in range(6)]
+        await limiter.sync()
+        return statuses
+
+    assert asyncio.run(run()) == [200, 200, 200, 200, 429, 429]
+    assert limiter.stats["redis_errors"] > 0
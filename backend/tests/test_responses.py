@@ -0,0 +1,55 @@
+import pytest
+
+from src.app import responses
+from src.app.responses import PreparedResponse, parse_accept_encoding
+
+LARGE = {"streets": [{"name": f"street {i}", "zone": "A1"} for i in range(200)]}
+
+
+def test_parse_q_values():
+    assert parse_accept_encoding("gzip, deflate;q=0.5, br;q=0, *;q=0.1") == {
+        "gzip": 1.0,
+        "deflate": 0.5,
+        "br": 0.0,
+        "*": 0.1,
+    }
+
+
+def test_parse_tolerates_whitespace_case_and_invalid_values():
+    assert parse_accept_encoding(" GZip ; q=0.8 ,, br;q=abc ") == {"gzip": 0.8, "br": 0.0}
+    assert parse_accept_encoding("") == {}
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("", "identity"),
+        ("identity", "identity"),
+        ("gzip", "gzip"),
+        ("gzip, br", "br"),
+        ("br;q=0, gzip", "gzip"),
+        ("gzip;q=0, br;q=0", "identity"),
+        ("*", "br"),
+        ("*;q=0", "identity"),
+        ("*, br;q=0", "gzip"),
+    ],
+)
+def test_select_variant(header, expected):
+    prepared = PreparedResponse(LARGE)
+    if "br" not in prepared.variants and expected == "br":
+        pytest.skip("brotli not installed")
+    assert prepared.select_variant(header) == expected
+
+
+def test_small_payloads_are_not_compressed():
+    prepared = PreparedResponse({"zone": "A1"})
+    assert set(prepared.variants) == {"identity"}
+    assert prepared.select_variant("gzip, br") == "identity"
+
+
+def test_variants_have_distinct_etags():
+    prepared = PreparedResponse(LARGE)
+    etags = [etag for _, etag in prepared.variants.values()]
+    assert len(set(etags)) == len(etags)
+    assert prepared.variants["identity"][1] == prepared.etag
+    assert responses.gzip.decompress(prepared.variants["gzip"][0]) == prepared.body
@@ -0,0 +1,283 @@
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app import logic, routes
+from src.app.cache import DailyResponseCache
+from src.app.exceptions import ZoneNotFoundError
+from src.app.file_io import WasteDataStore
+from src.app.geometry import SegmentGridIndex
+from src.app.main import api_rate_limit, app
+from src.app.routes import LOCATE_MAX_DISTANCE, LOCATE_MAX_POINTS
+from src.app.schedule_index import ZoneSchedule
+from src.app.street_search import StreetSearchIndex
+from src.street_matcher import StreetMatcher
+
+STREETS = [
+    {"name": "Marktplatz", "coords": [[49.4450, 11.8500], [49.4450, 11.8560]], "zone": "A1"},
+    {"name": "Bahnhofstraße", "coords": [[49.4400, 11.8600], [49.4410, 11.8600]], "zone": "B2"},
+]
+
+STREET_ZONES = {
+    "Marktplatz": "A1",
+    "Bahnhofstraße": "B2",
+    "Am Bahnhof": "B1",
+    "Äußere Raigeringer Str.": "C2",
+}
+
+SCHEDULES = {
+    "A1": ZoneSchedule(
+        {
+            "2026-01-05": ["Restmüll", "Biomüll"],
+            "2026-01-07": ["Papiermüll"],
+            "2026-01-12": ["Gelber Sack", "Restmüll", "Biomüll"],
+        }
+    ),
+}
+
+
+def upcoming(days):
+    return (date.today() + timedelta(days=days)).isoformat()
+
+
+def waste_data_store():
+    # Upcoming pickups, the batch route answers from today on
+    return WasteDataStore(
+        {
+            "A": {
+                "1": {upcoming(1): ["Restmüll"], upcoming(8): ["Biomüll", "Restmüll"]},
+                "2": {upcoming(2): ["Papiermüll"]},
+            }
+        }
+    )
+
+
+def load_zone_data(zone_code):
+    try:
+        return SCHEDULES[zone_code]
+    except KeyError:
+        raise ZoneNotFoundError(f"Zone '{zone_code}' not found in waste collection data")
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Requests aren't rate limited here, the limiter has its own tests
+    app.dependency_overrides[api_rate_limit] = lambda: None
+    monkeypatch.setattr(routes, "get_street_segment_index", lambda: SegmentGridIndex(STREETS))
+    monkeypatch.setattr(routes, "load_zone_data", load_zone_data)
+    store = waste_data_store()
+    monkeypatch.setattr(routes, "get_waste_data_store", lambda: store)
+    monkeypatch.setattr(logic, "next_pickups_cache", DailyResponseCache("test"))
+    search_index = StreetSearchIndex(STREET_ZONES)
+    monkeypatch.setattr(routes, "get_street_search_index", lambda: search_index)
+    matcher = StreetMatcher.from_raw(STREET_ZONES)
+    monkeypatch.setattr(routes, "get_street_matcher", lambda: matcher)
+    # Without the context manager the lifespan (dataset loading, Redis) doesn't run
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_locate(client):
+    response = client.get("/api/waste-collection/locate", params={"lat": 49.4451, "lon": 11.8530})
+    assert response.status_code == 200
+    assert response.json()["street"] == "Marktplatz"
+    assert response.json()["zone"] == "A1"
+
+    response = client.get("/api/waste-collection/locate", params={"lat": 49.5, "lon": 11.9})
+    assert response.status_code == 404
+
+
+def test_locate_batch(client):
+    points = [{"lat": 49.4451, "lon": 11.8530}, {"lat": 49.5, "lon": 11.9}, {"lat": 49.4405, "lon": 11.8601}]
+    response = client.post("/api/waste-collection/locate", json={"points": points})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r and r["zone"] for r in results] == ["A1", None, "B2"]
+
+
+def test_locate_caps(client):
+    point = {"lat": 49.4451, "lon": 11.8530}
+    response = client.post(
+        "/api/waste-collection/locate", json={"points": [point] * (LOCATE_MAX_POINTS + 1)}
+    )
+    assert response.status_code == 422
+    response = client.post(
+        "/api/waste-collection/locate",
+        json={"points": [point], "max_distance": LOCATE_MAX_DISTANCE + 1},
+    )
+    assert response.status_code == 422
+    response = client.get(
+        "/api/waste-collection/locate",
+        params={**point, "max_distance": LOCATE_MAX_DISTANCE + 1},
+    )
+    assert response.status_code == 422
+
+
+def test_schedule_filters(client):
+    response = client.get(
+        "/api/waste-collection/A1/schedule",
+        params={"from": "2026-01-06", "to": "2026-01-12", "types": "Biomüll, Papiermüll"},
+    )
+    assert response.status_code == 200
+    assert response.json()["schedule"] == {
+        "2026-01-07": ["Papiermüll"],
+        "2026-01-12": ["Biomüll"],
+    }
+
+    response = client.get(
+        "/api/waste-collection/A1/schedule", params={"from": "2026-01-01", "limit": 1}
+    )
+    assert response.json()["schedule"] == {"2026-01-05": ["Restmüll", "Biomüll"]}
+
+    response = client.get(
+        "/api/waste-collection/A1/schedule", params={"from": "2026-01-12", "to": "2026-01-12"}
+    )
+    assert list(response.json()["schedule"]) == ["2026-01-12"]
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"from": "2026-01-12", "to": "2026-01-11"},
+        {"types": "Sperrmüll"},
+        {"types": "Biomüll,Sperrmüll"},
+        {"types": " , "},
+    ],
+)
+def test_schedule_invalid_filters(client, params):
+    response = client.get("/api/waste-collection/A1/schedule", params=params)
+    assert response.status_code == 400
+
+
+def test_schedule_unknown_zone_and_limit(client):
+    assert client.get("/api/waste-collection/B3/schedule").status_code == 404
+    assert client.get("/api/waste-collection/F1/schedule").status_code == 400
+    response = client.get("/api/waste-collection/A1/schedule", params={"limit": 0})
+    assert response.status_code == 422
+
+
+def test_street_search(client):
+    response = client.get("/api/waste-collection/streets/search", params={"q": "bahnhof"})
+    assert response.status_code == 200
+    assert response.json() == {
+        "query": "bahnhof",
+        "results": [
+            {"street": "Bahnhofstraße", "zone": "B2"},
+            {"street": "Am Bahnhof", "zone": "B1"},
+        ],
+    }
+
+    response = client.get("/api/waste-collection/streets/search", params={"q": "ÄUSSERE", "limit": 1})
+    assert response.json()["results"] == [{"street": "Äußere Raigeringer Str.", "zone": "C2"}]
+    response = client.get("/api/waste-collection/streets/search", params={"q": "m"})
+    assert response.json()["results"] == [{"street": "Marktplatz", "zone": "A1"}]
+    # Passes the length check but folds to nothing
+    response = client.get("/api/waste-collection/streets/search", params={"q": "-"})
+    assert response.status_code == 200
+    assert response.json()["results"] == []
+
+
+@pytest.mark.parametrize(
+    "params",
+    [{}, {"q": ""}, {"q": "x" * 101}, {"q": "bahnhof", "limit": 0}, {"q": "bahnhof", "limit": 51}],
+)
+def test_street_search_invalid_params(client, params):
+    response = client.get("/api/waste-collection/streets/search", params=params)
+    assert response.status_code == 422
+
+
+def test_street_lookup(client):
+    response = client.get("/api/waste-collection/streets/lookup", params={"name": "Bahnhofstrase"})
+    assert response.status_code == 200
+    assert response.json() == {
+        "query": "Bahnhofstrase",
+        "results": [
+            {"street": "Bahnhofstraße", "zone": "B2", "score": 92.3},
+            {"street": "Am Bahnhof", "zone": "B1", "score": 60.9},
+        ],
+    }
+
+    response = client.get(
+        "/api/waste-collection/streets/lookup", params={"name": "Bahnhofstrase", "limit": 1}
+    )
+    assert [r["street"] for r in response.json()["results"]] == ["Bahnhofstraße"]
+    # Key variants of "Äußere Raigeringer Str." are one result
+    response = client.get(
+        "/api/waste-collection/streets/lookup", params={"name": "ÄUSSERE RAIGERINGER STRASSE"}
+    )
+    assert [r["street"] for r in response.json()["results"]] == ["Äußere Raigeringer Str."]
+    response = client.get("/api/waste-collection/streets/lookup", params={"name": "x"})
+    assert response.json()["results"] == []
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"name": ""},
+        {"name": "x" * 101},
+        {"name": "Marktplatz", "limit": 0},
+        {"name": "Marktplatz", "limit": 21},
+    ],
+)
+def test_street_lookup_invalid_params(client, params):
+    response = client.get("/api/waste-collection/streets/lookup", params=params)
+    assert response.status_code == 422
+
+
+def test_batch(client):
+    response = client.post(
+        "/api/waste-collection/batch",
+        json={"zones": ["A2", "A1", "B3"], "include": ["next", "schedule"]},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert list(body["zones"]) == ["A2", "A1"]
+    assert body["not_found"] == ["B3"]
+    a1 = body["zones"]["A1"]
+    assert {"type": "Biomüll", "date": upcoming(8)} in a1["next"]["next_pickups"]
+    assert a1["schedule"]["schedule"] == {
+        upcoming(1): ["Restmüll"],
+        upcoming(8): ["Biomüll", "Restmüll"],
+    }
+    # Only the next pickups by default
+    response = client.post("/api/waste-collection/batch", json={"zones": ["A2"]})
+    assert list(response.json()["zones"]["A2"]) == ["next"]
+
+
+def test_batch_deduplicates_zones(client):
+    response = client.post(
+        "/api/waste-collection/batch",
+        json={"zones": ["A1", "A2", " A1 ", "A1", "B3", "B3"], "include": ["schedule"]},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert list(body["zones"]) == ["A1", "A2"]
+    assert body["not_found"] == ["B3"]
+    # A batch of the maximum size made of duplicates is answered once per zone
+    response = client.post("/api/waste-collection/batch", json={"zones": ["A1"] * 100})
+    assert response.status_code == 200
+    assert list(response.json()["zones"]) == ["A1"]
+
+
+@pytest.mark.parametrize("zone", ["F1", "A5", "a1", "A", "A11", ""])
+def test_batch_invalid_zone(client, zone):
+    response = client.post("/api/waste-collection/batch", json={"zones": ["A1", zone]})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid zone code"
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"zones": ["A1"] * 101},
+        {"zones": []},
+        {},
+        {"zones": ["A1"], "include": []},
+        {"zones": ["A1"], "include": ["calendar"]},
+    ],
+)
+def test_batch_size_cap_and_validation(client, payload):
+    response = client.post("/api/waste-collection/batch", json=payload)
+    assert response.status_code == 422
@@ -0,0 +1,180 @@
+from datetime import date
+from itertools import combinations
+
+import pytest
+
+from src.app.file_io import load_all_waste_data
+from src.app.logic import determine_next_pickups, get_future_pickups
+from src.app.schedule_index import WASTE_TYPES, ZoneSchedule
+from src.config import WASTE_JSON_DIR
+
+SCHEDULE = {
+    "2026-01-05": ["Restmüll", "Biomüll"],
+    "2026-01-07": ["Papiermüll"],
+    "2026-01-12": ["Gelber Sack", "Restmüll", "Biomüll"],
+    "2026-01-14": ["Biomüll"],
+    "2026-01-19": ["Restmüll", "Gelber Sack"],
+}
+
+
+def ordinal(day: str) -> int:
+    return date.fromisoformat(day).toordinal()
+
+
+def brute_force_between(start, end=None, types=None, limit=None):
+    result = {}
+    for day, waste_types in sorted(SCHEDULE.items()):
+        if ordinal(day) < start or (end is not None and ordinal(day) > end):
+            continue
+        if types is not None:
+            waste_types = [t for t in waste_types if t in types]
+            if not waste_types:
+                continue
+        if limit is not None and len(result) == limit:
+            break
+        result[day] = tuple(waste_types)
+    return result
+
+
+def test_whole_schedule():
+    schedule = ZoneSchedule(SCHEDULE)
+    assert schedule.pickups_between(ordinal("2026-01-01")) == {
+        day: tuple(types) for day, types in SCHEDULE.items()
+    }
+
+
+def test_single_type():
+    schedule = ZoneSchedule(SCHEDULE)
+    assert schedule.pickups_between(ordinal("2026-01-01"), types=["Gelber Sack"]) == {
+        "2026-01-12": ("Gelber Sack",),
+        "2026-01-19": ("Gelber Sack",),
+    }
+    assert schedule.pickups_between(ordinal("2026-01-01"), types=["Unknown"]) == {}
+
+
+def test_several_types_keep_the_data_order():
+    schedule = ZoneSchedule(SCHEDULE)
+    # Requested in a different order than they're listed on 2026-01-12
+    result = schedule.pickups_between(ordinal("2026-01-01"), types=["Biomüll", "Gelber Sack"])
+    assert result == {
+        "2026-01-05": ("Biomüll",),
+        "2026-01-12": ("Gelber Sack", "Biomüll"),
+        "2026-01-14": ("Biomüll",),
+        "2026-01-19": ("Gelber Sack",),
+    }
+
+
+def test_inclusive_range():
+    schedule = ZoneSchedule(SCHEDULE)
+    day = ordinal("2026-01-12")
+    # from == to on a pickup day returns that day
+    assert schedule.pickups_between(day, day) == {"2026-01-12": tuple(SCHEDULE["2026-01-12"])}
+    assert schedule.pickups_between(day, day, types=["Biomüll"]) == {"2026-01-12": ("Biomüll",)}
+    assert schedule.pickups_between(day, day, types=["Biomüll", "Restmüll"]) == {
+        "2026-01-12": ("Restmüll", "Biomüll")
+    }
+    # from == to on a day without pickups
+    assert schedule.pickups_between(day + 1, day + 1) == {}
+    # `to` before the first pickup
+    assert schedule.pickups_between(ordinal("2026-01-01"), ordinal("2026-01-04")) == {}
+    # `from` after the last pickup
+    assert schedule.pickups_between(ordinal("2026-01-20")) == {}
+    # The last pickup is included
+    assert list(schedule.pickups_between(ordinal("2026-01-14"), ordinal("2026-01-19"))) == [
+        "2026-01-14",
+        "2026-01-19",
+    ]
+
+
+def test_limit_keeps_whole_days():
+    schedule = ZoneSchedule(SCHEDULE)
+    start = ordinal("2026-01-01")
+    # The limit counts dates, a date with several requested types isn't cut
+    assert schedule.pickups_between(start, types=["Restmüll", "Biomüll"], limit=2) == {
+        "2026-01-05": ("Restmüll", "Biomüll"),
+        "2026-01-12": ("Restmüll", "Biomüll"),
+    }
+    assert schedule.pickups_between(start, limit=1) == {"2026-01-05": ("Restmüll", "Biomüll")}
+    assert schedule.pickups_between(start, types=["Restmüll"], limit=2) == {
+        "2026-01-05": ("Restmüll",),
+        "2026-01-12": ("Restmüll",),
+    }
+    assert len(schedule.pickups_between(start, limit=100)) == len(SCHEDULE)
+
+
+@pytest.mark.parametrize(
+    "types",
+    [None] + [list(c) for n in range(1, len(WASTE_TYPES) + 1) for c in combinations(WASTE_TYPES, n)],
+)
+def test_matches_brute_force(types):
+    schedule = ZoneSchedule(SCHEDULE)
+    days = range(ordinal("2026-01-04"), ordinal("2026-01-21"))
+    for start in days:
+        for end in [None, *range(start, days.stop)]:
+            for limit in (None, 1, 2, 3):
+                assert schedule.pickups_between(start, end, types, limit) == brute_force_between(
+                    start, end, types, limit
+                ), (start, end, types, limit)
+
+
+def test_get_future_pickups():
+    schedule = ZoneSchedule(SCHEDULE)
+    response = get_future_pickups(
+        "A1",
+        schedule,
+        date(2026, 1, 6),
+        date(2026, 1, 14),
+        ["Biomüll", "Papiermüll"],
+        limit=2,
+    )
+    assert response["zone"] == "A1"
+    assert response["reference_date"] == date.today().isoformat()
+    assert response["schedule"] == {
+        "2026-01-07": ("Papiermüll",),
+        "2026-01-12": ("Biomüll",),
+    }
+
+
+def brute_force_next(zone_data, waste_type, today):
+    # The linear scan the index replaced: first date on or after today with the type
+    for date_str, waste_types in sorted(zone_data.items()):
+        if date.fromisoformat(date_str) >= today and waste_type in waste_types:
+            return date_str
+    return ""
+
+
+def test_next_pickup_matches_linear_scan():
+    if not list(WASTE_JSON_DIR.glob("*.json")):
+        pytest.skip("waste collection schedules not available")
+    merged = load_all_waste_data()
+
+    for zone_letter, zones in merged.items():
+        for zone_number, zone_data in zones.items():
+            schedule = ZoneSchedule(zone_data)
+            days = sorted(date.fromisoformat(d) for d in zone_data)
+            years = sorted({day.year for day in days})
+            reference_dates = {days[0].replace(month=1, day=1), days[-1]}
+            for year in years:
+                # The last pickup of a year, the day after it and the year's first pickup
+                last = max(day for day in days if day.year == year)
+                first = min(day for day in days if day.year == year)
+                reference_dates |= {last, date.fromordinal(last.toordinal() + 1), first}
+            # Today is a pickup day, the day before and after one
+            for day in days[:: max(1, len(days) // 20)]:
+                ordinal_day = day.toordinal()
+                reference_dates |= {date.fromordinal(ordinal_day + d) for d in (-1, 0, 1)}
+            # Past the last pickup of the dataset
+            reference_dates.add(date(days[-1].year + 1, 6, 1))
+
+            for today in sorted(reference_dates):
+                expected = {t: brute_force_next(zone_data, t, today) for t in WASTE_TYPES}
+                for waste_type in WASTE_TYPES:
+                    found = schedule.next_pickup(waste_type, today.toordinal())
+                    assert found == expected[waste_type], (zone_letter + zone_number, waste_type, today)
+                response = determine_next_pickups(zone_letter + zone_number, schedule, today)
+                assert response["next_pickups"] == [
+                    {"type": t, "date": expected[t]} for t in WASTE_TYPES
+                ]
+            # Nothing is left after the last pickup
+            after = date.fromordinal(days[-1].toordinal() + 1)
+            assert all(schedule.next_pickup(t, after.toordinal()) == "" for t in WASTE_TYPES)
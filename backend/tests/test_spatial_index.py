@@ -0,0 +1,148 @@
+import json
+import random
+import time
+
+import pytest
+
+from src.app.geometry import SegmentGridIndex, _point_polyline_distance
+from src.app.routes import LOCATE_MAX_DISTANCE, LOCATE_MAX_POINTS
+from src.config import STREET_ZONES_DIR
+
+STREETS = [
+    # Horizontal street crossing several grid cells
+    {"name": "a", "coords": [[49.4450, 11.8500], [49.4450, 11.8560]], "zone": "A1"},
+    # Short vertical street
+    {"name": "b", "coords": [[49.4400, 11.8600], [49.4410, 11.8600]], "zone": "B2"},
+    # Single point segment
+    {"name": "c", "coords": [[49.4500, 11.8700]], "zone": "C3"},
+]
+
+
+def brute_force_bbox(streets, min_lat, min_lon, max_lat, max_lon):
+    result = []
+    for i, street in enumerate(streets):
+        lats = [lat for lat, _ in street["coords"]]
+        lons = [lon for _, lon in street["coords"]]
+        if min(lats) <= max_lat and max(lats) >= min_lat and min(lons) <= max_lon and max(lons) >= min_lon:
+            result.append(i)
+    return result
+
+
+def test_bbox_query():
+    index = SegmentGridIndex(STREETS)
+    assert index.query_bbox(49.4449, 11.8530, 49.4451, 11.8531) == [0]
+    assert index.query_bbox(49.4405, 11.8599, 49.4406, 11.8601) == [1]
+    assert index.query_bbox(49.4300, 11.8000, 49.4600, 11.9000) == [0, 1, 2]
+    assert index.query_bbox(49.4600, 11.8000, 49.4700, 11.8100) == []
+
+
+def test_bbox_query_json():
+    index = SegmentGridIndex(STREETS)
+    body = json.loads(index.query_bbox_json(49.4499, 11.8699, 49.4501, 11.8701))
+    assert body == {"streets": [STREETS[2]]}
+
+
+def test_bbox_query_matches_brute_force():
+    rng = random.Random(7)
+    streets = []
+    for i in range(300):
+        lat, lon = 49.43 + rng.random() * 0.03, 11.84 + rng.random() * 0.04
+        coords = [[lat, lon]]
+        for _ in range(rng.randint(0, 4)):
+            lat += (rng.random() - 0.5) * 0.004
+            lon += (rng.random() - 0.5) * 0.004
+            coords.append([lat, lon])
+        streets.append({"name": f"s{i}", "coords": coords, "zone": "A1"})
+    index = SegmentGridIndex(streets)
+
+    for _ in range(200):
+        lat, lon = 49.42 + rng.random() * 0.05, 11.83 + rng.random() * 0.06
+        size = rng.choice((0.0005, 0.005, 0.05, 1.0))
+        box = (lat, lon, lat + size, lon + size)
+        assert index.query_bbox(*box) == brute_force_bbox(streets, *box)
+
+
+def test_nearest():
+    index = SegmentGridIndex(STREETS)
+    # ~11 m north of the middle of street a
+    i, distance = index.nearest(49.4451, 11.8530)
+    assert i == 0
+    assert distance == pytest.approx(11.1, abs=0.5)
+    # Beyond the end of street b the distance is to its end point
+    i, distance = index.nearest(49.4420, 11.8600)
+    assert i == 1
+    assert distance == pytest.approx(111.2, abs=1)
+    assert index.nearest(49.4500, 11.8700)[0] == 2
+
+
+def test_nearest_respects_max_distance():
+    index = SegmentGridIndex(STREETS)
+    assert index.nearest(49.4800, 11.9000) is None
+    assert index.nearest(49.4451, 11.8530, max_distance_m=5) is None
+
+
+def test_nearest_matches_brute_force():
+    rng = random.Random(11)
+    streets = [
+        {
+            "name": f"s{i}",
+            "coords": [[49.43 + rng.random() * 0.03, 11.84 + rng.random() * 0.04] for _ in range(2)],
+            "zone": "A1",
+        }
+        for i in range(200)
+    ]
+    index = SegmentGridIndex(streets)
+    for _ in range(300):
+        # Also points around the data, whose rings are cut off at the occupied cells
+        lat, lon = 49.40 + rng.random() * 0.09, 11.80 + rng.random() * 0.12
+        max_distance = rng.choice((100, 1000, 5000))
+        result = index.nearest(lat, lon, max_distance_m=max_distance)
+        # Exhaustive search over the same projection
+        best = min(range(len(streets)), key=lambda i: _distance(index, i, lat, lon))
+        best_distance = _distance(index, best, lat, lon)
+        if best_distance > max_distance:
+            assert result is None
+        else:
+            assert result is not None
+            assert result[1] == pytest.approx(best_distance)
+
+
+def test_nearest_far_away_and_empty():
+    index = SegmentGridIndex(STREETS)
+    assert index.nearest(0.0, 0.0, max_distance_m=5000) is None
+    assert index.nearest(49.4451, 11.8530 + 0.1, max_distance_m=100_000)[0] == 2
+    assert SegmentGridIndex([]).nearest(49.4451, 11.8530) is None
+
+
+def test_locate_batch_worst_case_time():
+    path = STREET_ZONES_DIR / "street-coords-mapping.json"
+    if not path.exists():
+        pytest.skip("street coordinates mapping not available")
+    with open(path, encoding="utf-8") as fh:
+        index = SegmentGridIndex(json.load(fh))
+
+    # Slowest point of a grid over the data and the surrounding max radius
+    min_lat = min(b[0] for b in index.bboxes) - 0.01
+    min_lon = min(b[1] for b in index.bboxes) - 0.015
+    max_lat = max(b[2] for b in index.bboxes) + 0.01
+    max_lon = max(b[3] for b in index.bboxes) + 0.015
+    worst = (0.0, None)
+    for i in range(50):
+        for j in range(50):
+            lat = min_lat + (max_lat - min_lat) * i / 49
+            lon = min_lon + (max_lon - min_lon) * j / 49
+            start = time.perf_counter()
+            index.nearest(lat, lon, LOCATE_MAX_DISTANCE)
+            worst = max(worst, (time.perf_counter() - start, (lat, lon)))
+
+    # A full batch of that point at the maximum radius
+    start = time.perf_counter()
+    for _ in range(LOCATE_MAX_POINTS):
+        index.nearest(*worst[1], LOCATE_MAX_DISTANCE)
+    assert time.perf_counter() - start < 0.5
+
+
+def _distance(index, i, lat, lon):
+    return _point_polyline_distance(
+        lon * index._m_per_deg_lon, lat * index._m_per_deg_lat, index.projected[i]
+    )
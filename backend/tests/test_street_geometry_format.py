@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from src.config import STREET_ZONES_DIR
+from src.street_geometry_format import (
+    COORD_SCALE,
+    StreetGeometryBuffers,
+    pack_street_geometries,
+    write_street_geometries,
+)
+
+STREET_COORDS_FILE = STREET_ZONES_DIR / "street-coords-mapping.json"
+STREET_COORDS_BINARY_FILE = STREET_ZONES_DIR / "street-coords-mapping.bin"
+
+STREETS = [
+    {"name": "hirschauer straße", "coords": [[49.4666428, 11.8517421], [49.466678, 11.8518917]], "zone": "E4"},
+    {"name": "am bergsteig", "coords": [[49.44, 11.86], [49.441, 11.861], [49.442, 11.862]], "zone": "A1"},
+    {"name": "hirschauer straße", "coords": [[49.4683157, 11.8533053]], "zone": "E4"},
+]
+
+
+def assert_matches(buffers, streets):
+    assert buffers.segment_count == len(streets)
+    assert buffers.point_count == sum(len(street["coords"]) for street in streets)
+    for i, street in enumerate(streets):
+        assert buffers.segment_street(i) == (street["name"], street["zone"])
+        coords = list(buffers.segment_coords(i))
+        assert len(coords) == len(street["coords"])
+        for (lat, lon), (read_lat, read_lon) in zip(street["coords"], coords):
+            assert abs(read_lat - lat) <= 1 / COORD_SCALE
+            assert abs(read_lon - lon) <= 1 / COORD_SCALE
+
+
+def test_write_read_round_trip(tmp_path):
+    path = tmp_path / "streets.bin"
+    write_street_geometries(path, STREETS)
+
+    buffers = StreetGeometryBuffers(path.read_bytes())
+    assert_matches(buffers, STREETS)
+    # Streets are stored once in the dictionary
+    assert buffers.street_count == 2
+
+
+def test_rejects_invalid_buffers():
+    data = pack_street_geometries(STREETS)
+    with pytest.raises(ValueError):
+        StreetGeometryBuffers(b"XXXX" + data[4:])
+    with pytest.raises(ValueError):
+        StreetGeometryBuffers(data[:-1])
+    with pytest.raises(ValueError):
+        StreetGeometryBuffers(data[:10])
+
+
+@pytest.mark.skipif(not STREET_COORDS_FILE.exists(), reason="street coordinates not extracted")
+def test_street_coords_mapping_round_trip(tmp_path):
+    streets = json.loads(STREET_COORDS_FILE.read_text(encoding="utf-8"))
+    path = tmp_path / "street-coords-mapping.bin"
+    write_street_geometries(path, streets)
+    assert_matches(StreetGeometryBuffers(path.read_bytes()), streets)
+
+
+@pytest.mark.skipif(
+    not (STREET_COORDS_FILE.exists() and STREET_COORDS_BINARY_FILE.exists()),
+    reason="street coordinates not extracted",
+)
+def test_committed_binary_matches_json():
+    streets = json.loads(STREET_COORDS_FILE.read_text(encoding="utf-8"))
+    assert_matches(StreetGeometryBuffers(STREET_COORDS_BINARY_FILE.read_bytes()), streets)
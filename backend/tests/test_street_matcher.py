@@ -0,0 +1,128 @@
+import json
+
+import pytest
+
+from src.config import STREET_ZONES_DIR
+from src.street_matcher import StreetMatcher, normalize_mapping
+
+MAPPING = {
+    "Bahnhofstraße": "B2",
+    "Bahnhofsplatz": "B3",
+    "Am Bahnhof": "B1",
+    "Obere Bahnhofstraße": "C3",
+    "Adalbert-Stifter-Str.": "A1",
+    "Äußere Raigeringer Str.": "C2",
+    "Kaiser-Wilhelm-Ring": "D1",
+    "Hauptstr. Nr. 1-20": "F1",
+}
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return StreetMatcher.from_raw(MAPPING)
+
+
+def test_normalize_mapping():
+    assert normalize_mapping({"Hauptstr. Nr. 1-20": "F1", "Am Bahnhof": "B1"}) == {
+        "hauptstr.": "F1",
+        "hauptstraße": "F1",
+        "hauptstr": "F1",
+        "am bahnhof": "B1",
+    }
+
+
+def test_match(matcher):
+    assert matcher.match("Adalbert-Stifter-Straße") == ("adalbert-stifter-straße", 100.0, "A1")
+    # House number ranges are stripped from the keys
+    assert matcher.match("Hauptstraße")[2] == "F1"
+    choice, score, zone = matcher.match("Bahnhofstrase")
+    assert (choice, zone) == ("bahnhofstraße", "B2")
+    assert 75 <= score < 100
+
+
+def test_case_and_whitespace(matcher):
+    assert matcher.match("  BAHNHOFSTRAßE ") == ("bahnhofstraße", 100.0, "B2")
+    # Umlauts are compared as they are, lowercasing keeps them
+    assert matcher.match("ÄUSSERE RAIGERINGER STR")[2] == "C2"
+    assert matcher.match("Äußere Raigeringer Straße") == ("äußere raigeringer straße", 100.0, "C2")
+
+
+def test_no_match(matcher):
+    assert matcher.match("") is None
+    assert matcher.match("x") is None
+    assert matcher.match("Marktplatz") is None
+    # A stricter threshold drops the typo
+    assert matcher.match("Bahnhofstrase", threshold=95) is None
+
+
+def test_lookup_collapses_key_variants(matcher):
+    # "adalbert-stifter-str.", "...-straße" and "...-str" are one street
+    assert matcher.lookup("Adalbert Stifter Str") == [
+        {"street": "Adalbert-Stifter-Str.", "zone": "A1", "score": 90.0}
+    ]
+    assert matcher.lookup("Hauptstrase") == [
+        {"street": "Hauptstr. Nr. 1-20", "zone": "F1", "score": 90.9}
+    ]
+
+
+def test_lookup_ranking_and_limit(matcher):
+    results = matcher.lookup("Bahnhofstrase")
+    assert [r["street"] for r in results] == [
+        "Bahnhofstraße",
+        "Obere Bahnhofstraße",
+        "Bahnhofsplatz",
+        "Am Bahnhof",
+    ]
+    scores = [r["score"] for r in results]
+    assert scores == sorted(scores, reverse=True)
+    assert all(score >= 60 for score in scores)
+
+    assert matcher.lookup("Bahnhofstrase", limit=2) == results[:2]
+    assert matcher.lookup("Bahnhofstrase", limit=1) == results[:1]
+    assert matcher.lookup("x") == []
+    assert matcher.lookup("") == []
+
+
+def assert_same_matches(matcher, names):
+    many = matcher.match_many(names)
+    # Empty names are skipped, duplicates are scored once
+    assert list(many) == list(dict.fromkeys(name for name in names if name))
+    for name, result in many.items():
+        single = matcher.match(name)
+        if single is None:
+            assert result is None, name
+        else:
+            assert result is not None, name
+            assert result[0] == single[0] and result[2] == single[2], name
+            assert result[1] == pytest.approx(single[1], abs=1e-3), name
+
+
+def test_match_many_agrees_with_match(matcher):
+    names = [
+        "Bahnhofstrase",
+        "Bahnhofstrase",
+        "",
+        "x",
+        "Hauptstraße",
+        "ÄUSSERE RAIGERINGER STR",
+        "Kaiser Wilhelm Ring",
+        "Marktplatz",
+    ]
+    assert_same_matches(matcher, names)
+    assert matcher.match_many([]) == {}
+    assert StreetMatcher({}).match_many(["Bahnhofstraße"]) == {"Bahnhofstraße": None}
+
+
+def test_match_many_agrees_with_match_on_real_mapping():
+    mapping_file = STREET_ZONES_DIR / "street-zones-mapping.json"
+    if not mapping_file.exists():
+        pytest.skip("street zones mapping not available")
+    raw = json.loads(mapping_file.read_text(encoding="utf-8"))
+    matcher = StreetMatcher.from_raw(raw)
+
+    names = []
+    for street in raw:
+        # Exact, upper case, typos at both ends, spaces for hyphens and unrelated strings
+        names += [street, street.upper(), street[:-1], street[1:], street.replace("-", " ")]
+        names += [street[: len(street) // 2], street[::-1]]
+    assert_same_matches(matcher, names)
@@ -0,0 +1,88 @@
+import pytest
+
+from src.app.street_search import StreetSearchIndex, fold_street_name
+
+MAPPING = {
+    "Bahnhofstraße": "B2",
+    "Bahnhofsplatz": "B3",
+    "Am Bahnhof": "B1",
+    "Obere Bahnhofstraße": "C3",
+    "Adalbert-Stifter-Str.": "A1",
+    "Äußere Raigeringer Str.": "C2",
+    "Kaiser-Wilhelm-Ring": "D1",
+    "Ringstraße": "D2",
+    "Bahnweg": "E4",
+}
+
+
+@pytest.fixture(scope="module")
+def index():
+    return StreetSearchIndex(MAPPING)
+
+
+def streets(results):
+    return [r["street"] for r in results]
+
+
+def test_fold_street_name():
+    for name in ["Adalbert-Stifter-Str.", "adalbert stifter straße", "ADALBERT-STIFTER-STRASSE"]:
+        assert fold_street_name(name) == "adalbertstifterstrasse"
+    assert fold_street_name("Äußere Raigeringer Str.") == "aeussereraigeringerstrasse"
+    assert fold_street_name(" - . ") == ""
+
+
+def test_prefix_before_substring_before_similar(index):
+    # Prefix matches in name order, then substring matches by their position
+    assert streets(index.search("bahnhof")) == [
+        "Bahnhofsplatz",
+        "Bahnhofstraße",
+        "Am Bahnhof",
+        "Obere Bahnhofstraße",
+    ]
+    # A prefix match ranks before earlier listed substring matches
+    assert streets(index.search("ring")) == [
+        "Ringstraße",
+        "Äußere Raigeringer Str.",
+        "Kaiser-Wilhelm-Ring",
+    ]
+
+
+def test_typos_fall_back_to_trigram_similarity(index):
+    # No street starts with or contains the misspelled name
+    assert streets(index.search("Bahnhfstrase")) == ["Bahnhofstraße", "Obere Bahnhofstraße"]
+    # Too few shared trigrams ("bah", "ahn") aren't a match
+    assert streets(index.search("bahnxyz")) == []
+
+
+def test_umlauts_and_case_folding(index):
+    for query in ["äußere", "ÄUSSERE", "Aeussere raig", "aeußere-RAIGERINGER str."]:
+        assert streets(index.search(query)) == ["Äußere Raigeringer Str."], query
+    assert index.search("adalbert stifter straße") == [
+        {"street": "Adalbert-Stifter-Str.", "zone": "A1"}
+    ]
+
+
+def test_short_and_empty_queries(index):
+    # Without trigrams a single character only matches as a prefix
+    assert streets(index.search("a")) == [
+        "Adalbert-Stifter-Str.",
+        "Äußere Raigeringer Str.",
+        "Am Bahnhof",
+    ]
+    assert streets(index.search("K")) == ["Kaiser-Wilhelm-Ring"]
+    # Queries that fold to nothing
+    for query in ["", " ", ".", "-"]:
+        assert index.search(query) == [], query
+    assert index.search("xyz") == []
+
+
+def test_limit(index):
+    assert streets(index.search("bahnhof", limit=1)) == ["Bahnhofsplatz"]
+    # The limit cuts the substring matches after the prefix matches
+    assert streets(index.search("bahnhof", limit=3)) == [
+        "Bahnhofsplatz",
+        "Bahnhofstraße",
+        "Am Bahnhof",
+    ]
+    assert streets(index.search("b", limit=2)) == ["Bahnhofsplatz", "Bahnhofstraße"]
+    assert len(index.search("b", limit=50)) == 3